@@ -0,0 +1,44 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_data import grid_csv
+from src.database.db_manager import DatabaseManager
+
+# Import throughput of DatabaseManager.import_trades (parse, map, bulk insert
+# and round trip matching) on synthetic NinjaTrader grid exports.
+#
+#   python -m benchmarks.import_benchmark [--sizes 10000 100000 1000000]
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+def time_import(rows):
+    """Seconds to import a rows-trade grid into an empty database"""
+    csv_path = grid_csv(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, "benchmark.db"))
+        db_manager.setup_database()
+        try:
+            start = time.perf_counter()
+            success, message = db_manager.import_trades(csv_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            db_manager.close()
+
+    if not success:
+        raise RuntimeError(message)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows per second imported from a NinjaTrader grid export")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'seconds':>9} {'rows/s':>10}")
+    for rows in args.sizes:
+        elapsed = time_import(rows)
+        print(f"{rows:>10} {elapsed:>9.2f} {rows / elapsed:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_data import grid_csv
+from src.utils.csv_importer import CSVImporter, parse_money, split_datetimes
+
+# CSVImporter.map_columns parsing on a synthetic NinjaTrader grid: money
+# columns and timestamps, against the per-element lambdas and format
+# inference map_columns used before.
+#
+#   python -m benchmarks.map_columns_benchmark [--rows 1000000]
+
+MONEY_COLUMNS = ['Commission', 'MAE', 'MFE', 'Profit']
+
+def legacy_money(series):
+    """Money parsing as map_columns did it: strip $ and , per element, then convert to float
+
+    The old code left the conversion to SQLite; it is included here so both
+    sides produce floats. Parenthesised negatives come out as NaN.
+    """
+    stripped = series.apply(lambda x: str(x).replace('$', '').replace(',', '') if isinstance(x, str) else x)
+    return pd.to_numeric(stripped, errors='coerce')
+
+def legacy_datetimes(series):
+    """Timestamp parsing as map_columns did it: inferred format and per-element strftime"""
+    datetimes = pd.to_datetime(series, errors='coerce')
+    return datetimes.dt.strftime('%Y-%m-%d'), datetimes.dt.strftime('%H:%M:%S')
+
+def current_datetimes(importer, series):
+    """Timestamp parsing with the detected format and numpy string formatting"""
+    return split_datetimes(importer.parse_datetimes(series))
+
+def timed(function, *args):
+    """Seconds taken by one call"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Money and timestamp parsing speed in CSVImporter.map_columns")
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    csv_path = grid_csv(args.rows)
+    df = pd.read_csv(csv_path)
+    importer = CSVImporter(csv_path)
+
+    print(f"{args.rows} rows")
+    print(f"{'step':<24} {'before s':>9} {'after s':>9} {'speedup':>8}")
+
+    rows = []
+    for column in MONEY_COLUMNS:
+        rows.append((f"money: {column}", timed(legacy_money, df[column]), timed(parse_money, df[column])))
+    for column in ['Entry time', 'Exit time']:
+        rows.append((f"timestamps: {column}", timed(legacy_datetimes, df[column]), timed(current_datetimes, importer, df[column])))
+
+    for name, before, after in rows:
+        print(f"{name:<24} {before:>9.3f} {after:>9.3f} {before / after:>7.1f}x")
+
+    # The whole mapping step, including fingerprints, for reference
+    print(f"{'map_columns total':<24} {'':>9} {timed(importer.map_columns, df):>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic_data import grid_csv, INSTRUMENTS
+from src.database.connection_pool import CONNECTION_PROFILES
+from src.database.db_manager import DatabaseManager
+
+# Import, filtered query and debrief save under each SQLite connection
+# profile, with a reader thread querying while the import writes (as the
+# statistics worker or an export would).
+#
+#   python -m benchmarks.profile_benchmark [--rows 100000]
+
+PAGE_SIZE = 200
+QUERY_PAGES = 50
+DEBRIEF_SAVES = 200
+
+QUERY_FILTERS = {'instrument': INSTRUMENTS[0], 'start_date': '2025-01-01', 'end_date': '2025-12-31'}
+
+def read_during(db_path, profile, writing, latencies, errors):
+    """Count one instrument's trades on a read-only connection until writing is cleared"""
+    reader = DatabaseManager(db_path, read_only=True, profile=profile)
+    try:
+        while writing.is_set():
+            start = time.perf_counter()
+            try:
+                with reader.pool.reader() as cursor:
+                    cursor.execute("SELECT COUNT(*) FROM trades WHERE instrument = ?", (INSTRUMENTS[0],))
+                    cursor.fetchone()
+                latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                errors.append(time.perf_counter() - start)
+            time.sleep(0.005)
+    finally:
+        reader.close()
+
+def run_profile(profile, csv_path):
+    """Timings for one profile on a new database"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "benchmark.db")
+        db_manager = DatabaseManager(db_path, profile=profile)
+        try:
+            db_manager.setup_database()
+
+            writing = threading.Event()
+            writing.set()
+            latencies = []
+            errors = []
+            reader = threading.Thread(target=read_during, args=(db_path, profile, writing, latencies, errors))
+            reader.start()
+
+            start = time.perf_counter()
+            success, message = db_manager.import_trades(csv_path)
+            import_seconds = time.perf_counter() - start
+
+            writing.clear()
+            reader.join()
+            if not success:
+                raise RuntimeError(message)
+
+            start = time.perf_counter()
+            for page in range(QUERY_PAGES):
+                db_manager.get_trades(QUERY_FILTERS, PAGE_SIZE, page * PAGE_SIZE)
+                db_manager.count_trades(QUERY_FILTERS)
+            query_ms = (time.perf_counter() - start) / QUERY_PAGES * 1000
+
+            start = time.perf_counter()
+            for index in range(DEBRIEF_SAVES):
+                db_manager.save_daily_debrief(f"2025-01-{index % 28 + 1:02d}", "summary " * index, "", "", "", "")
+            debrief_ms = (time.perf_counter() - start) / DEBRIEF_SAVES * 1000
+        finally:
+            db_manager.close()
+
+    return {
+        'import_seconds': import_seconds,
+        'max_read_ms': max(latencies + errors, default=0) * 1000,
+        'failed_reads': len(errors),
+        'query_ms': query_ms,
+        'debrief_ms': debrief_ms
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Import, query and debrief timings under each connection profile")
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    csv_path = grid_csv(args.rows)
+
+    print(f"{args.rows} rows")
+    print(f"{'profile':<10} {'import s':>9} {'max read ms':>12} {'failed reads':>13} {'query ms':>9} {'debrief ms':>11}")
+    for profile in CONNECTION_PROFILES:
+        result = run_profile(profile, csv_path)
+        print(
+            f"{profile:<10} {result['import_seconds']:>9.2f} {result['max_read_ms']:>12.1f} "
+            f"{result['failed_reads']:>13} {result['query_ms']:>9.2f} {result['debrief_ms']:>11.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
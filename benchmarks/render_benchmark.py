@@ -0,0 +1,84 @@
+import argparse
+import statistics
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from benchmarks.statistics_benchmark import round_trip_rows
+from src.analytics.statistics import columns_from_rows
+from src.utils.charts import CHART_DEFINITIONS, ChartRenderer
+
+# Frame time of the Statistics charts against trade count: clearing the
+# figure and plotting every point as StatisticsTab.update_charts did before,
+# against ChartRenderer.update on persistent artists (lines min/max
+# decimated, the scatter keeping every point). Each frame is the update plus
+# canvas.draw() on an Agg canvas the size of a chart panel.
+#
+#   python -m benchmarks.render_benchmark [--sizes 1000 10000 100000 1000000] [--runs 3]
+
+# Matches ChartPanel's figure
+FIGURE_SIZE = (4, 3)
+FIGURE_DPI = 100
+
+BENCHMARKED_CHARTS = ['pnl', 'scatter']
+
+def chart_definition(name):
+    return next(definition for definition in CHART_DEFINITIONS if definition['name'] == name)
+
+def new_figure():
+    figure = Figure(figsize=FIGURE_SIZE, dpi=FIGURE_DPI)
+    FigureCanvasAgg(figure)
+    return figure
+
+def legacy_update(figure, name, trades):
+    """The equity curve or scatter plot as update_charts drew it, every point on a cleared figure"""
+    figure.clear()
+    pnl_values = trades['pnl']
+    trade_numbers = np.arange(1, len(pnl_values) + 1)
+
+    axes = figure.add_subplot(111)
+    if name == 'scatter':
+        colors = np.where(pnl_values > 0, 'green', 'red')
+        axes.scatter(trade_numbers, pnl_values, c=colors, s=25)
+        axes.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    else:
+        axes.plot(trade_numbers, np.cumsum(pnl_values), marker='o', markersize=3, color='blue')
+    axes.set_xlabel('Trade Number')
+    axes.set_ylabel('P&L')
+    axes.grid(True, linestyle='--', alpha=0.6)
+
+def frame_ms(update, figure, runs):
+    """Median milliseconds of update() followed by a full draw"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        update()
+        figure.canvas.draw()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics chart frame time against trade count, before and after")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chart':<10} {'trades':>10} {'before ms':>10} {'after ms':>10}")
+    for count in args.sizes:
+        trades = columns_from_rows(round_trip_rows(count)[0])
+
+        for name in BENCHMARKED_CHARTS:
+            legacy_figure = new_figure()
+            before = frame_ms(lambda: legacy_update(legacy_figure, name, trades), legacy_figure, args.runs)
+
+            # The panel creates its renderer once; each frame only updates it
+            figure = new_figure()
+            renderer = ChartRenderer(figure, chart_definition(name))
+            after = frame_ms(lambda: renderer.update(trades), figure, args.runs)
+
+            print(f"{name:<10} {count:>10} {before:>10.1f} {after:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.database.db_manager import DatabaseManager
+
+# Application startup: module import times from python -X importtime, and
+# the time to the main window's first paint,
+# each measured in a fresh interpreter on a migrated copy of the shipped
+# database. Runs offscreen.
+#
+#   python -m benchmarks.startup_benchmark [--runs 5]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules reported from the import times; large ones should not load at startup
+REPORTED_MODULES = ['PyQt6.QtWidgets', 'numpy', 'pandas', 'matplotlib', 'PIL', 'src.database.db_manager', 'src.ui.main_window']
+
+# Started as a new interpreter: builds the window as main.py does and reports
+# the seconds from the script starting to the first paint, and which large
+# modules are loaded by then
+FIRST_PAINT_SCRIPT = """
+import sys, time
+START = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+from main import MainWindow
+from src.database.db_manager import DatabaseManager
+from src.utils.init_data import init_default_instruments
+
+db_manager = DatabaseManager(sys.argv[1])
+db_manager.setup_database()
+init_default_instruments(db_manager)
+app = QApplication([])
+window = MainWindow(db_manager)
+window.show()
+
+def painted():
+    loaded = [name for name in ('numpy', 'pandas', 'matplotlib', 'PIL') if name in sys.modules]
+    print(time.perf_counter() - START, ','.join(loaded))
+    app.quit()
+
+QTimer.singleShot(0, painted)
+app.exec()
+"""
+
+def child_environment():
+    """Environment for the measured interpreters"""
+    environment = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    environment['PYTHONPATH'] = REPO_ROOT
+    return environment
+
+def import_times():
+    """Cumulative import time in ms of each reported module for import main (None when not loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=REPO_ROOT, env=child_environment(), capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s+(\S.*)$', line)
+        if match:
+            times[match.group(2).strip()] = int(match.group(1)) / 1000
+    return {name: times.get(name) for name in REPORTED_MODULES + ['main']}
+
+def first_paint(db_path):
+    """(seconds from launching the process and from the script starting to the first paint, modules loaded)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_PAINT_SCRIPT, db_path],
+        cwd=REPO_ROOT, env=child_environment(), capture_output=True, text=True, check=True
+    )
+    launched = time.perf_counter() - start
+    painted, _, loaded = result.stdout.strip().partition(' ')
+    return launched, float(painted), loaded or '-'
+
+def main():
+    parser = argparse.ArgumentParser(description="Import times and time to the main window's first paint")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Migrate once up front, so the runs time an ordinary start
+        db_path = os.path.join(directory, "trading_journal.db")
+        shutil.copy(os.path.join(REPO_ROOT, "trading_journal.db"), db_path)
+        db_manager = DatabaseManager(db_path)
+        db_manager.setup_database()
+        db_manager.close()
+
+        runs = [import_times() for _ in range(args.runs)]
+        print(f"{'module (import main)':<28} {'median ms':>10}")
+        for name in ['main'] + REPORTED_MODULES:
+            values = [run[name] for run in runs if run[name] is not None]
+            median = f"{statistics.median(values):>10.1f}" if values else f"{'not loaded':>10}"
+            print(f"{name:<28} {median}")
+
+        paints = [first_paint(db_path) for _ in range(args.runs)]
+        print()
+        print(f"{'launch to first paint':<28} {statistics.median(run[0] for run in paints) * 1000:>10.1f}")
+        print(f"{'script start to first paint':<28} {statistics.median(run[1] for run in paints) * 1000:>10.1f}")
+        print(f"large modules loaded at first paint: {paints[-1][2]}")
+
+if __name__ == "__main__":
+    main()
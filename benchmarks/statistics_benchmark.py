@@ -0,0 +1,166 @@
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.statistics import STATISTICS_FIELDS, columns_from_rows, calculate_statistics, calculate_weekday_statistics
+
+# Statistics tab metrics from the NumPy engine, against the per-dict Python
+# passes StatisticsTab.calculate_extended_statistics made before. The legacy
+# functions are also the reference the golden tests compare the engine with.
+#
+#   python -m benchmarks.statistics_benchmark [--sizes 10000 100000 1000000]
+
+def round_trip_rows(count, seed=0, days=250):
+    """Synthetic round trip rows in STATISTICS_FIELDS order, oldest entry first, plus their entry times
+
+    P&L is rounded to whole dollars so break-even trades come up, and a few
+    round trips have no hold time like rows imported before exit times were kept.
+    """
+    rng = np.random.default_rng(seed)
+    entry = pd.Timestamp('2025-01-02 09:30:00') + pd.to_timedelta(np.sort(rng.integers(0, 86400 * days, count)), unit='s')
+    hold_seconds = rng.integers(1, 3600, count).astype(object)
+    hold_seconds[rng.random(count) < 0.01] = None
+
+    columns = {
+        'date': list(entry.strftime('%Y-%m-%d')),
+        'weekday': entry.weekday.tolist(),
+        'commission': [2.48] * count,
+        'mae': np.round(rng.uniform(0, 300, count), 2).tolist(),
+        'mfe': np.round(rng.uniform(0, 1500, count), 2).tolist(),
+        'bars': rng.integers(0, 30, count).tolist(),
+        'pnl': np.round(rng.normal(0, 40, count)).tolist(),
+        'hold_seconds': hold_seconds.tolist()
+    }
+    rows = list(zip(*(columns[field] for field in STATISTICS_FIELDS)))
+    return rows, list(entry.strftime('%H:%M:%S'))
+
+def legacy_trades(rows, times):
+    """The list of trade dicts calculate_extended_statistics took"""
+    trades = []
+    for row, entry_time in zip(rows, times):
+        trade = dict(zip(STATISTICS_FIELDS, row))
+        trade['time'] = entry_time
+        trades.append(trade)
+    return trades
+
+def legacy_statistics(trades):
+    """calculate_extended_statistics as it was, minus the demo P&L
+
+    Each trade dict already carries its round trip 'pnl', and hold times are
+    read from 'hold_seconds' (skipping unknown ones) where the old code used
+    bars as a stand-in.
+    """
+    if not trades:
+        return calculate_statistics(columns_from_rows([])).as_dict()
+
+    stats = {
+        "total_trades": len(trades),
+        "winning_trades": sum(1 for t in trades if t['pnl'] > 0),
+        "losing_trades": sum(1 for t in trades if t['pnl'] < 0),
+        "break_even_trades": sum(1 for t in trades if t['pnl'] == 0),
+        "total_commission": sum(float(t.get('commission', 0)) for t in trades),
+        "net_profit": sum(t['pnl'] for t in trades),
+        "total_profit": sum(t['pnl'] for t in trades if t['pnl'] > 0),
+        "total_loss": sum(abs(t['pnl']) for t in trades if t['pnl'] < 0),
+        "largest_winner": max((t['pnl'] for t in trades if t['pnl'] > 0), default=0),
+        "largest_loser": max((abs(t['pnl']) for t in trades if t['pnl'] < 0), default=0),
+        "avg_mfe": sum(float(t.get('mfe', 0)) for t in trades) / len(trades),
+        "avg_mae": sum(float(t.get('mae', 0)) for t in trades) / len(trades)
+    }
+
+    stats["win_rate"] = (stats["winning_trades"] / stats["total_trades"]) * 100
+    stats["loss_rate"] = (stats["losing_trades"] / stats["total_trades"]) * 100
+    stats["break_even_rate"] = (stats["break_even_trades"] / stats["total_trades"]) * 100
+
+    stats["avg_winner"] = stats["total_profit"] / stats["winning_trades"] if stats["winning_trades"] > 0 else 0
+    stats["avg_loser"] = stats["total_loss"] / stats["losing_trades"] if stats["losing_trades"] > 0 else 0
+    stats["avg_trade_pnl"] = stats["net_profit"] / stats["total_trades"]
+
+    # Consecutive wins/losses
+    current_streak = 1
+    max_win_streak = 0
+    max_loss_streak = 0
+    sorted_trades = sorted(trades, key=lambda x: (x['date'], x['time']))
+    for i in range(1, len(sorted_trades)):
+        if (sorted_trades[i]['pnl'] > 0 and sorted_trades[i-1]['pnl'] > 0) or \
+           (sorted_trades[i]['pnl'] < 0 and sorted_trades[i-1]['pnl'] < 0):
+            current_streak += 1
+        else:
+            current_streak = 1
+
+        if sorted_trades[i]['pnl'] > 0:
+            max_win_streak = max(max_win_streak, current_streak)
+        elif sorted_trades[i]['pnl'] < 0:
+            max_loss_streak = max(max_loss_streak, current_streak)
+    stats["max_consecutive_wins"] = max_win_streak
+    stats["max_consecutive_losses"] = max_loss_streak
+
+    # Daily P&L average
+    trades_by_date = {}
+    for trade in trades:
+        trades_by_date.setdefault(trade['date'], []).append(trade)
+    daily_pnl = [sum(t['pnl'] for t in day_trades) for day_trades in trades_by_date.values()]
+    stats["avg_daily_pnl"] = sum(daily_pnl) / len(daily_pnl)
+
+    # Max drawdown (simplified)
+    cumulative_pnl = [0]
+    for trade in sorted_trades:
+        cumulative_pnl.append(cumulative_pnl[-1] + trade['pnl'])
+    peak = max(cumulative_pnl)
+    stats["max_drawdown"] = max(peak - val for val in cumulative_pnl)
+
+    # Average hold times
+    for key, selected in (("avg_hold_time_winners", lambda pnl: pnl > 0), ("avg_hold_time_losers", lambda pnl: pnl < 0)):
+        holds = [t['hold_seconds'] for t in trades if selected(t['pnl']) and t['hold_seconds'] is not None]
+        stats[key] = sum(holds) / len(holds) if holds else 0
+
+    return stats
+
+def legacy_weekday_statistics(trades):
+    """update_daily_statistics' figures as {weekday index: (win rate, average P&L, total P&L)}"""
+    trades_by_day = {day: [] for day in range(5)}
+    for trade in trades:
+        day_of_week = datetime.strptime(trade['date'], '%Y-%m-%d').weekday()
+        if day_of_week < 5:
+            trades_by_day[day_of_week].append(trade)
+
+    results = {}
+    for day_idx, day_trades in trades_by_day.items():
+        if not day_trades:
+            continue
+        wins = sum(1 for t in day_trades if t['pnl'] > 0)
+        total_pnl = sum(t['pnl'] for t in day_trades)
+        results[day_idx] = (wins / len(day_trades) * 100, total_pnl / len(day_trades), total_pnl)
+
+    return results
+
+def engine_statistics(rows):
+    """The NumPy engine on the same rows, including building the column arrays"""
+    columns = columns_from_rows(rows)
+    return calculate_statistics(columns), calculate_weekday_statistics(columns)
+
+def timed(function, *args):
+    """Seconds taken by one call"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics tab metrics: NumPy engine against the old per-dict passes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'round trips':>12} {'before s':>9} {'after s':>9} {'speedup':>8}")
+    for size in args.sizes:
+        rows, times = round_trip_rows(size)
+        trades = legacy_trades(rows, times)
+
+        before = timed(lambda: (legacy_statistics(trades), legacy_weekday_statistics(trades)))
+        after = timed(engine_statistics, rows)
+        print(f"{size:>12} {before:>9.3f} {after:>9.3f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Synthetic NinjaTrader grid exports for the benchmarks and tests. Files are
+# cached under the system temp directory, since the 1M-row grid takes a while
+# to write.
+
+DATA_DIR = os.path.join(tempfile.gettempdir(), "trading_journal_benchmarks")
+
+INSTRUMENTS = ['NQ MAR25', 'ES MAR25', 'CL APR25']
+ACCOUNTS = ['Sim101', 'Sim102']
+
+def money_text(values):
+    """NinjaTrader money strings: $1,234.50 and ($1,234.50) for negatives"""
+    text = pd.Series(np.abs(values)).map('${:,.2f}'.format)
+    return text.where(values >= 0, '(' + text + ')')
+
+def grid_frame(rows, seed=0, start='2025-01-02 09:30:00', days=200):
+    """DataFrame in the NinjaTrader grid export layout, with one closed trade per row"""
+    rng = np.random.default_rng(seed)
+    entry = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 86400 * days, rows), unit='s')
+    exit = entry + pd.to_timedelta(rng.integers(1, 600, rows), unit='s')
+
+    return pd.DataFrame({
+        'Instrument': rng.choice(INSTRUMENTS, rows),
+        'Account': rng.choice(ACCOUNTS, rows),
+        'Strategy': '',
+        'Market pos.': rng.choice(['Long', 'Short'], rows),
+        'Qty': rng.integers(1, 4, rows),
+        'Entry price': np.round(rng.uniform(19000, 20000, rows), 2),
+        'Exit price': np.round(rng.uniform(19000, 20000, rows), 2),
+        'Entry time': entry.strftime('%-m/%-d/%Y %-I:%M:%S %p'),
+        'Exit time': exit.strftime('%-m/%-d/%Y %-I:%M:%S %p'),
+        'Profit': money_text(np.round(rng.normal(0, 200, rows), 2)),
+        'Commission': '$1.24',
+        'MAE': money_text(np.round(rng.uniform(0, 300, rows), 2)),
+        'MFE': money_text(np.round(rng.uniform(0, 1500, rows), 2)),
+        'Bars': rng.integers(0, 30, rows)
+    })
+
+def write_grid_csv(path, rows, seed=0):
+    """Write a synthetic grid export of rows trades to path"""
+    grid_frame(rows, seed).to_csv(path, index=False)
+    return path
+
+def grid_csv(rows, seed=0):
+    """Path of a cached synthetic grid export, written on first use"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"grid_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        write_grid_csv(path, rows, seed)
+    return path
@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+import pytest
+
+from benchmarks.statistics_benchmark import round_trip_rows
+from src.analytics.statistics import columns_from_rows, calculate_statistics, calculate_weekday_statistics
+
+# pytest-benchmark suite for the statistics engine in src/analytics, at
+# several round trip counts. Only NumPy and pandas are loaded (no Qt or
+# database), so it times the engine on its own. Not collected by the
+# default test run:
+#
+#   python -m pytest benchmarks/test_analytics_benchmark.py [-m "not slow"] [--benchmark-compare]
+
+SIZES = [
+    1000,
+    10000,
+    100000,
+    pytest.param(1000000, marks=pytest.mark.slow)
+]
+
+@lru_cache(maxsize=None)
+def rows(count):
+    """Synthetic round trip rows, shared by every benchmark of a size"""
+    return round_trip_rows(count)[0]
+
+@lru_cache(maxsize=None)
+def columns(count):
+    """Column arrays for the synthetic rows; read-only, so safe to share"""
+    return columns_from_rows(rows(count))
+
+@pytest.mark.parametrize('count', SIZES)
+def test_columns_from_rows(benchmark, count):
+    benchmark.group = 'columns_from_rows'
+    result = benchmark(columns_from_rows, rows(count))
+    assert len(result['pnl']) == count
+
+@pytest.mark.parametrize('count', SIZES)
+def test_calculate_statistics(benchmark, count):
+    benchmark.group = 'calculate_statistics'
+    stats = benchmark(calculate_statistics, columns(count))
+    assert stats.total_trades == count
+
+@pytest.mark.parametrize('count', SIZES)
+def test_calculate_weekday_statistics(benchmark, count):
+    benchmark.group = 'calculate_weekday_statistics'
+    weekday_stats = benchmark(calculate_weekday_statistics, columns(count))
+    assert all(day is not None for day in weekday_stats)
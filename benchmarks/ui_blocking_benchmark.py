@@ -0,0 +1,116 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_data import grid_csv
+from src.database.db_manager import DatabaseManager
+
+# How long a Statistics tab refresh blocks the Qt event loop: computing on
+# the GUI thread as refresh_statistics did before, against the
+# StatisticsWorker. A 10 ms QTimer probe records the longest gap between
+# its ticks while the refresh runs and the charts are painted.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.ui_blocking_benchmark [--sizes 10000 100000]
+
+PROBE_INTERVAL_MS = 10
+
+# Time left after the statistics are shown for the deferred chart draws
+SETTLE_SECONDS = 0.5
+
+class FiltersOnly:
+    """Stands in for the Fields & Data tab: no filters besides the Statistics dates"""
+
+    def get_current_filters(self):
+        return {}
+
+def run_probed(app, start, finished):
+    """Call start(), process events until finished() and return the longest event loop gap in ms"""
+    from PyQt6.QtCore import QTimer, QElapsedTimer
+
+    clock = QElapsedTimer()
+    clock.start()
+    gaps = [0]
+    last_tick = [clock.elapsed()]
+
+    def tick():
+        now = clock.elapsed()
+        gaps.append(now - last_tick[0])
+        last_tick[0] = now
+
+    probe = QTimer()
+    probe.timeout.connect(tick)
+    probe.start(PROBE_INTERVAL_MS)
+
+    # Started from the event loop, so a blocking call shows up as a gap
+    QTimer.singleShot(0, start)
+    while not finished():
+        app.processEvents()
+        time.sleep(0.001)
+
+    settle_until = time.perf_counter() + SETTLE_SECONDS
+    while time.perf_counter() < settle_until:
+        app.processEvents()
+        time.sleep(0.001)
+
+    probe.stop()
+    return max(gaps)
+
+def measure(app, db_path):
+    """(blocking ms before, blocking ms after) for one refresh of every trade"""
+    from PyQt6.QtCore import QDate
+    from src.ui.statistics_tab import StatisticsTab
+    from src.analytics.statistics import load_statistics_results
+
+    db_manager = DatabaseManager(db_path)
+    tab = StatisticsTab(db_manager, FiltersOnly())
+    tab.resize(1200, 800)
+    tab.start_date_edit.setDate(QDate(2025, 1, 1))
+    tab.end_date_edit.setDate(QDate(2025, 12, 31))
+    tab.show()
+
+    try:
+        shown = []
+        filters = {'start_date': '2025-01-01', 'end_date': '2025-12-31'}
+
+        def synchronous_refresh():
+            # The query, the statistics and the chart updates all on the GUI thread
+            tab.display_statistics(filters, load_statistics_results(db_manager, filters))
+            shown.append(True)
+
+        before = run_probed(app, synchronous_refresh, lambda: shown)
+
+        # Clear the cache and the displayed results so the worker recomputes everything
+        tab.statistics_cache.invalidate()
+        tab.displayed_filters_key = None
+        after = run_probed(app, tab.refresh_statistics, lambda: tab.displayed_filters_key is not None)
+    finally:
+        tab.close()
+        db_manager.close()
+
+    return before, after
+
+def main():
+    parser = argparse.ArgumentParser(description="Longest GUI event loop stall during a Statistics refresh")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication([])
+
+    print(f"{'trades':>10} {'before ms':>10} {'after ms':>10}")
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "benchmark.db")
+            db_manager = DatabaseManager(db_path)
+            db_manager.setup_database()
+            success, message = db_manager.import_trades(grid_csv(rows))
+            db_manager.close()
+            if not success:
+                raise RuntimeError(message)
+
+            before, after = measure(app, db_path)
+            print(f"{rows:>10} {before:>10} {after:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, asdict
+
+# Immutable results of the statistics engine. They are shared between the
+# statistics cache, the Statistics tab, reports and the command line, so none
+# of them can change a result another one is still showing.
+
+@dataclass(frozen=True)
+class TradeStatistics:
+    """Statistics tab metrics for a set of round trips (all 0 when there are none)"""
+    total_trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    break_even_trades: int = 0
+    win_rate: float = 0
+    loss_rate: float = 0
+    break_even_rate: float = 0
+    net_profit: float = 0
+    total_profit: float = 0
+    total_loss: float = 0
+    total_commission: float = 0
+    avg_daily_pnl: float = 0
+    avg_winner: float = 0
+    avg_loser: float = 0
+    largest_winner: float = 0
+    largest_loser: float = 0
+    avg_trade_pnl: float = 0
+    max_consecutive_wins: int = 0
+    max_consecutive_losses: int = 0
+    avg_hold_time_winners: float = 0
+    avg_hold_time_losers: float = 0
+    max_drawdown: float = 0
+    avg_mfe: float = 0
+    avg_mae: float = 0
+
+    def as_dict(self):
+        """Plain dict of the metrics, e.g. for JSON output"""
+        return asdict(self)
+
+@dataclass(frozen=True)
+class WeekdayStatistics:
+    """Win rate, average and total P&L of the round trips entered on one weekday"""
+    win_rate: float
+    avg_pnl: float
+    total_pnl: float
+
+    def as_dict(self):
+        """Plain dict of the figures, e.g. for JSON output"""
+        return asdict(self)
+
+@dataclass(frozen=True)
+class StatisticsResults:
+    """Everything the Statistics tab shows for one set of filters
+
+    trades holds the round trip columns (read-only arrays, oldest entry
+    first) and weekday_stats one WeekdayStatistics per weekday Monday to
+    Friday, or None for days without trades.
+    """
+    trades: dict
+    stats: TradeStatistics
+    weekday_stats: tuple
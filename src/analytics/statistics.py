@@ -0,0 +1,210 @@
+from dataclasses import replace
+
+import numpy as np
+
+from src.analytics.results import TradeStatistics, WeekdayStatistics, StatisticsResults
+
+# Pure NumPy statistics engine: column arrays in, immutable results out. No Qt
+# or database modules are imported, so it can be used and timed on its own.
+
+# Round trip fields the statistics need, in the order they are selected from the database
+STATISTICS_FIELDS = ['date', 'weekday', 'commission', 'mae', 'mfe', 'bars', 'pnl', 'hold_seconds']
+
+NUMERIC_FIELDS = ['commission', 'mae', 'mfe', 'bars', 'pnl', 'hold_seconds']
+
+# Numeric fields where a missing value stays NaN instead of counting as 0
+NULLABLE_FIELDS = ['hold_seconds']
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+
+# Daily summary fields, in the order they are selected from the database
+SUMMARY_FIELDS = ['date', 'weekday', 'trade_count', 'wins', 'losses', 'gross_pnl', 'commission', 'net_pnl']
+
+def columns_from_rows(rows, fields=STATISTICS_FIELDS):
+    """Turn database rows (in chronological order) into read-only column arrays"""
+    if rows:
+        raw_columns = [np.array(values, dtype=object) for values in zip(*rows)]
+    else:
+        raw_columns = [np.array([], dtype=object) for _ in fields]
+
+    columns = {}
+    for field, values in zip(fields, raw_columns):
+        if field == 'weekday':
+            # Trades without a timestamp have no weekday
+            columns[field] = np.where(values == None, -1, values).astype(int)
+        elif field in NULLABLE_FIELDS:
+            columns[field] = values.astype(float)
+        elif field in NUMERIC_FIELDS:
+            # None becomes NaN on conversion, and is treated as 0 like the UI does
+            columns[field] = np.nan_to_num(values.astype(float))
+        else:
+            columns[field] = np.where(values == None, '', values).astype(str)
+
+        # Results are shared between threads and views, so nothing may change them in place
+        columns[field].flags.writeable = False
+
+    return columns
+
+def max_streak(pnl, mask):
+    """Longest run of consecutive trades selected by mask (ignoring the first trade)"""
+    if len(pnl) < 2:
+        return 0
+
+    # A trade extends the streak when it has the same sign as the previous one
+    same = ((pnl[1:] > 0) & (pnl[:-1] > 0)) | ((pnl[1:] < 0) & (pnl[:-1] < 0))
+
+    # Length of the run of "same" flags ending at each trade, plus the trade itself
+    run_total = np.cumsum(same)
+    last_reset = np.maximum.accumulate(np.where(same, 0, run_total))
+    streaks = run_total - last_reset + 1
+
+    selected = streaks[mask[1:]]
+    return int(selected.max()) if len(selected) else 0
+
+def known_mean(values):
+    """Mean of the values that are not NaN, or 0 when there are none"""
+    known = values[~np.isnan(values)]
+    return float(known.mean()) if len(known) else 0
+
+def calculate_statistics(columns):
+    """Calculate the Statistics tab metrics from chronologically sorted columns"""
+    pnl = columns['pnl']
+    total_trades = len(pnl)
+
+    if not total_trades:
+        return TradeStatistics()
+
+    winners = pnl > 0
+    losers = pnl < 0
+    winning_trades = int(winners.sum())
+    losing_trades = int(losers.sum())
+
+    total_profit = float(pnl[winners].sum())
+    # Adding 0.0 turns the -0.0 of no losers into 0.0
+    total_loss = float(-pnl[losers].sum()) + 0.0
+    net_profit = float(pnl.sum())
+
+    break_even_trades = total_trades - winning_trades - losing_trades
+
+    # Max drawdown (simplified): highest point of the equity curve minus its lowest
+    cumulative_pnl = np.concatenate(([0.0], np.cumsum(pnl)))
+
+    return TradeStatistics(
+        total_trades=total_trades,
+        winning_trades=winning_trades,
+        losing_trades=losing_trades,
+        break_even_trades=break_even_trades,
+        # Calculate percentages
+        win_rate=winning_trades / total_trades * 100,
+        loss_rate=losing_trades / total_trades * 100,
+        break_even_rate=break_even_trades / total_trades * 100,
+        net_profit=net_profit,
+        total_profit=total_profit,
+        total_loss=total_loss,
+        total_commission=float(columns['commission'].sum()),
+        # Average P&L per trading day
+        avg_daily_pnl=net_profit / len(np.unique(columns['date'])),
+        # Calculate average values
+        avg_winner=total_profit / winning_trades if winning_trades > 0 else 0,
+        avg_loser=total_loss / losing_trades if losing_trades > 0 else 0,
+        largest_winner=float(pnl[winners].max()) if winning_trades else 0,
+        largest_loser=float(-pnl[losers].min()) if losing_trades else 0,
+        avg_trade_pnl=net_profit / total_trades,
+        # Calculate consecutive wins/losses
+        max_consecutive_wins=max_streak(pnl, winners),
+        max_consecutive_losses=max_streak(pnl, losers),
+        # Average hold times in seconds, from entry to exit of each round trip
+        avg_hold_time_winners=known_mean(columns['hold_seconds'][winners]),
+        avg_hold_time_losers=known_mean(columns['hold_seconds'][losers]),
+        max_drawdown=float(cumulative_pnl.max() - cumulative_pnl.min()),
+        avg_mfe=float(columns['mfe'].mean()),
+        avg_mae=float(columns['mae'].mean())
+    )
+
+def calculate_weekday_statistics(columns):
+    """WeekdayStatistics for each weekday Monday to Friday (None when no trades)"""
+    pnl = columns['pnl']
+    weekdays = columns['weekday']
+
+    results = []
+    for day in range(len(WEEKDAY_NAMES)):
+        day_pnl = pnl[weekdays == day]
+
+        if not len(day_pnl):
+            results.append(None)
+            continue
+
+        results.append(WeekdayStatistics(
+            win_rate=float((day_pnl > 0).sum()) / len(day_pnl) * 100,
+            avg_pnl=float(day_pnl.mean()),
+            total_pnl=float(day_pnl.sum())
+        ))
+
+    return tuple(results)
+
+def summary_from_rows(rows):
+    """Turn daily summary rows into column arrays"""
+    if rows:
+        raw_columns = [np.array(values, dtype=object) for values in zip(*rows)]
+    else:
+        raw_columns = [np.array([], dtype=object) for _ in SUMMARY_FIELDS]
+
+    summary = {}
+    for field, values in zip(SUMMARY_FIELDS, raw_columns):
+        if field == 'date':
+            summary[field] = values.astype(str)
+        elif field == 'weekday':
+            # Trades without a timestamp have no weekday
+            summary[field] = np.where(values == None, -1, values).astype(int)
+        else:
+            summary[field] = np.nan_to_num(values.astype(float))
+
+    return summary
+
+def average_daily_pnl(summary):
+    """Net P&L per trading day from daily summary columns"""
+    days = len(np.unique(summary['date']))
+    return float(summary['net_pnl'].sum()) / days if days else 0
+
+def calculate_summary_weekday_statistics(summary):
+    """calculate_weekday_statistics from daily summary columns instead of round trips"""
+    results = []
+    for day in range(len(WEEKDAY_NAMES)):
+        selected = summary['weekday'] == day
+        # Python numbers, as calculate_weekday_statistics returns
+        trade_count = int(summary['trade_count'][selected].sum())
+
+        if not trade_count:
+            results.append(None)
+            continue
+
+        net_pnl = float(summary['net_pnl'][selected].sum())
+        results.append(WeekdayStatistics(
+            win_rate=int(summary['wins'][selected].sum()) / trade_count * 100,
+            avg_pnl=net_pnl / trade_count,
+            total_pnl=net_pnl
+        ))
+
+    return tuple(results)
+
+def load_statistics_results(db_manager, filters):
+    """StatisticsResults for the filtered round trips of a DatabaseManager (or anything with its query methods)"""
+    trades = db_manager.get_round_trip_columns(filters)
+    stats = calculate_statistics(trades)
+
+    # Per-day figures come from the daily rollup when it covers these filters
+    if trades['pnl'].size and db_manager.daily_summary_supports(filters):
+        summary = db_manager.get_daily_summary(filters)
+        stats = replace(stats, avg_daily_pnl=average_daily_pnl(summary))
+        weekday_stats = calculate_summary_weekday_statistics(summary)
+    else:
+        weekday_stats = calculate_weekday_statistics(trades)
+
+    return StatisticsResults(trades=trades, stats=stats, weekday_stats=weekday_stats)
+
+def weekday_table(weekday_stats):
+    """Weekday statistics as {weekday name: dict or None}, e.g. for JSON output"""
+    return {
+        name: day_stats.as_dict() if day_stats else None
+        for name, day_stats in zip(WEEKDAY_NAMES, weekday_stats)
+    }
@@ -0,0 +1,232 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.database.db_manager import DatabaseManager
+from src.utils.csv_importer import CSVImporter
+from src.utils.init_data import init_default_instruments
+from src.analytics.statistics import load_statistics_results, weekday_table
+
+# Command line interface: python -m src import|trades|stats ...
+# Only the database layer and the statistics engine are used, so it never
+# imports PyQt6, matplotlib or PIL and runs on machines without a display.
+
+# Filters accepted by trades and stats; the same keys as the Fields & Data tab
+FILTER_KEYS = [
+    'start_date', 'end_date', 'start_time', 'end_time', 'instrument',
+    'account', 'action', 'entry_strategy', 'min_bars', 'max_bars'
+]
+
+OUTPUT_FORMATS = ['csv', 'json']
+
+def date_text(value):
+    """argparse type for a YYYY-MM-DD date"""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD")
+    return value
+
+def time_text(value):
+    """argparse type for an HH:MM:SS (or HH:MM) time, returned as HH:MM:SS"""
+    for time_format in ('%H:%M:%S', '%H:%M'):
+        try:
+            return datetime.strptime(value, time_format).strftime('%H:%M:%S')
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"invalid time {value!r}, expected HH:MM:SS")
+
+def print_error(message):
+    """Report an error on stderr, keeping stdout for data"""
+    print(message, file=sys.stderr)
+
+def filter_arguments():
+    """Parent parser with the trade filter options"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("filters")
+    group.add_argument('--start-date', type=date_text, help="First entry date, YYYY-MM-DD")
+    group.add_argument('--end-date', type=date_text, help="Last entry date, YYYY-MM-DD")
+    group.add_argument('--start-time', type=time_text, help="Earliest entry time of day, HH:MM:SS")
+    group.add_argument('--end-time', type=time_text, help="Latest entry time of day, HH:MM:SS")
+    group.add_argument('--instrument')
+    group.add_argument('--account')
+    group.add_argument('--action', choices=['Buy', 'Sell'])
+    group.add_argument('--entry-strategy')
+    group.add_argument('--min-bars', type=int)
+    group.add_argument('--max-bars', type=int)
+    return parser
+
+def get_filters(args):
+    """Filter dict from the parsed filter options"""
+    return {key: getattr(args, key) for key in FILTER_KEYS if getattr(args, key) is not None}
+
+def open_database(path):
+    """Read-only DatabaseManager for an existing, set up database, or None after reporting why not"""
+    if not os.path.exists(path):
+        print_error(f"Error: database {path} not found")
+        return None
+
+    # Read-only connections can't upgrade the schema, and queries on missing
+    # tables would only print an error and return nothing
+    db_manager = DatabaseManager(path, read_only=True)
+    try:
+        needs_setup = db_manager.needs_setup()
+    except sqlite3.Error as e:
+        db_manager.close()
+        print_error(f"Error: cannot read database {path}: {str(e)}")
+        return None
+
+    if needs_setup:
+        db_manager.close()
+        print_error(
+            f"Error: database {path} has not been set up or upgraded; "
+            "open it in the application or import trades into it first"
+        )
+        return None
+    return db_manager
+
+def collect_exports(paths):
+    """CSV files to import: files as given, and the .csv files in any directories (sorted by name)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(name for name in os.listdir(path) if name.lower().endswith('.csv'))
+            files.extend(os.path.join(path, name) for name in names)
+        else:
+            files.append(path)
+    return files
+
+def load_export(csv_path):
+    """Read and map one export in a worker process; returns CSVImporter.load()'s (success, frame or message)"""
+    try:
+        return CSVImporter(csv_path).load()
+    except Exception as e:
+        return False, f"Error reading {csv_path}: {str(e)}"
+
+def run_import(args):
+    """Import NinjaTrader exports, parsing files in parallel and inserting them in order"""
+    files = collect_exports(args.paths)
+    if not files:
+        print_error("Error: no CSV files to import")
+        return 1
+
+    executor = None
+    if len(files) > 1 and args.workers != 1:
+        # Started before the database is opened, so workers never inherit its connections
+        executor = ProcessPoolExecutor(max_workers=args.workers)
+        loads = [executor.submit(load_export, path) for path in files]
+
+    db_manager = DatabaseManager(args.db)
+    failed = 0
+    try:
+        db_manager.setup_database()
+        init_default_instruments(db_manager)
+
+        for index, path in enumerate(files):
+            if executor:
+                # SQLite has one writer, so rows are inserted here while later files are still parsing
+                success, loaded = loads[index].result()
+                if success:
+                    success, message = db_manager.import_mapped_trades(loaded, path)
+                else:
+                    message = loaded
+            else:
+                success, message = db_manager.import_trades(path)
+
+            if success:
+                print(message)
+            else:
+                failed += 1
+                print_error(f"{os.path.basename(path)}: {message}")
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        db_manager.close()
+
+    return 1 if failed else 0
+
+def write_csv_rows(rows, fieldnames):
+    """Write dict rows as CSV to stdout"""
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+def run_trades(args):
+    """Print the executions matching the filters, newest first"""
+    db_manager = open_database(args.db)
+    if db_manager is None:
+        return 1
+
+    try:
+        trades = db_manager.get_trades(get_filters(args), args.limit, args.offset)
+    finally:
+        db_manager.close()
+
+    if args.format == 'json':
+        json.dump(trades, sys.stdout, indent=2)
+        print()
+    elif trades:
+        write_csv_rows(trades, list(trades[0]))
+    return 0
+
+def run_stats(args):
+    """Print the Statistics tab metrics and weekday statistics for the filters"""
+    db_manager = open_database(args.db)
+    if db_manager is None:
+        return 1
+
+    filters = get_filters(args)
+    try:
+        results = load_statistics_results(db_manager, filters)
+    finally:
+        db_manager.close()
+
+    statistics = results.stats.as_dict()
+    weekdays = weekday_table(results.weekday_stats)
+    if args.format == 'json':
+        json.dump({'filters': filters, 'statistics': statistics, 'weekdays': weekdays}, sys.stdout, indent=2)
+        print()
+        return 0
+
+    # One metric per row; weekday figures are named like Mon_win_rate
+    rows = [{'metric': key, 'value': value} for key, value in statistics.items()]
+    for name, day_stats in weekdays.items():
+        for key, value in (day_stats or {}).items():
+            rows.append({'metric': f"{name}_{key}", 'value': value})
+    write_csv_rows(rows, ['metric', 'value'])
+    return 0
+
+def build_parser():
+    """Argument parser with the import, trades and stats subcommands"""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Trading Journal without the user interface")
+    parser.add_argument('--db', default="trading_journal.db", help="Database file (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Import NinjaTrader CSV exports")
+    import_parser.add_argument('paths', nargs='+', help="CSV files, or directories of them")
+    import_parser.add_argument('--workers', type=int, default=None, help="Processes parsing files (default: one per CPU)")
+    import_parser.set_defaults(handler=run_import)
+
+    filters = filter_arguments()
+
+    trades_parser = subparsers.add_parser('trades', parents=[filters], help="List trades, newest first")
+    trades_parser.add_argument('--limit', type=int, default=None)
+    trades_parser.add_argument('--offset', type=int, default=0)
+    trades_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="(default: %(default)s)")
+    trades_parser.set_defaults(handler=run_trades)
+
+    stats_parser = subparsers.add_parser('stats', parents=[filters], help="Statistics for the matching round trips")
+    stats_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', help="(default: %(default)s)")
+    stats_parser.set_defaults(handler=run_stats)
+
+    return parser
+
+def main(argv=None):
+    """Run a command and return the process exit code"""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
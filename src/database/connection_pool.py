@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# PRAGMA settings applied to every connection, by profile name
+CONNECTION_PROFILES = {
+    # SQLite's own defaults (rollback journal, full sync)
+    'default': {},
+    # WAL lets the statistics worker read while an import is writing; NORMAL sync
+    # is still crash-safe in WAL mode and only risks the last commits on power loss
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # Negative values are KiB, so 64 MiB
+        'temp_store': 'MEMORY'
+    }
+}
+DEFAULT_PROFILE = 'fast'
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Threads that may hold a reader connection at the same time
+DEFAULT_MAX_READERS = 4
+
+class ConnectionPool:
+    """One writer connection plus a read-only connection per reading thread
+
+    Use writer() for anything that modifies the database; it is serialized
+    across threads and commits when the outermost block exits (or rolls
+    back if it raises). reader() gives each thread its own connection so
+    reads never share a cursor with another thread. Inside a writer block
+    reader() returns the writer's connection, so reads see the pending writes.
+    """
+
+    def __init__(self, db_path, profile=DEFAULT_PROFILE, max_readers=DEFAULT_MAX_READERS, read_only=False):
+        if profile not in CONNECTION_PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
+
+        self.db_path = db_path
+        self.profile = profile
+        self.read_only = read_only
+
+        self.writer_conn = None
+        self.writer_lock = threading.RLock()
+        # Nesting depth of writer() blocks, per thread
+        self.writer_state = threading.local()
+        # Callbacks run after a writer transaction is rolled back
+        self.rollback_listeners = []
+
+        self.local = threading.local()
+        self.reader_slots = threading.BoundedSemaphore(max_readers)
+        # Every reader ever opened, so close() and interrupt() reach other threads' connections
+        self.reader_conns = []
+        self.readers_lock = threading.Lock()
+
+        # Opening the writer first also creates a new database file for the readers
+        if not read_only:
+            self.writer_conn = self.open_connection(read_only=False)
+
+    def open_connection(self, read_only):
+        """Open a connection with the pool's profile applied"""
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(
+                uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+
+        for pragma, value in CONNECTION_PROFILES[self.profile].items():
+            # The journal mode is stored in the database file, so only the writer sets it
+            if pragma == 'journal_mode' and read_only:
+                continue
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+        return conn
+
+    def add_rollback_listener(self, listener):
+        """Register listener() to be called after a writer transaction rolls back,
+        e.g. to drop anything cached from writes that were undone"""
+        self.rollback_listeners.append(listener)
+
+    def owns_writer(self):
+        """True when the current thread is inside a writer() block"""
+        return getattr(self.writer_state, 'depth', 0) > 0
+
+    @contextmanager
+    def writer(self):
+        """Cursor on the writer connection; commits when the outermost block exits"""
+        if self.writer_conn is None:
+            raise sqlite3.OperationalError("Connection pool is read-only")
+
+        with self.writer_lock:
+            depth = getattr(self.writer_state, 'depth', 0)
+            self.writer_state.depth = depth + 1
+            try:
+                yield self.writer_conn.cursor()
+            except BaseException:
+                if depth == 0:
+                    self.writer_conn.rollback()
+                    for listener in self.rollback_listeners:
+                        listener()
+                raise
+            else:
+                if depth == 0:
+                    self.writer_conn.commit()
+            finally:
+                self.writer_state.depth = depth
+
+    @contextmanager
+    def reader(self):
+        """Cursor on this thread's read-only connection"""
+        if self.owns_writer():
+            yield self.writer_conn.cursor()
+            return
+
+        local = self.local
+        depth = getattr(local, 'depth', 0)
+        if depth == 0:
+            self.reader_slots.acquire()
+
+        local.depth = depth + 1
+        try:
+            conn = getattr(local, 'conn', None)
+            if conn is None:
+                conn = self.open_connection(read_only=True)
+                local.conn = conn
+                with self.readers_lock:
+                    self.reader_conns.append(conn)
+
+            yield conn.cursor()
+        finally:
+            local.depth = depth
+            if depth == 0:
+                self.reader_slots.release()
+
+    def interrupt(self):
+        """Abort queries running on any of the pool's connections"""
+        with self.readers_lock:
+            connections = list(self.reader_conns)
+        if self.writer_conn is not None:
+            connections.append(self.writer_conn)
+
+        for conn in connections:
+            conn.interrupt()
+
+    def close(self):
+        """Close every connection the pool opened"""
+        with self.readers_lock:
+            for conn in self.reader_conns:
+                conn.close()
+            self.reader_conns = []
+        # Threads that read before will open a fresh connection next time
+        self.local = threading.local()
+
+        if self.writer_conn is not None:
+            with self.writer_lock:
+                self.writer_conn.close()
+                self.writer_conn = None
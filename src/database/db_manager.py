@@ -1,175 +1,960 @@
-import sqlite3
 import os
-import pandas as pd
-from datetime import datetime
-from src.utils.csv_importer import CSVImporter
+from src.database.connection_pool import ConnectionPool, CONNECTION_PROFILES, DEFAULT_PROFILE
+from src.database.instrument_registry import InstrumentRegistry
+from src.utils.trade_matcher import (
+    TradeMatcher, MATCHING_METHODS, MATCHING_METHOD_SETTING, DEFAULT_MATCHING_METHOD, closed_round_trip
+)
+from src.utils.timestamps import (
+    TIMEZONE_SETTING, LOCAL_TIMEZONE, get_timezone, local_timestamps, day_start_timestamp, time_of_day_seconds
+)
+
+# The CSV importer and the statistics engine are imported where they are used,
+# so numpy and pandas stay unloaded until trades are imported or analysed
+
+# Trade table columns written by the importer, with defaults for missing CSV fields
+TRADE_COLUMNS = [
+    ('date', ''),
+    ('time', ''),
+    ('instrument', ''),
+    ('action', ''),
+    ('quantity', 0),
+    ('price', 0.0),
+    ('commission', 0.0),
+    ('mae', 0.0),
+    ('mfe', 0.0),
+    ('bars', 0),
+    ('entry_strategy', ''),
+    ('notes', ''),
+    ('account', None),
+    ('exit_price', None),
+    ('exit_date', None),
+    ('exit_time', None),
+    ('profit', None),
+    ('fingerprint', None),
+    ('entry_ts', None),
+    ('exit_ts', None),
+    ('utc_offset', None)
+]
+
+# Columns added to the trades table after its first release, with their types
+TRADE_MIGRATION_COLUMNS = [
+    ('account', 'TEXT'),
+    ('exit_price', 'REAL'),
+    ('exit_date', 'TEXT'),
+    ('exit_time', 'TEXT'),
+    ('profit', 'REAL'),
+    ('entry_ts', 'INTEGER'),
+    ('exit_ts', 'INTEGER'),
+    ('utc_offset', 'INTEGER'),
+    # Local time of day and weekday (Monday=0) of the entry, from its wall-clock
+    # seconds entry_ts + utc_offset; day 0 of the epoch was a Thursday
+    ('entry_tod', "INTEGER GENERATED ALWAYS AS ((entry_ts + utc_offset) % 86400) VIRTUAL"),
+    ('entry_weekday', "INTEGER GENERATED ALWAYS AS (((entry_ts + utc_offset) / 86400 + 3) % 7) VIRTUAL")
+]
+
+# Trade indexes dropped on upgrade: those keyed on the TEXT (date, time) pair
+# before entry_ts replaced it, the bars index (a bars range can't keep
+# entry_ts order, so queries using it needed a sort) and the (entry_ts,
+# entry_tod) indexes, which could not order trades sharing an entry_ts by id
+OBSOLETE_TRADE_INDEXES = [
+    'idx_trades_date_time', 'idx_trades_instrument_date_time', 'idx_trades_action_date_time',
+    'idx_trades_strategy_date_time', 'idx_trades_bars_date_time', 'idx_trades_account_date_time',
+    'idx_trades_bars_entry_ts', 'idx_trades_entry_ts', 'idx_trades_instrument_entry_ts',
+    'idx_trades_account_entry_ts', 'idx_trades_action_entry_ts', 'idx_trades_strategy_entry_ts'
+]
+
+# Tables created by setup_database; a database missing any of them needs upgrading
+SCHEMA_TABLES = ['instruments', 'trades', 'settings', 'trade_images', 'round_trips', 'daily_summary', 'daily_debrief']
+
+# Trades columns read for a statistics field when the names differ
+TRADE_STATISTICS_COLUMNS = {'weekday': 'entry_weekday'}
+
+# Round trip columns written by the matching engine
+ROUND_TRIP_COLUMNS = [
+    'instrument', 'entry_trade_id', 'exit_trade_id', 'direction', 'quantity',
+    'entry_date', 'entry_time', 'exit_date', 'exit_time', 'entry_price',
+    'exit_price', 'points', 'commission', 'profit', 'pnl', 'hold_seconds'
+]
+
+def round_trip_pnl(round_trip, multiplier):
+    """Net P&L: broker reported profit when known, otherwise points at the instrument multiplier"""
+    gross = round_trip['profit'] if round_trip.get('profit') is not None else round_trip['points'] * multiplier
+    return gross - round_trip['commission']
+
+class ImportCancelled(Exception):
+    """Raised inside an import transaction to roll it back"""
+
+# Executions matched between checks for a cancelled import
+CANCEL_CHECK_INTERVAL = 10000
+
+# Settings key holding the id of the last trade stored before accounts and exits were imported
+LEGACY_TRADES_SETTING = 'last_legacy_trade_id'
+
+# Fields a re-import fills in on a legacy trade that matches one of its rows
+LEGACY_UPGRADE_COLUMNS = ['account', 'exit_price', 'exit_date', 'exit_time', 'exit_ts', 'profit', 'fingerprint']
+
+# Statistics fields read from the round trip rather than its entry execution
+ROUND_TRIP_STATISTICS_FIELDS = ['commission', 'pnl', 'hold_seconds']
+
+# Filters the daily summary can answer; time of day, action and bars need the round trips
+DAILY_SUMMARY_FILTERS = ['start_date', 'end_date', 'instrument', 'entry_strategy']
+FULL_DAY = ('00:00:00', '23:59:59')
 
 class DatabaseManager:
-    def __init__(self, db_path="trading_journal.db"):
+    def __init__(self, db_path="trading_journal.db", matching_method=None, read_only=False, profile=DEFAULT_PROFILE):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        # Matching method setting, loaded on first use unless one is given
+        self.matching_method = matching_method
+        self.read_only = read_only
+        self.profile = profile
+        self.pool = None
+        self.instrument_registry = None
+        # tzinfo of the timezone setting, loaded on first use
+        self.timezone = None
+        # Callbacks told which trades changed after each committed write
+        self.change_listeners = []
         self.connect()
         
     def connect(self):
-        """Establish connection to the database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        """Open the connection pool for the database"""
+        # Read-only managers (e.g. background workers) only ever open reader connections
+        self.pool = ConnectionPool(self.db_path, self.profile, read_only=self.read_only)
+        # Instrument multipliers are read once and then served from memory
+        self.instrument_registry = InstrumentRegistry(self.pool)
         
+    def get_pragmas(self):
+        """Current values of the PRAGMA settings any profile changes"""
+        pragmas = {}
+        with self.pool.reader() as cursor:
+            for pragma in sorted(set().union(*CONNECTION_PROFILES.values())):
+                pragmas[pragma] = cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+        return pragmas
+        
+    def interrupt(self):
+        """Abort any query running on this manager's connections (safe to call from another thread)"""
+        if self.pool:
+            self.pool.interrupt()
+        
+    def add_change_listener(self, listener):
+        """Register listener(change) to be called after trade data is committed
+        
+        change holds the keyword arguments of StatisticsCache.invalidate:
+        instruments, start_date, end_date and entry_strategies, each None
+        when it is not known.
+        """
+        self.change_listeners.append(listener)
+        
+    def notify_change(self, **change):
+        """Tell the change listeners which trades were modified"""
+        for listener in self.change_listeners:
+            listener(change)
+            
     def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close the database connections"""
+        if self.pool:
+            self.pool.close()
             
     def setup_database(self):
         """Create necessary tables if they don't exist"""
-        # Create Instruments table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS instruments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            multiplier REAL NOT NULL
-        )
-        ''')
-        
-        # Create Trades table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS trades (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT NOT NULL,
-            time TEXT NOT NULL,
-            instrument TEXT NOT NULL,
-            action TEXT NOT NULL,
-            quantity INTEGER NOT NULL,
-            price REAL NOT NULL,
-            commission REAL,
-            mae REAL,
-            mfe REAL,
-            bars INTEGER,
-            entry_strategy TEXT,
-            notes TEXT,
-            FOREIGN KEY (instrument) REFERENCES instruments(name)
-        )
-        ''')
-        
-        # Create Images table for storing photos related to trades
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS trade_images (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            trade_id INTEGER NOT NULL,
-            image_path TEXT NOT NULL,
-            FOREIGN KEY (trade_id) REFERENCES trades(id)
-        )
-        ''')
-        
-        # Create Daily Debrief table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS daily_debrief (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT UNIQUE NOT NULL,
-            intraday_summary TEXT,
-            feelings TEXT,
-            recurring_patterns TEXT,
-            best_play_out TEXT,
-            leverage_info TEXT
-        )
-        ''')
+        with self.pool.writer() as cursor:
+            # Create Instruments table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS instruments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                multiplier REAL NOT NULL
+            )
+            ''')
+            
+            # Create Trades table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                instrument TEXT NOT NULL,
+                action TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                price REAL NOT NULL,
+                commission REAL,
+                mae REAL,
+                mfe REAL,
+                bars INTEGER,
+                entry_strategy TEXT,
+                notes TEXT,
+                account TEXT,
+                exit_price REAL,
+                exit_date TEXT,
+                exit_time TEXT,
+                profit REAL,
+                fingerprint TEXT,
+                entry_ts INTEGER,
+                exit_ts INTEGER,
+                utc_offset INTEGER,
+                entry_tod INTEGER GENERATED ALWAYS AS ((entry_ts + utc_offset) % 86400) VIRTUAL,
+                entry_weekday INTEGER GENERATED ALWAYS AS (((entry_ts + utc_offset) / 86400 + 3) % 7) VIRTUAL,
+                FOREIGN KEY (instrument) REFERENCES instruments(name)
+            )
+            ''')
+            
+            # Create Settings table for user preferences such as the import timezone
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            ''')
+            
+            # Exit, account, broker profit and UTC timestamp columns added since the first release
+            added_columns = [
+                column for column, definition in TRADE_MIGRATION_COLUMNS
+                if self.ensure_column('trades', column, definition)
+            ]
+            if 'entry_ts' in added_columns:
+                self.update_timestamps()
+            
+            # Trades stored so far have no account or exit; re-importing them fills those in
+            if 'account' in added_columns:
+                cursor.execute("SELECT MAX(id) FROM trades")
+                last_legacy_id = cursor.fetchone()[0]
+                if last_legacy_id:
+                    self.save_setting(LEGACY_TRADES_SETTING, str(last_legacy_id))
+            
+            for index in OBSOLETE_TRADE_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+            
+            # Indexes matching the Fields & Data filters; each ends in (entry_ts, id, entry_tod)
+            # so filtered results come back already in display order (id breaking ties
+            # between trades entered in the same second), pages can seek to a
+            # (entry_ts, id) key and time of day windows are checked without reading the table
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_entry_ts_id ON trades(entry_ts, id, entry_tod)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_instrument_entry_ts_id ON trades(instrument, entry_ts, id, entry_tod)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_account_entry_ts_id ON trades(account, entry_ts, id, entry_tod)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_action_entry_ts_id ON trades(action, entry_ts, id, entry_tod)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_strategy_entry_ts_id ON trades(entry_strategy, entry_ts, id, entry_tod)")
+            
+            # Execution fingerprints let re-imports skip rows that are already stored
+            if self.ensure_column('trades', 'fingerprint', 'TEXT'):
+                self.backfill_fingerprints()
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_trades_fingerprint ON trades(fingerprint)")
+            
+            # Create Images table for storing photos related to trades
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trade_images (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trade_id INTEGER NOT NULL,
+                image_path TEXT NOT NULL,
+                FOREIGN KEY (trade_id) REFERENCES trades(id)
+            )
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_images_trade_id ON trade_images(trade_id)")
+            
+            # Create Round Trips table: executions paired into closed positions with realized P&L
+            round_trips_exist = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'round_trips'"
+            ).fetchone()
+            
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS round_trips (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                instrument TEXT NOT NULL,
+                entry_trade_id INTEGER NOT NULL,
+                exit_trade_id INTEGER NOT NULL,
+                direction TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                entry_date TEXT,
+                entry_time TEXT,
+                exit_date TEXT,
+                exit_time TEXT,
+                entry_price REAL,
+                exit_price REAL,
+                points REAL NOT NULL,
+                commission REAL,
+                profit REAL,
+                pnl REAL NOT NULL,
+                hold_seconds INTEGER,
+                FOREIGN KEY (instrument) REFERENCES instruments(name),
+                FOREIGN KEY (entry_trade_id) REFERENCES trades(id),
+                FOREIGN KEY (exit_trade_id) REFERENCES trades(id)
+            )
+            ''')
+            
+            self.ensure_column('round_trips', 'profit', 'REAL')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_round_trips_instrument ON round_trips(instrument)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_round_trips_entry_trade_id ON round_trips(entry_trade_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_round_trips_exit_trade_id ON round_trips(exit_trade_id)")
+            
+            # Create Daily Summary table: round trips rolled up per entry date, instrument and strategy
+            daily_summary_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_summary'"
+            ).fetchone()
+            
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_summary (
+                date TEXT NOT NULL,
+                instrument TEXT NOT NULL,
+                entry_strategy TEXT NOT NULL DEFAULT '',
+                weekday INTEGER,
+                trade_count INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                losses INTEGER NOT NULL,
+                gross_pnl REAL NOT NULL,
+                commission REAL NOT NULL,
+                net_pnl REAL NOT NULL,
+                PRIMARY KEY (date, instrument, entry_strategy)
+            )
+            ''')
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_summary_instrument_date ON daily_summary(instrument, date)")
+            
+            # Create Daily Debrief table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_debrief (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT UNIQUE NOT NULL,
+                intraday_summary TEXT,
+                feelings TEXT,
+                recurring_patterns TEXT,
+                best_play_out TEXT,
+                leverage_info TEXT
+            )
+            ''')
+            
+            # Roll up round trips matched before the daily_summary table existed
+            if round_trips_exist and not daily_summary_exists:
+                self.refresh_daily_summary()
         
-        # Save changes
-        self.conn.commit()
+        # Match trades imported before the round_trips table existed
+        if not round_trips_exist:
+            self.rebuild_round_trips()
         
-    def import_trades(self, csv_path):
-        """Import trades from CSV file"""
+    def ensure_column(self, table, column, definition):
+        """Add a column to an existing table if it is missing, returning True when it was added"""
+        with self.pool.writer() as cursor:
+            # table_xinfo also lists generated columns
+            cursor.execute(f"PRAGMA table_xinfo({table})")
+            if column in [row[1] for row in cursor.fetchall()]:
+                return False
+            
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            return True
+    
+    def needs_setup(self):
+        """True when setup_database has not created or upgraded every table and trades column"""
+        with self.pool.reader() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            if not tables.issuperset(SCHEMA_TABLES):
+                return True
+            
+            cursor.execute("PRAGMA table_xinfo(trades)")
+            columns = {row[1] for row in cursor.fetchall()}
+            return not columns.issuperset([column for column, _ in TRADE_MIGRATION_COLUMNS] + ['fingerprint'])
+    
+    def backfill_fingerprints(self):
+        """Fingerprint trades stored before fingerprints existed
+        
+        Trades imported before accounts and exits were stored count them as
+        empty. Rows whose fingerprint is already taken are left without one.
+        """
+        from src.utils.csv_importer import execution_fingerprints
+        
+        with self.pool.writer() as cursor:
+            cursor.execute("""
+            SELECT id, instrument, account, date, time, action, quantity, price,
+                exit_date || ' ' || exit_time
+            FROM trades
+            WHERE fingerprint IS NULL
+            ORDER BY id
+            """)
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            
+            ids, *fields = zip(*rows)
+            fingerprints = execution_fingerprints(*fields)
+            
+            cursor.executemany(
+                "UPDATE OR IGNORE trades SET fingerprint = ? WHERE id = ?",
+                zip(fingerprints, ids)
+            )
+    
+    def get_setting(self, key, default=None):
+        """Get a stored setting value"""
+        with self.pool.reader() as cursor:
+            cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
+            result = cursor.fetchone()
+            return result[0] if result else default
+    
+    def save_setting(self, key, value):
+        """Store a setting value"""
+        with self.pool.writer() as cursor:
+            cursor.execute('''
+            INSERT INTO settings (key, value) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            ''', (key, value))
+    
+    def get_timezone_name(self):
+        """Timezone setting the imported dates and times are interpreted in"""
+        return self.get_setting(TIMEZONE_SETTING, LOCAL_TIMEZONE)
+    
+    def get_timezone(self):
+        """tzinfo for the timezone setting"""
+        if self.timezone is None:
+            self.timezone = get_timezone(self.get_timezone_name())
+        return self.timezone
+    
+    def set_timezone(self, name):
+        """Change the timezone of the stored trades, recomputing their UTC timestamps"""
         try:
-            # Use the CSVImporter to read and map the file
-            importer = CSVImporter(csv_path)
-            valid, message = importer.validate_csv()
+            # Validate before anything is written
+            timezone = get_timezone(name)
             
-            if not valid:
-                return False, message
+            # One transaction, so a failed rematch leaves the old timezone and timestamps
+            with self.pool.writer():
+                self.save_setting(TIMEZONE_SETTING, name)
+                self.timezone = timezone
+                self.update_timestamps()
                 
-            success, df = importer.read_csv()
+                # Hold times can change across daylight saving transitions
+                self.rebuild_round_trips()
+            
+            self.notify_change()
+            return True, f"Trade times are now interpreted as {name}"
+        except Exception as e:
+            # Reload whichever setting is stored
+            self.timezone = None
+            return False, f"Error changing timezone: {str(e)}"
+    
+    def get_matching_method(self):
+        """Matching method (FIFO or LIFO) executions are paired into round trips with"""
+        if self.matching_method is None:
+            self.matching_method = self.get_setting(MATCHING_METHOD_SETTING, DEFAULT_MATCHING_METHOD)
+        return self.matching_method
+    
+    def update_timestamps(self):
+        """Recompute entry_ts, exit_ts and utc_offset of every trade from its local date and time"""
+        timezone = self.get_timezone()
+        
+        with self.pool.writer() as cursor:
+            cursor.execute("SELECT id, date, time, exit_date, exit_time FROM trades")
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            
+            ids, dates, times, exit_dates, exit_times = zip(*rows)
+            entry_ts, utc_offsets = local_timestamps(dates, times, timezone)
+            exit_ts, _ = local_timestamps(exit_dates, exit_times, timezone)
+            
+            cursor.executemany(
+                "UPDATE trades SET entry_ts = ?, exit_ts = ?, utc_offset = ? WHERE id = ?",
+                zip(entry_ts, exit_ts, utc_offsets, ids)
+            )
+    
+    def import_summary(self, inserted, skipped, csv_path):
+        """Message describing how many rows an import added and skipped"""
+        message = f"Successfully imported {inserted} trades from {os.path.basename(csv_path)}"
+        if skipped:
+            message += f" ({skipped} already imported trades skipped)"
+        return message
+    
+    def import_trades(self, csv_path, chunksize=None, progress_callback=None, skip_rows=0):
+        """Import trades from CSV file
+        
+        When chunksize is given the file is streamed in chunks that are each
+        committed on their own, and progress_callback(rows_imported) is called
+        after every chunk. skip_rows resumes an interrupted streaming import.
+        """
+        if chunksize:
+            return self.import_trades_chunked(csv_path, chunksize, progress_callback, skip_rows)
+        
+        from src.utils.csv_importer import CSVImporter
+        
+        try:
+            # Use the CSVImporter to validate, read and map the file in one pass
+            importer = CSVImporter(csv_path)
+            success, mapped_df = importer.load()
             
             if not success:
-                return False, df  # df contains error message in this case
+                return False, mapped_df  # mapped_df contains error message in this case
+            
+            return self.import_mapped_trades(mapped_df, csv_path)
+        except Exception as e:
+            return False, f"Error importing trades: {str(e)}"
+    
+    def import_mapped_trades(self, mapped_df, csv_path):
+        """Import trades already read and mapped by CSVImporter.load() (e.g. in another process)"""
+        try:
+            # Insert all rows in a single transaction
+            inserted, instruments = self.insert_trades(mapped_df)
+            
+            if instruments:
+                self.notify_change(instruments=instruments)
+            return True, self.import_summary(inserted, len(mapped_df) - inserted, csv_path)
+        except Exception as e:
+            return False, f"Error importing trades: {str(e)}"
+    
+    def import_trades_chunked(self, csv_path, chunksize, progress_callback=None, skip_rows=0):
+        """Stream trades from a CSV file, committing after each chunk"""
+        from src.utils.csv_importer import CSVImporter
+        
+        importer = CSVImporter(csv_path)
+        valid, message = importer.validate_csv()
+        
+        if not valid:
+            return False, message
+            
+        rows_imported = 0
+        rows_inserted = 0
+        try:
+            for mapped_df in importer.iter_chunks(chunksize, skip_rows):
+                inserted, instruments = self.insert_trades(mapped_df)
+                if instruments:
+                    self.notify_change(instruments=instruments)
+                
+                rows_imported += len(mapped_df)
+                rows_inserted += inserted
+                if progress_callback:
+                    progress_callback(rows_imported)
+                    
+            return True, self.import_summary(rows_inserted, rows_imported - rows_inserted, csv_path)
+        except Exception as e:
+            return False, (
+                f"Error importing trades: {str(e)}. "
+                f"{rows_imported} trades were saved; resume with skip_rows={skip_rows + rows_imported}"
+            )
+    
+    def import_trades_cancellable(self, csv_path, chunksize=None, progress_callback=None, cancelled=None):
+        """Import trades in a single transaction that can be cancelled between chunks
+        
+        Files are read chunksize rows at a time (DEFAULT_CHUNK_SIZE when None).
+        progress_callback(rows_parsed, rows_inserted) is called as chunks are
+        parsed and inserted. cancelled is an object with is_set() (e.g. a
+        threading.Event); once it is set the import stops and nothing is saved.
+        Round trips are matched once at the end instead of after every chunk.
+        """
+        from src.utils.csv_importer import CSVImporter, DEFAULT_CHUNK_SIZE
+        
+        chunksize = chunksize or DEFAULT_CHUNK_SIZE
+        importer = CSVImporter(csv_path)
+        valid, message = importer.validate_csv()
+        
+        if not valid:
+            return False, message
+        
+        def check_cancelled():
+            if cancelled is not None and cancelled.is_set():
+                raise ImportCancelled()
+        
+        rows_parsed = 0
+        rows_inserted = 0
+        upgraded_instruments = set()
+        try:
+            with self.pool.writer() as cursor:
+                # Ids are never reused, so everything from here on is new
+                cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM trades")
+                first_new_id = cursor.fetchone()[0]
                 
-            # Map CSV columns to our database structure
-            mapped_df = importer.map_columns(df)
-            
-            # Process data and insert into database
-            for _, row in mapped_df.iterrows():
-                # Extract instrument name and ensure it exists
-                instrument = row.get('instrument', '')
-                self.ensure_instrument_exists(instrument)
+                for mapped_df in importer.iter_chunks(chunksize):
+                    check_cancelled()
+                    rows_parsed += len(mapped_df)
+                    if progress_callback:
+                        progress_callback(rows_parsed, rows_inserted)
+                    
+                    inserted, upgraded = self.insert_trade_rows(mapped_df)
+                    rows_inserted += inserted
+                    upgraded_instruments.update(upgraded)
+                    if progress_callback:
+                        progress_callback(rows_parsed, rows_inserted)
                 
-                # Insert trade data
-                self.cursor.execute('''
-                INSERT INTO trades (
-                    date, time, instrument, action, quantity, price,
-                    commission, mae, mfe, bars, entry_strategy, notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    row.get('date', ''),
-                    row.get('time', ''),
-                    instrument,
-                    row.get('action', ''),
-                    row.get('quantity', 0),
-                    row.get('price', 0.0),
-                    row.get('commission', 0.0),
-                    row.get('mae', 0.0),
-                    row.get('mfe', 0.0),
-                    row.get('bars', 0),
-                    row.get('entry_strategy', ''),
-                    row.get('notes', '')
-                ))
-            
-            # Commit changes
-            self.conn.commit()
-            return True, f"Successfully imported {len(mapped_df)} trades from {os.path.basename(csv_path)}"
+                check_cancelled()
+                instruments = self.get_new_instruments(first_new_id)
+                self.update_round_trips(instruments, first_new_id, cancelled, upgraded_instruments)
+                instruments = sorted(set(instruments) | upgraded_instruments)
+            
+            if instruments:
+                self.notify_change(instruments=instruments)
+            return True, self.import_summary(rows_inserted, rows_parsed - rows_inserted, csv_path)
+        except ImportCancelled:
+            return False, "Import cancelled; no trades were saved"
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error importing trades: {str(e)}"
     
-    def ensure_instrument_exists(self, instrument_name, default_multiplier=1.0):
-        """Make sure the instrument exists in the database"""
-        if not instrument_name:
-            return
+    def insert_trades(self, mapped_df):
+        """Bulk insert mapped trade rows in one write transaction
+        
+        Returns the number of rows inserted and the instruments that gained
+        trades or completed legacy ones. Called inside a pool.writer() block the rows join that
+        transaction instead.
+        """
+        if mapped_df.empty:
+            return 0, []
+        
+        with self.pool.writer() as cursor:
+            # Ids are never reused, so everything from here on is new
+            cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM trades")
+            first_new_id = cursor.fetchone()[0]
+            
+            inserted, upgraded_instruments = self.insert_trade_rows(mapped_df)
+            instruments = self.get_new_instruments(first_new_id)
+            
+            # Pair the new executions into round trips
+            self.update_round_trips(instruments, first_new_id, upgraded_instruments=upgraded_instruments)
+        
+        return inserted, sorted(set(instruments) | set(upgraded_instruments))
+    
+    def get_new_instruments(self, first_new_id):
+        """Instruments of the trades inserted from first_new_id on"""
+        with self.pool.reader() as cursor:
+            cursor.execute("SELECT DISTINCT instrument FROM trades WHERE id >= ?", (first_new_id,))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def insert_trade_rows(self, mapped_df):
+        """Insert mapped trade rows and register their instruments, without matching round trips
+        
+        Rows whose fingerprint is already stored are skipped, and rows matching
+        a legacy trade complete it instead. Returns the number inserted and
+        the instruments of the completed legacy trades.
+        """
+        if mapped_df.empty:
+            return 0, []
+        
+        # Convert the frame to column lists once instead of walking it row by row
+        values = {}
+        for column, default in TRADE_COLUMNS:
+            if column in mapped_df.columns:
+                series = mapped_df[column].astype(object)
+                values[column] = series.where(series.notna(), None).tolist()
+            else:
+                values[column] = [default] * len(mapped_df)
+        
+        # UTC timestamps of the local entry and exit times
+        timezone = self.get_timezone()
+        values['entry_ts'], values['utc_offset'] = local_timestamps(values['date'], values['time'], timezone)
+        values['exit_ts'], _ = local_timestamps(values['exit_date'], values['exit_time'], timezone)
+        
+        columns = [values[column] for column, _ in TRADE_COLUMNS]
         
-        self.cursor.execute("SELECT name FROM instruments WHERE name = ?", (instrument_name,))
-        result = self.cursor.fetchone()
+        with self.pool.writer() as cursor:
+            # Register any new instruments with one statement (known ones are skipped in memory)
+            self.instrument_registry.ensure_instruments((name, 1.0) for name in set(values['instrument']))
+            
+            upgraded = self.upgrade_legacy_trades(values)
+            rows = zip(*columns)
+            if upgraded:
+                rows = (row for index, row in enumerate(rows) if index not in upgraded)
+            
+            # Load all trades with a single prepared statement
+            cursor.executemany(f'''
+            INSERT INTO trades ({", ".join(column for column, _ in TRADE_COLUMNS)})
+            VALUES ({", ".join("?" for _ in TRADE_COLUMNS)})
+            ON CONFLICT (fingerprint) DO NOTHING
+            ''', rows)
+            
+            # Summed over all rows, so skipped duplicates are not counted
+            return cursor.rowcount, sorted(set(upgraded.values()))
+    
+    def upgrade_legacy_trades(self, values):
+        """Fill in the account and exit of legacy trades that incoming rows match
         
-        if not result:
-            self.cursor.execute(
-                "INSERT INTO instruments (name, multiplier) VALUES (?, ?)",
-                (instrument_name, default_multiplier)
+        Legacy trades were stored before accounts and exits were imported, so
+        their fingerprints leave both empty and never equal a re-import's. A
+        legacy trade matches a row with the same instrument, entry time, action,
+        quantity and price; its notes, strategy and images are kept. Returns
+        {row index: instrument} for the rows that completed a legacy trade.
+        """
+        last_legacy_id = self.get_setting(LEGACY_TRADES_SETTING)
+        if last_legacy_id is None:
+            return {}
+        
+        with self.pool.writer() as cursor:
+            cursor.execute('''
+            SELECT instrument, entry_ts FROM trades
+            WHERE id <= ? AND account IS NULL AND exit_date IS NULL
+            ''', (int(last_legacy_id),))
+            legacy_entries = set(cursor.fetchall())
+            if not legacy_entries:
+                return {}
+            
+            upgraded = {}
+            for index, entry in enumerate(zip(values['instrument'], values['entry_ts'])):
+                if entry not in legacy_entries:
+                    continue
+                
+                # OR IGNORE leaves the legacy trade alone if the full row is stored as well
+                cursor.execute(f'''
+                UPDATE OR IGNORE trades SET {", ".join(f"{column} = ?" for column in LEGACY_UPGRADE_COLUMNS)}
+                WHERE id = (
+                    SELECT id FROM trades
+                    WHERE instrument = ? AND entry_ts = ? AND date = ? AND time = ?
+                        AND action = ? AND quantity = ? AND price = ?
+                        AND id <= ? AND account IS NULL AND exit_date IS NULL
+                    ORDER BY id
+                    LIMIT 1
+                )
+                ''', [values[column][index] for column in LEGACY_UPGRADE_COLUMNS] + [
+                    values[column][index] for column in ('instrument', 'entry_ts', 'date', 'time', 'action', 'quantity', 'price')
+                ] + [int(last_legacy_id)])
+                
+                if cursor.rowcount:
+                    upgraded[index] = values['instrument'][index]
+            
+            return upgraded
+    
+    def get_executions(self, instrument, min_id=None, max_id=None):
+        """Get an instrument's executions in time order for round trip matching
+        
+        Executions that carry their own exit are left out; see get_closed_executions.
+        """
+        with self.pool.reader() as cursor:
+            query = """
+            SELECT id, date, time, entry_ts, action, quantity, price, commission
+            FROM trades
+            WHERE instrument = ? AND exit_date IS NULL
+            """
+            parameters = [instrument]
+            
+            if min_id is not None:
+                query += " AND id >= ?"
+                parameters.append(min_id)
+            
+            if max_id is not None:
+                query += " AND id <= ?"
+                parameters.append(max_id)
+            
+            query += " ORDER BY entry_ts, id"
+            
+            cursor.execute(query, parameters)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_closed_executions(self, instrument, min_id=None):
+        """Get an instrument's executions that carry their own exit price and time"""
+        with self.pool.reader() as cursor:
+            query = """
+            SELECT id, date, time, entry_ts, action, quantity, price, commission,
+                exit_price, exit_date, exit_time, exit_ts, profit
+            FROM trades
+            WHERE instrument = ? AND exit_date IS NOT NULL
+            """
+            parameters = [instrument]
+            
+            if min_id is not None:
+                query += " AND id >= ?"
+                parameters.append(min_id)
+            
+            query += " ORDER BY entry_ts, id"
+            
+            cursor.execute(query, parameters)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_open_lots(self, instrument, before_id):
+        """Get executions before before_id that still have unmatched quantity"""
+        with self.pool.reader() as cursor:
+            cursor.execute('''
+            SELECT * FROM (
+                SELECT t.id, t.date, t.time, t.entry_ts, t.action, t.quantity, t.price, t.commission,
+                    t.quantity
+                    - COALESCE((SELECT SUM(quantity) FROM round_trips WHERE entry_trade_id = t.id), 0)
+                    - COALESCE((SELECT SUM(quantity) FROM round_trips WHERE exit_trade_id = t.id), 0)
+                    AS open_quantity
+                FROM trades t
+                WHERE t.instrument = ? AND t.id < ? AND t.exit_date IS NULL
             )
-            self.conn.commit()
+            WHERE open_quantity > 0
+            ORDER BY entry_ts, id
+            ''', (instrument, before_id))
+            
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
-    def get_trades(self, filters=None):
-        """Get trades with optional filters"""
-        query = """
-        SELECT t.*, i.multiplier 
-        FROM trades t
-        JOIN instruments i ON t.instrument = i.name
+    def can_append_round_trips(self, instrument, first_new_id):
+        """True when no earlier-imported execution sorts after the new ones"""
+        with self.pool.reader() as cursor:
+            cursor.execute('''
+            SELECT entry_ts FROM trades
+            WHERE instrument = ? AND id >= ? AND exit_date IS NULL
+            ORDER BY entry_ts, id
+            LIMIT 1
+            ''', (instrument, first_new_id))
+            earliest_new = cursor.fetchone()
+            
+            if not earliest_new:
+                return True
+            
+            # Executions without a timestamp sort first, so their position is unknown
+            if earliest_new[0] is None:
+                return False
+            
+            cursor.execute('''
+            SELECT 1 FROM trades
+            WHERE instrument = ? AND id < ? AND exit_date IS NULL AND entry_ts > ?
+            LIMIT 1
+            ''', (instrument, first_new_id, earliest_new[0]))
+            return cursor.fetchone() is None
+    
+    def update_round_trips(self, instruments, first_new_id=None, cancelled=None, upgraded_instruments=()):
+        """Match executions into round trips in one write transaction
+        
+        With first_new_id, executions from that id on are appended to the
+        positions left open by earlier imports. Instruments whose new
+        executions predate already matched ones, or all executions when
+        first_new_id is None, are re-matched from scratch, as are
+        upgraded_instruments (whose legacy trades gained exits). Setting the
+        cancelled event raises ImportCancelled, rolling the transaction back.
         """
+        with self.pool.writer() as cursor:
+            for instrument in sorted(set(instruments) | set(upgraded_instruments)):
+                multiplier = self.instrument_registry.get_multiplier(instrument)
+                
+                matcher = TradeMatcher(self.get_matching_method())
+                
+                appending = (
+                    first_new_id is not None and instrument not in upgraded_instruments
+                    and self.can_append_round_trips(instrument, first_new_id)
+                )
+                if appending:
+                    # Carry on from the lots earlier imports left open
+                    for lot in self.get_open_lots(instrument, first_new_id):
+                        matcher.open_lot(lot, lot['open_quantity'])
+                    executions = self.get_executions(instrument, min_id=first_new_id)
+                else:
+                    cursor.execute("DELETE FROM round_trips WHERE instrument = ?", (instrument,))
+                    executions = self.get_executions(instrument)
+                
+                round_trips = []
+                for index, execution in enumerate(executions):
+                    if cancelled is not None and index % CANCEL_CHECK_INTERVAL == 0 and cancelled.is_set():
+                        raise ImportCancelled()
+                    round_trips.extend(matcher.add_execution(execution))
+                
+                # Executions with their own exit are complete round trips already
+                closed_executions = self.get_closed_executions(instrument, first_new_id if appending else None)
+                round_trips.extend(closed_round_trip(execution) for execution in closed_executions)
+                
+                for round_trip in round_trips:
+                    round_trip['instrument'] = instrument
+                    round_trip['pnl'] = round_trip_pnl(round_trip, multiplier)
+                
+                cursor.executemany(f'''
+                INSERT INTO round_trips ({", ".join(ROUND_TRIP_COLUMNS)})
+                VALUES ({", ".join("?" for _ in ROUND_TRIP_COLUMNS)})
+                ''', ([round_trip[column] for column in ROUND_TRIP_COLUMNS] for round_trip in round_trips))
+                
+                # Roll up only the entry dates that gained round trips when appending
+                if not appending:
+                    self.refresh_daily_summary(instrument)
+                elif round_trips:
+                    entry_dates = [round_trip['entry_date'] for round_trip in round_trips]
+                    self.refresh_daily_summary(instrument, min(entry_dates), max(entry_dates))
+    
+    def refresh_daily_summary(self, instrument=None, start_date=None, end_date=None):
+        """Rebuild the daily summary rows for an instrument and entry date range
+        
+        Leaving instrument, start_date or end_date as None covers every value.
+        """
+        filters = {'instrument': instrument, 'start_date': start_date, 'end_date': end_date}
+        summary_where, summary_parameters = self.build_summary_conditions(filters)
+        
+        # Same range against the entry execution of each round trip
+        where, parameters = self.build_trades_conditions(filters)
         
+        with self.pool.writer() as cursor:
+            cursor.execute("DELETE FROM daily_summary" + summary_where, summary_parameters)
+            
+            cursor.execute(f'''
+            INSERT INTO daily_summary (
+                date, instrument, entry_strategy, weekday, trade_count,
+                wins, losses, gross_pnl, commission, net_pnl
+            )
+            SELECT
+                t.date,
+                t.instrument,
+                COALESCE(t.entry_strategy, ''),
+                t.entry_weekday,
+                COUNT(*),
+                SUM(rt.pnl > 0),
+                SUM(rt.pnl < 0),
+                SUM(rt.pnl + COALESCE(rt.commission, 0)),
+                SUM(COALESCE(rt.commission, 0)),
+                SUM(rt.pnl)
+            FROM round_trips rt
+            JOIN trades t ON t.id = rt.entry_trade_id
+            {where}
+            GROUP BY t.date, t.instrument, COALESCE(t.entry_strategy, '')
+            ''', parameters)
+    
+    def rebuild_round_trips(self, matching_method=None):
+        """Re-match every instrument's executions, e.g. after changing the matching method
+        
+        A new matching method is stored in the settings in the same transaction,
+        so later imports and runs keep using it.
+        """
+        if matching_method and matching_method not in MATCHING_METHODS:
+            raise ValueError(f"Unknown matching method: {matching_method}")
+            
+        try:
+            with self.pool.writer() as cursor:
+                if matching_method:
+                    self.save_setting(MATCHING_METHOD_SETTING, matching_method)
+                    self.matching_method = matching_method
+                
+                cursor.execute("SELECT DISTINCT instrument FROM trades")
+                instruments = [row[0] for row in cursor.fetchall()]
+                
+                self.update_round_trips(instruments)
+        except Exception:
+            # Reload whichever setting is stored
+            self.matching_method = None
+            raise
+        
+        # Inside a caller's transaction, the caller notifies once it has committed
+        if not self.pool.owns_writer():
+            self.notify_change()
+    
+    def ensure_instrument_exists(self, instrument_name, default_multiplier=1.0):
+        """Make sure the instrument exists in the database"""
+        self.ensure_instruments([(instrument_name, default_multiplier)])
+    
+    def ensure_instruments(self, instruments):
+        """Make sure each (name, default multiplier) instrument exists, in one write"""
+        self.instrument_registry.ensure_instruments(instruments)
+    
+    def build_trades_conditions(self, filters=None, key_condition=None):
+        """Build the WHERE clause and its parameters for the given trade filters
+        
+        key_condition is an extra (condition, parameters) pair from trade_key_conditions.
+        """
         parameters = []
+        conditions = []
+        
+        if key_condition:
+            conditions.append(key_condition[0])
+            parameters.extend(key_condition[1])
         
         if filters:
-            conditions = []
+            # Local dates become UTC ranges, so date filtering compares integers
+            timezone = self.get_timezone()
             
             if 'start_date' in filters and filters['start_date']:
-                conditions.append("t.date >= ?")
-                parameters.append(filters['start_date'])
+                conditions.append("t.entry_ts >= ?")
+                parameters.append(day_start_timestamp(filters['start_date'], timezone))
                 
             if 'end_date' in filters and filters['end_date']:
-                conditions.append("t.date <= ?")
-                parameters.append(filters['end_date'])
+                conditions.append("t.entry_ts < ?")
+                parameters.append(day_start_timestamp(filters['end_date'], timezone, days=1))
                 
             if 'instrument' in filters and filters['instrument']:
                 conditions.append("t.instrument = ?")
                 parameters.append(filters['instrument'])
                 
+            if 'account' in filters and filters['account']:
+                conditions.append("t.account = ?")
+                parameters.append(filters['account'])
+                
             if 'action' in filters and filters['action']:
                 conditions.append("t.action = ?")
                 parameters.append(filters['action'])
@@ -186,234 +971,389 @@ class DatabaseManager:
                 conditions.append("t.bars <= ?")
                 parameters.append(filters['max_bars'])
                 
-            if 'start_time' in filters and filters['start_time']:
-                conditions.append("t.time >= ?")
-                parameters.append(filters['start_time'])
+            # A time window covering the whole day filters nothing
+            if 'start_time' in filters and filters['start_time'] and filters['start_time'] > FULL_DAY[0]:
+                conditions.append("t.entry_tod >= ?")
+                parameters.append(time_of_day_seconds(filters['start_time']))
+                
+            if 'end_time' in filters and filters['end_time'] and filters['end_time'] < FULL_DAY[1]:
+                conditions.append("t.entry_tod <= ?")
+                parameters.append(time_of_day_seconds(filters['end_time']))
+            
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, parameters
+    
+    def build_summary_conditions(self, filters=None):
+        """Build the WHERE clause and its parameters for the daily summary filters"""
+        parameters = []
+        conditions = []
+        
+        if filters:
+            # The summary is keyed on the local date text
+            if filters.get('start_date'):
+                conditions.append("date >= ?")
+                parameters.append(filters['start_date'])
+                
+            if filters.get('end_date'):
+                conditions.append("date <= ?")
+                parameters.append(filters['end_date'])
                 
-            if 'end_time' in filters and filters['end_time']:
-                conditions.append("t.time <= ?")
-                parameters.append(filters['end_time'])
+            if filters.get('instrument'):
+                conditions.append("instrument = ?")
+                parameters.append(filters['instrument'])
+                
+            if filters.get('entry_strategy'):
+                conditions.append("entry_strategy = ?")
+                parameters.append(filters['entry_strategy'])
             
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, parameters
+    
+    def trade_key_conditions(self, after):
+        """(condition, parameters) pairs selecting the trades after an (entry_ts, id) key in display order
+        
+        Trades without an entry_ts come last, and a row value comparison never
+        matches them, so they are a second condition read once the first runs out.
+        """
+        if after is None:
+            return [None]
+        
+        entry_ts, trade_id = after
+        if entry_ts is None:
+            return [("t.entry_ts IS NULL AND t.id < ?", [trade_id])]
+        return [("(t.entry_ts, t.id) < (?, ?)", [entry_ts, trade_id]), ("t.entry_ts IS NULL", [])]
+    
+    def build_trades_query(self, filters=None, limit=None, offset=0, key_condition=None):
+        """Build the trades query and its parameters for the given filters"""
+        where, parameters = self.build_trades_conditions(filters, key_condition)
+        
+        query = """
+        SELECT t.*, i.multiplier,
+            (SELECT COUNT(*) FROM trade_images ti WHERE ti.trade_id = t.id) AS image_count
+        FROM trades t
+        JOIN instruments i ON t.instrument = i.name
+        """ + where
         
-        query += " ORDER BY t.date DESC, t.time DESC"
+        # Matches the trailing (entry_ts, id) of every trades index, so no sort step is needed
+        query += " ORDER BY t.entry_ts DESC, t.id DESC"
+        
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            parameters = parameters + [limit, offset]
+        elif offset:
+            # SQLite only takes OFFSET after a LIMIT; -1 means no limit
+            query += " LIMIT -1 OFFSET ?"
+            parameters = parameters + [offset]
+        
+        return query, parameters
+    
+    def get_trades(self, filters=None, limit=None, offset=0, after=None):
+        """Get trades with optional filters, optionally one page at a time
+        
+        Pages start offset trades in or, cheaper for deep pages, straight after
+        the (entry_ts, id) key of the previous page's last trade (offset is
+        ignored then).
+        """
+        trades = []
         
         try:
-            if parameters:
-                self.cursor.execute(query, parameters)
-            else:
-                self.cursor.execute(query)
-                
-            columns = [col[0] for col in self.cursor.description]
-            trades = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-            return trades
+            with self.pool.reader() as cursor:
+                for key_condition in self.trade_key_conditions(after):
+                    remaining = None if limit is None else limit - len(trades)
+                    if remaining == 0:
+                        break
+                    
+                    query, parameters = self.build_trades_query(filters, remaining, 0 if after else offset, key_condition)
+                    cursor.execute(query, parameters)
+                    
+                    columns = [col[0] for col in cursor.description]
+                    trades.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+                return trades
         except Exception as e:
             print(f"Error getting trades: {str(e)}")
             return []
     
-    def get_daily_debrief(self, date):
-        """Get daily debrief for a specific date"""
-        self.cursor.execute(
-            "SELECT * FROM daily_debrief WHERE date = ?",
-            (date,)
-        )
-        result = self.cursor.fetchone()
+    def get_trade_key(self, filters=None, offset=0, after=None):
+        """(entry_ts, id) of the trade offset trades in (or after the key after), or None past the end
+        
+        Only the index is read, so finding a deep page's key costs far less than
+        fetching the trades before it. With after, trades without an entry_ts
+        are not counted unless after is one of them.
+        """
+        where, parameters = self.build_trades_conditions(filters, self.trade_key_conditions(after)[0])
         
-        if result:
-            columns = [col[0] for col in self.cursor.description]
-            return dict(zip(columns, result))
-        else:
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(
+                    f"SELECT t.entry_ts, t.id FROM trades t {where} ORDER BY t.entry_ts DESC, t.id DESC LIMIT 1 OFFSET ?",
+                    parameters + [offset]
+                )
+                row = cursor.fetchone()
+                return tuple(row) if row else None
+        except Exception as e:
+            print(f"Error getting trade key: {str(e)}")
             return None
     
-    def save_daily_debrief(self, date, intraday_summary, feelings, recurring_patterns, best_play_out, leverage_info):
-        """Save or update daily debrief"""
-        self.cursor.execute(
-            "SELECT id FROM daily_debrief WHERE date = ?",
-            (date,)
+    def get_round_trip_columns(self, filters=None):
+        """Get closed round trips as statistics column arrays, oldest entry first
+        
+        Filters apply to the entry execution, and the round trip is reported
+        on its entry date with that execution's MAE, MFE and bars.
+        """
+        from src.analytics.statistics import STATISTICS_FIELDS, columns_from_rows
+        
+        where, parameters = self.build_trades_conditions(filters)
+        fields = ", ".join(
+            f"rt.{field}" if field in ROUND_TRIP_STATISTICS_FIELDS else f"t.{TRADE_STATISTICS_COLUMNS.get(field, field)}"
+            for field in STATISTICS_FIELDS
         )
-        result = self.cursor.fetchone()
         
         try:
+            with self.pool.reader() as cursor:
+                cursor.execute(f"""
+                SELECT {fields}
+                FROM round_trips rt
+                JOIN trades t ON t.id = rt.entry_trade_id
+                {where}
+                ORDER BY t.entry_ts, rt.id
+                """, parameters)
+                return columns_from_rows(cursor.fetchall())
+        except Exception as e:
+            print(f"Error getting round trips: {str(e)}")
+            return columns_from_rows([])
+    
+    def daily_summary_supports(self, filters=None):
+        """True when the daily summary holds exactly the round trips these filters select"""
+        for key, value in (filters or {}).items():
+            if key in DAILY_SUMMARY_FILTERS or value is None or value == '':
+                continue
+            
+            # A time window covering the whole day filters nothing
+            if key == 'start_time' and value <= FULL_DAY[0]:
+                continue
+            if key == 'end_time' and value >= FULL_DAY[1]:
+                continue
+            
+            return False
+        
+        return True
+    
+    def get_daily_summary(self, filters=None):
+        """Get the daily summary rows for the given filters as column arrays, oldest first
+        
+        Only date, instrument and entry strategy filters are applied; check
+        daily_summary_supports first.
+        """
+        from src.analytics.statistics import SUMMARY_FIELDS, summary_from_rows
+        
+        where, parameters = self.build_summary_conditions(filters)
+        
+        try:
+            with self.pool.reader() as cursor:
+                cursor.execute(f"""
+                SELECT {", ".join(SUMMARY_FIELDS)}
+                FROM daily_summary
+                {where}
+                ORDER BY date
+                """, parameters)
+                return summary_from_rows(cursor.fetchall())
+        except Exception as e:
+            print(f"Error getting daily summary: {str(e)}")
+            return summary_from_rows([])
+    
+    def count_trades(self, filters=None):
+        """Count the trades matching the given filters"""
+        where, parameters = self.build_trades_conditions(filters)
+        
+        try:
+            # Every imported instrument is registered, so the instruments join is
+            # skipped here and the count can be answered from an index alone
+            with self.pool.reader() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM trades t {where}", parameters)
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error counting trades: {str(e)}")
+            return 0
+    
+    def explain_trades_query(self, filters=None, after=None):
+        """Return the SQLite query plan steps used by get_trades for these filters (its first query after a key)"""
+        query, parameters = self.build_trades_query(filters, key_condition=self.trade_key_conditions(after)[0])
+        
+        with self.pool.reader() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + query, parameters)
+            
+            # Each row is (id, parent, notused, detail), e.g. "SEARCH t USING INDEX ..."
+            return [row[3] for row in cursor.fetchall()]
+    
+    def get_daily_debrief(self, date):
+        """Get daily debrief for a specific date"""
+        with self.pool.reader() as cursor:
+            cursor.execute(
+                "SELECT * FROM daily_debrief WHERE date = ?",
+                (date,)
+            )
+            result = cursor.fetchone()
+            
             if result:
-                # Update existing record
-                self.cursor.execute('''
-                UPDATE daily_debrief SET
-                    intraday_summary = ?,
-                    feelings = ?,
-                    recurring_patterns = ?,
-                    best_play_out = ?,
-                    leverage_info = ?
-                WHERE date = ?
-                ''', (
-                    intraday_summary,
-                    feelings,
-                    recurring_patterns,
-                    best_play_out,
-                    leverage_info,
-                    date
-                ))
+                columns = [col[0] for col in cursor.description]
+                return dict(zip(columns, result))
             else:
-                # Insert new record
-                self.cursor.execute('''
-                INSERT INTO daily_debrief (
-                    date,
-                    intraday_summary,
-                    feelings,
-                    recurring_patterns,
-                    best_play_out,
-                    leverage_info
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    date,
-                    intraday_summary,
-                    feelings,
-                    recurring_patterns,
-                    best_play_out,
-                    leverage_info
-                ))
-            
-            self.conn.commit()
+                return None
+    
+    def save_daily_debrief(self, date, intraday_summary, feelings, recurring_patterns, best_play_out, leverage_info):
+        """Save or update daily debrief"""
+        try:
+            with self.pool.writer() as cursor:
+                cursor.execute(
+                    "SELECT id FROM daily_debrief WHERE date = ?",
+                    (date,)
+                )
+                result = cursor.fetchone()
+                
+                if result:
+                    # Update existing record
+                    cursor.execute('''
+                    UPDATE daily_debrief SET
+                        intraday_summary = ?,
+                        feelings = ?,
+                        recurring_patterns = ?,
+                        best_play_out = ?,
+                        leverage_info = ?
+                    WHERE date = ?
+                    ''', (
+                        intraday_summary,
+                        feelings,
+                        recurring_patterns,
+                        best_play_out,
+                        leverage_info,
+                        date
+                    ))
+                else:
+                    # Insert new record
+                    cursor.execute('''
+                    INSERT INTO daily_debrief (
+                        date,
+                        intraday_summary,
+                        feelings,
+                        recurring_patterns,
+                        best_play_out,
+                        leverage_info
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (
+                        date,
+                        intraday_summary,
+                        feelings,
+                        recurring_patterns,
+                        best_play_out,
+                        leverage_info
+                    ))
+            
             return True, "Daily debrief saved successfully"
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error saving daily debrief: {str(e)}"
             
     def save_trade_images(self, trade_id, image_paths):
         """Save image paths associated with a trade"""
         try:
-            for path in image_paths:
-                self.cursor.execute(
-                    "INSERT INTO trade_images (trade_id, image_path) VALUES (?, ?)",
-                    (trade_id, path)
-                )
+            with self.pool.writer() as cursor:
+                for path in image_paths:
+                    cursor.execute(
+                        "INSERT INTO trade_images (trade_id, image_path) VALUES (?, ?)",
+                        (trade_id, path)
+                    )
             
-            self.conn.commit()
             return True, "Images saved successfully"
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error saving images: {str(e)}"
             
     def get_trade_images(self, trade_id):
         """Get images associated with a trade"""
-        self.cursor.execute(
-            "SELECT image_path FROM trade_images WHERE trade_id = ?",
-            (trade_id,)
-        )
-        return [row[0] for row in self.cursor.fetchall()]
+        with self.pool.reader() as cursor:
+            cursor.execute(
+                "SELECT image_path FROM trade_images WHERE trade_id = ?",
+                (trade_id,)
+            )
+            return [row[0] for row in cursor.fetchall()]
         
     def get_instruments(self):
         """Get list of all instruments"""
-        self.cursor.execute("SELECT name, multiplier FROM instruments ORDER BY name")
-        return self.cursor.fetchall()
+        return self.instrument_registry.get_instruments()
+        
+    def get_accounts(self):
+        """Get list of all accounts that have trades"""
+        with self.pool.reader() as cursor:
+            cursor.execute("SELECT DISTINCT account FROM trades WHERE account IS NOT NULL AND account != '' ORDER BY account")
+            return [row[0] for row in cursor.fetchall()]
         
     def update_instrument_multiplier(self, instrument_name, multiplier):
         """Update multiplier for an instrument"""
         try:
-            self.cursor.execute(
-                "UPDATE instruments SET multiplier = ? WHERE name = ?",
-                (multiplier, instrument_name)
-            )
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute(
+                    "UPDATE instruments SET multiplier = ? WHERE name = ?",
+                    (multiplier, instrument_name)
+                )
+                # Re-price the instrument's round trips with the new multiplier
+                cursor.execute(
+                    "UPDATE round_trips SET pnl = COALESCE(profit, points * ?) - commission WHERE instrument = ?",
+                    (multiplier, instrument_name)
+                )
+                self.refresh_daily_summary(instrument_name)
+            
+            self.instrument_registry.set_multiplier(instrument_name, multiplier)
+            self.notify_change(instruments=[instrument_name])
             return True, "Multiplier updated successfully"
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error updating multiplier: {str(e)}"
             
     def calculate_statistics(self, filters=None):
-        """Calculate trading statistics based on filtered trades"""
-        trades = self.get_trades(filters)
-        
-        if not trades:
-            return {
-                "total_trades": 0,
-                "win_rate": 0,
-                "average_winner": 0,
-                "average_loser": 0,
-                "profit_factor": 0,
-                "net_profit": 0,
-                "largest_winner": 0,
-                "largest_loser": 0,
-                "average_mae": 0,
-                "average_mfe": 0
-            }
-        
-        # Initialize statistics
-        stats = {
-            "total_trades": len(trades),
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "break_even_trades": 0,
-            "total_profit": 0,
-            "total_loss": 0,
-            "largest_winner": 0,
-            "largest_loser": 0,
-            "total_mae": 0,
-            "total_mfe": 0
-        }
+        """Calculate trading statistics from the round trips of the filtered trades"""
+        from src.analytics.statistics import calculate_statistics
         
-        # Calculate statistics
-        for trade in trades:
-            # Calculate P&L (simplified calculation, adjust based on your actual data format)
-            quantity = trade.get('quantity', 0)
-            price = trade.get('price', 0)
-            commission = trade.get('commission', 0)
-            multiplier = trade.get('multiplier', 1)
-            action = trade.get('action', '').lower()
-            
-            # This is a simplification - you'd need to match buys with sells
-            # For demonstration, we're just using a random P&L
-            # In a real app, you'd need to track opening and closing positions
-            
-            # Assume P&L is stored or calculated somehow
-            # This is just placeholder logic
-            pnl = (quantity * price * multiplier) * (1 if 'buy' in action else -1) - commission
-            
-            if pnl > 0:
-                stats["winning_trades"] += 1
-                stats["total_profit"] += pnl
-                stats["largest_winner"] = max(stats["largest_winner"], pnl)
-            elif pnl < 0:
-                stats["losing_trades"] += 1
-                stats["total_loss"] += abs(pnl)
-                stats["largest_loser"] = max(stats["largest_loser"], abs(pnl))
-            else:
-                stats["break_even_trades"] += 1
-            
-            stats["total_mae"] += trade.get('mae', 0)
-            stats["total_mfe"] += trade.get('mfe', 0)
+        stats = calculate_statistics(self.get_round_trip_columns(filters))
         
-        # Calculate derived statistics
-        win_rate = (stats["winning_trades"] / stats["total_trades"]) * 100 if stats["total_trades"] > 0 else 0
-        average_winner = stats["total_profit"] / stats["winning_trades"] if stats["winning_trades"] > 0 else 0
-        average_loser = stats["total_loss"] / stats["losing_trades"] if stats["losing_trades"] > 0 else 0
-        profit_factor = stats["total_profit"] / stats["total_loss"] if stats["total_loss"] > 0 else float('inf')
-        net_profit = stats["total_profit"] - stats["total_loss"]
-        average_mae = stats["total_mae"] / stats["total_trades"] if stats["total_trades"] > 0 else 0
-        average_mfe = stats["total_mfe"] / stats["total_trades"] if stats["total_trades"] > 0 else 0
+        profit_factor = stats.total_profit / stats.total_loss if stats.total_loss else float('inf')
         
         return {
-            "total_trades": stats["total_trades"],
-            "win_rate": round(win_rate, 2),
-            "average_winner": round(average_winner, 2),
-            "average_loser": round(average_loser, 2),
-            "profit_factor": round(profit_factor, 2),
-            "net_profit": round(net_profit, 2),
-            "largest_winner": round(stats["largest_winner"], 2),
-            "largest_loser": round(stats["largest_loser"], 2),
-            "average_mae": round(average_mae, 2),
-            "average_mfe": round(average_mfe, 2)
+            "total_trades": stats.total_trades,
+            "win_rate": round(stats.win_rate, 2),
+            "average_winner": round(stats.avg_winner, 2),
+            "average_loser": round(stats.avg_loser, 2),
+            "profit_factor": round(profit_factor, 2) if stats.total_trades else 0,
+            "net_profit": round(stats.net_profit, 2),
+            "largest_winner": round(stats.largest_winner, 2),
+            "largest_loser": round(stats.largest_loser, 2),
+            "average_mae": round(stats.avg_mae, 2),
+            "average_mfe": round(stats.avg_mfe, 2)
         }
 
     def update_trade_entry_strategy(self, trade_id, entry_strategy):
         """Update the entry strategy for a trade"""
         try:
-            self.cursor.execute(
-                "UPDATE trades SET entry_strategy = ? WHERE id = ?",
-                (entry_strategy, trade_id)
-            )
-            self.conn.commit()
+            with self.pool.writer() as cursor:
+                cursor.execute(
+                    "SELECT instrument, date, entry_strategy FROM trades WHERE id = ?",
+                    (trade_id,)
+                )
+                previous = cursor.fetchone()
+                
+                cursor.execute(
+                    "UPDATE trades SET entry_strategy = ? WHERE id = ?",
+                    (entry_strategy, trade_id)
+                )
+                
+                # Move the trade's round trips to its new strategy's summary row
+                if previous:
+                    self.refresh_daily_summary(previous[0], previous[1], previous[1])
+            
+            if previous:
+                instrument, date, old_strategy = previous
+                self.notify_change(
+                    instruments=[instrument],
+                    start_date=date,
+                    end_date=date,
+                    entry_strategies=[old_strategy, entry_strategy]
+                )
             return True, "Entry strategy updated successfully"
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error updating entry strategy: {str(e)}" 
\ No newline at end of file
@@ -0,0 +1,77 @@
+import threading
+
+class InstrumentRegistry:
+    """Instrument names and multipliers, kept in memory after the first read
+
+    The instruments table is read once, on first use. New instruments are
+    added with one set-based statement for all of them, and names already
+    known are not sent to the database at all. A rolled back transaction
+    drops the map so it is re-read on next use.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        # name -> multiplier, or None until loaded
+        self.multipliers = None
+        self.lock = threading.Lock()
+        pool.add_rollback_listener(self.invalidate)
+
+    def load(self):
+        """Read every instrument into the map"""
+        with self.pool.reader() as cursor:
+            cursor.execute("SELECT name, multiplier FROM instruments")
+            multipliers = dict(cursor.fetchall())
+
+        with self.lock:
+            self.multipliers = multipliers
+        return multipliers
+
+    def get_multipliers(self):
+        """The name -> multiplier map, loading it if needed"""
+        with self.lock:
+            multipliers = self.multipliers
+        return multipliers if multipliers is not None else self.load()
+
+    def get_multiplier(self, name, default=1.0):
+        """Multiplier of an instrument, or default when it is unknown"""
+        return self.get_multipliers().get(name, default)
+
+    def get_instruments(self):
+        """(name, multiplier) pairs sorted by name"""
+        return sorted(self.get_multipliers().items())
+
+    def ensure_instruments(self, instruments):
+        """Add the (name, default multiplier) pairs that are not registered yet
+
+        Existing instruments keep their multiplier. Called inside a
+        pool.writer() block the rows join that transaction.
+        """
+        known = self.get_multipliers()
+        new = {}
+        for name, multiplier in instruments:
+            if name and name not in known and name not in new:
+                new[name] = multiplier
+
+        if not new:
+            return
+
+        with self.pool.writer() as cursor:
+            cursor.executemany(
+                "INSERT INTO instruments (name, multiplier) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+                new.items()
+            )
+
+        with self.lock:
+            if self.multipliers is not None:
+                self.multipliers.update(new)
+
+    def set_multiplier(self, name, multiplier):
+        """Record a multiplier that was saved to the database"""
+        with self.lock:
+            if self.multipliers is not None:
+                self.multipliers[name] = multiplier
+
+    def invalidate(self):
+        """Forget the map; it is re-read on next use"""
+        with self.lock:
+            self.multipliers = None
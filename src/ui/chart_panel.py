@@ -0,0 +1,90 @@
+from PyQt6.QtWidgets import QGroupBox, QVBoxLayout
+from PyQt6.QtCore import QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from src.utils.charts import ChartRenderer
+
+# Milliseconds without a further resize before a chart is decimated again for its new width
+RESIZE_DELAY_MS = 150
+
+class ChartCanvas(FigureCanvas):
+    """Figure canvas that only rasterises while it is visible"""
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        # Nothing has been drawn yet
+        self.needs_draw = True
+
+    def draw_idle(self):
+        """Schedule a redraw, or leave it until the canvas is next shown"""
+        # Hidden canvases (e.g. on another tab) still get data and resize updates
+        if not self.isVisible():
+            self.needs_draw = True
+            return
+        self.needs_draw = False
+        super().draw_idle()
+
+    def showEvent(self, event):
+        """Draw whatever changed while the canvas was hidden"""
+        super().showEvent(event)
+        if self.needs_draw:
+            self.draw_idle()
+
+
+class ChartPanel(QGroupBox):
+    """A titled Statistics chart whose artists are updated in place"""
+
+    def __init__(self, definition, parent=None):
+        super().__init__(definition['title'], parent)
+        self.definition = definition
+        # Latest trade columns; applied to the artists when the panel is visible
+        self.trades = None
+        self.trades_changed = False
+
+        layout = QVBoxLayout(self)
+        self.figure = Figure(figsize=(4, 3), dpi=100)
+        self.canvas = ChartCanvas(self.figure)
+        layout.addWidget(self.canvas)
+
+        self.renderer = ChartRenderer(self.figure, definition)
+
+        # A burst of resizes (e.g. dragging the window edge) re-decimates once at the end
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DELAY_MS)
+        self.resize_timer.timeout.connect(self.resize_finished)
+
+    def set_trades(self, trades):
+        """Show new trade columns, now if visible or else when the panel is next shown"""
+        self.trades = trades
+        self.trades_changed = True
+        if self.isVisible():
+            self.redraw_chart()
+
+    def redraw_chart(self):
+        """Update the artists from the trade columns and schedule a redraw"""
+        self.trades_changed = False
+        self.renderer.update(self.trades)
+        # Coalesced with any other pending redraw and done on the next idle cycle
+        self.canvas.draw_idle()
+
+    def showEvent(self, event):
+        """Apply trades that arrived while the panel was hidden"""
+        super().showEvent(event)
+        if self.trades_changed:
+            self.redraw_chart()
+
+    def resizeEvent(self, event):
+        """Restart the resize timer; the canvas itself redraws the current points"""
+        super().resizeEvent(event)
+        if self.trades is not None:
+            self.resize_timer.start()
+
+    def resize_finished(self):
+        """Decimate again for the new chart width"""
+        if self.renderer.is_decimated_for_size():
+            return
+        self.trades_changed = True
+        if self.isVisible():
+            self.redraw_chart()
@@ -0,0 +1,48 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+class ImportWorkerSignals(QObject):
+    """Signals emitted by an ImportWorker (delivered on the GUI thread)"""
+    progress = pyqtSignal(int, int, int)  # rows parsed, rows inserted, total rows
+    finished = pyqtSignal(bool, str)  # success, message
+
+class ImportWorker(QRunnable):
+    """Imports a CSV file off the GUI thread in one cancellable transaction"""
+
+    def __init__(self, db_manager, csv_path):
+        super().__init__()
+        self.db_manager = db_manager
+        self.csv_path = csv_path
+        self.total_rows = 0
+        self.signals = ImportWorkerSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the import at the next chunk; everything imported so far is rolled back"""
+        self.cancelled.set()
+
+    def report_progress(self, rows_parsed, rows_inserted):
+        self.signals.progress.emit(rows_parsed, rows_inserted, self.total_rows)
+
+    def run(self):
+        # Imported here so numpy is loaded by the first import rather than at startup
+        from src.utils.csv_importer import CSVImporter
+
+        try:
+            # Only needed for the progress bar, so a failure here is not fatal
+            try:
+                self.total_rows = CSVImporter(self.csv_path).count_rows()
+            except OSError:
+                self.total_rows = 0
+            self.report_progress(0, 0)
+
+            # The pool's writer connection may be used from this thread
+            success, message = self.db_manager.import_trades_cancellable(
+                self.csv_path,
+                progress_callback=self.report_progress,
+                cancelled=self.cancelled
+            )
+            self.signals.finished.emit(success, message)
+        except Exception as e:
+            self.signals.finished.emit(False, f"Error importing trades: {str(e)}")
@@ -2,21 +2,25 @@ import sys
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout, 
     QWidget, QPushButton, QLabel, QFileDialog,
-    QMessageBox
+    QMessageBox, QProgressDialog, QComboBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 
 from src.ui.daily_debrief_tab import DailyDebriefTab
-from src.ui.trade_data_tab import TradeDataTab
-from src.ui.statistics_tab import StatisticsTab
-from src.utils.helpers import show_message
-from src.utils.csv_importer import CSVImporter
+from src.ui.import_worker import ImportWorker
+from src.ui.timezone_worker import TimezoneWorker
+from src.utils.helpers import show_message, ask_confirmation
+from src.utils.timestamps import COMMON_TIMEZONES
 
 class MainWindow(QMainWindow):
     def __init__(self, db_manager):
         super().__init__()
         
         self.db_manager = db_manager
+        self.import_worker = None
+        self.import_progress = None
+        self.timezone_worker = None
+        self.timezone_progress = None
         self.setWindowTitle("Trading Journal")
         self.setGeometry(100, 100, 1200, 800)
         
@@ -31,38 +35,130 @@ class MainWindow(QMainWindow):
         header_label = QLabel("Trading Journal")
         header_label.setStyleSheet("font-size: 18px; font-weight: bold;")
         
-        import_button = QPushButton("Import CSV")
-        import_button.clicked.connect(self.import_csv)
+        self.import_button = QPushButton("Import CSV")
+        self.import_button.clicked.connect(self.import_csv)
+        
+        # Timezone the broker's exported dates and times are in
+        self.timezone_combo = QComboBox()
+        self.timezone_combo.addItems(COMMON_TIMEZONES)
+        timezone = self.db_manager.get_timezone_name()
+        if self.timezone_combo.findText(timezone) < 0:
+            self.timezone_combo.addItem(timezone)
+        self.timezone_combo.setCurrentText(timezone)
+        # Only a choice made by the user, not setCurrentText, starts a conversion
+        self.timezone_combo.activated.connect(self.timezone_selected)
         
         header_layout.addWidget(header_label)
         header_layout.addStretch()
-        header_layout.addWidget(import_button)
+        header_layout.addWidget(QLabel("Timezone:"))
+        header_layout.addWidget(self.timezone_combo)
+        header_layout.addWidget(self.import_button)
         
         main_layout.addLayout(header_layout)
         
         # Create tab widget
         self.tab_widget = QTabWidget()
         
-        # Create tabs
+        # Create tabs; only the Daily Debrief is built at startup, the others
+        # (and the modules they import) the first time they are shown
         self.daily_debrief_tab = DailyDebriefTab(self.db_manager)
-        self.trade_data_tab = TradeDataTab(self.db_manager)
-        self.statistics_tab = StatisticsTab(self.db_manager, self.trade_data_tab)
+        self.trade_data_tab = None
+        self.statistics_tab = None
+        self.trade_data_page = self.create_lazy_page()
+        self.statistics_page = self.create_lazy_page()
         
         # Add tabs to tab widget
         self.tab_widget.addTab(self.daily_debrief_tab, "Daily Debrief")
-        self.tab_widget.addTab(self.trade_data_tab, "Fields & Data")
-        self.tab_widget.addTab(self.statistics_tab, "Statistics")
+        self.tab_widget.addTab(self.trade_data_page, "Fields & Data")
+        self.tab_widget.addTab(self.statistics_page, "Statistics")
         
         main_layout.addWidget(self.tab_widget)
         
         # Connect signals
         self.tab_widget.currentChanged.connect(self.tab_changed)
         
+    def create_lazy_page(self):
+        """Empty tab page that the real tab is added to when first shown"""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        return page
+    
+    def get_trade_data_tab(self):
+        """The Fields & Data tab, built on first use"""
+        if self.trade_data_tab is None:
+            from src.ui.trade_data_tab import TradeDataTab
+            self.trade_data_tab = TradeDataTab(self.db_manager)
+            self.trade_data_page.layout().addWidget(self.trade_data_tab)
+        return self.trade_data_tab
+    
+    def get_statistics_tab(self):
+        """The Statistics tab, built on first use (with the Fields & Data tab it reads filters from)"""
+        if self.statistics_tab is None:
+            # matplotlib is only loaded here
+            from src.ui.statistics_tab import StatisticsTab
+            self.statistics_tab = StatisticsTab(self.db_manager, self.get_trade_data_tab())
+            self.statistics_page.layout().addWidget(self.statistics_tab)
+        return self.statistics_tab
+    
     def tab_changed(self, index):
         """Handle tab change event"""
+        if index == 1:  # Fields & Data tab
+            self.get_trade_data_tab()
         # If statistics tab is selected, refresh statistics based on current filters
-        if index == 2:  # Statistics tab
-            self.statistics_tab.prepare_filters_from_data_tab()
+        elif index == 2:  # Statistics tab
+            self.get_statistics_tab().prepare_filters_from_data_tab()
+    
+    def timezone_selected(self, index):
+        """Confirm a timezone picked in the selector, then convert the trades to it"""
+        timezone = self.timezone_combo.itemText(index)
+        current_timezone = self.db_manager.get_timezone_name()
+        if timezone == current_timezone:
+            return
+        
+        confirmed = ask_confirmation(
+            self, "Change Timezone",
+            f"Interpret all trade times as {timezone}?\n\n"
+            "Every trade's timestamps and round trips are recalculated, which can take a while."
+        )
+        if not confirmed:
+            self.timezone_combo.setCurrentText(current_timezone)
+            return
+        
+        self.change_timezone(timezone)
+    
+    def change_timezone(self, timezone):
+        """Re-interpret the stored trade times in the selected timezone in the background"""
+        # No import or second conversion while the trades are rewritten
+        self.import_button.setEnabled(False)
+        self.timezone_combo.setEnabled(False)
+        
+        self.timezone_progress = QProgressDialog(f"Converting trade times to {timezone}...", None, 0, 0, self)
+        self.timezone_progress.setWindowTitle("Changing Timezone")
+        self.timezone_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.timezone_progress.setMinimumDuration(0)
+        self.timezone_progress.show()
+        
+        self.timezone_worker = TimezoneWorker(self.db_manager, timezone)
+        self.timezone_worker.signals.finished.connect(self.timezone_changed)
+        QThreadPool.globalInstance().start(self.timezone_worker)
+    
+    def timezone_changed(self, success, message):
+        """Close the progress dialog and show the trades in their new times"""
+        self.timezone_worker = None
+        self.import_button.setEnabled(True)
+        self.timezone_combo.setEnabled(True)
+        if self.timezone_progress:
+            self.timezone_progress.close()
+            self.timezone_progress = None
+        
+        if success:
+            if self.trade_data_tab:
+                self.trade_data_tab.load_trades()
+        else:
+            # Show the setting that is still in effect
+            self.timezone_combo.setCurrentText(self.db_manager.get_timezone_name())
+            show_message(self, "Timezone Error", message, QMessageBox.Icon.Critical)
     
     def import_csv(self):
         """Import trade data from CSV file"""
@@ -77,27 +173,65 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
             
-        # Validate and import CSV
-        importer = CSVImporter(file_path)
-        valid, message = importer.validate_csv()
-        
-        if not valid:
-            show_message(self, "Import Error", message, QMessageBox.Icon.Critical)
+        self.start_import(file_path)
+    
+    def start_import(self, file_path):
+        """Import a CSV file in the background while showing its progress"""
+        # Only one import at a time, and no timezone change while its rows are converted
+        self.import_button.setEnabled(False)
+        self.timezone_combo.setEnabled(False)
+        
+        self.import_progress = QProgressDialog("Reading CSV file...", "Cancel", 0, 0, self)
+        self.import_progress.setWindowTitle("Importing Trades")
+        self.import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_progress.setMinimumDuration(0)
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setAutoReset(False)
+        
+        self.import_worker = ImportWorker(self.db_manager, file_path)
+        self.import_worker.signals.progress.connect(self.import_progressed)
+        self.import_worker.signals.finished.connect(self.import_finished)
+        self.import_progress.canceled.connect(self.cancel_import)
+        self.import_progress.show()
+        
+        QThreadPool.globalInstance().start(self.import_worker)
+    
+    def import_progressed(self, rows_parsed, rows_inserted, total_rows):
+        """Update the progress dialog"""
+        if not self.import_progress or self.import_progress.wasCanceled():
             return
             
-        # Read CSV data
-        success, data = importer.read_csv()
+        if total_rows:
+            self.import_progress.setMaximum(total_rows)
+            self.import_progress.setValue(min(rows_inserted, total_rows))
         
-        if not success:
-            show_message(self, "Import Error", data, QMessageBox.Icon.Critical)
-            return
-            
-        # Import data to database
-        success, message = self.db_manager.import_trades(file_path)
+        if total_rows and rows_inserted >= total_rows:
+            self.import_progress.setLabelText("Matching round trips...")
+        else:
+            self.import_progress.setLabelText(f"Parsed {rows_parsed:,} rows, inserted {rows_inserted:,}")
+    
+    def cancel_import(self):
+        """Ask the running import to stop and roll back"""
+        if self.import_worker:
+            self.import_worker.cancel()
+            self.import_progress.setLabelText("Cancelling import...")
+    
+    def import_finished(self, success, message):
+        """Close the progress dialog and refresh the trades once"""
+        cancelled = self.import_worker is not None and self.import_worker.cancelled.is_set()
+        self.import_worker = None
+        self.import_button.setEnabled(True)
+        self.timezone_combo.setEnabled(True)
+        if self.import_progress:
+            self.import_progress.close()
+            self.import_progress = None
         
         if success:
             show_message(self, "Import Successful", message)
-            # Refresh trade data tab
-            self.trade_data_tab.load_trades()
+            # Refresh trade data tab (a tab not built yet loads the new trades when it is)
+            if self.trade_data_tab:
+                self.trade_data_tab.load_trades()
+        elif cancelled:
+            show_message(self, "Import Cancelled", message)
         else:
             show_message(self, "Import Error", message, QMessageBox.Icon.Critical) 
\ No newline at end of file
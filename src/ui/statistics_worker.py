@@ -0,0 +1,59 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.database.db_manager import DatabaseManager
+from src.analytics.statistics import load_statistics_results
+
+class StatisticsWorkerSignals(QObject):
+    """Signals emitted by a StatisticsWorker (delivered on the GUI thread)"""
+    finished = pyqtSignal(int, object)  # generation, results
+    failed = pyqtSignal(int, str)  # generation, error message
+
+class StatisticsWorker(QRunnable):
+    """Loads round trips and computes statistics off the GUI thread"""
+
+    def __init__(self, db_path, filters, generation):
+        super().__init__()
+        self.db_path = db_path
+        self.filters = dict(filters)
+        self.generation = generation
+        # StatisticsCache version the results are based on
+        self.cache_version = None
+        self.signals = StatisticsWorkerSignals()
+        self.cancelled = threading.Event()
+        self.db_manager = None
+        # Guards db_manager between cancel() on the GUI thread and close in run()
+        self.connection_lock = threading.Lock()
+
+    def cancel(self):
+        """Stop this computation; its results will not be delivered"""
+        self.cancelled.set()
+
+        # Abort a query that is already running
+        with self.connection_lock:
+            if self.db_manager:
+                self.db_manager.interrupt()
+
+    def run(self):
+        try:
+            # Own read-only connection, so the GUI's connection is never shared across threads
+            with self.connection_lock:
+                self.db_manager = DatabaseManager(self.db_path, read_only=True)
+            if self.cancelled.is_set():
+                return
+
+            # A cancel during a query interrupts it, which raises here
+            results = load_statistics_results(self.db_manager, self.filters)
+            if self.cancelled.is_set():
+                return
+
+            self.signals.finished.emit(self.generation, results)
+        except Exception as e:
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self.generation, f"Error calculating statistics: {str(e)}")
+        finally:
+            with self.connection_lock:
+                if self.db_manager:
+                    self.db_manager.close()
+                    self.db_manager = None
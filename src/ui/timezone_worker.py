@@ -0,0 +1,22 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+class TimezoneWorkerSignals(QObject):
+    """Signals emitted by a TimezoneWorker (delivered on the GUI thread)"""
+    finished = pyqtSignal(bool, str)  # success, message
+
+class TimezoneWorker(QRunnable):
+    """Changes the timezone setting off the GUI thread, recomputing every trade's timestamps and round trips"""
+
+    def __init__(self, db_manager, timezone):
+        super().__init__()
+        self.db_manager = db_manager
+        self.timezone = timezone
+        self.signals = TimezoneWorkerSignals()
+
+    def run(self):
+        try:
+            # The pool's writer connection may be used from this thread
+            success, message = self.db_manager.set_timezone(self.timezone)
+            self.signals.finished.emit(success, message)
+        except Exception as e:
+            self.signals.finished.emit(False, f"Error changing timezone: {str(e)}")
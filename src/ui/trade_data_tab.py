@@ -1,14 +1,14 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QTableWidget, QTableWidgetItem, QPushButton, 
+    QTableView, QPushButton, 
     QComboBox, QDateEdit, QTimeEdit, QGroupBox,
     QFileDialog, QHeaderView, QSpinBox, QMessageBox,
     QStyledItemDelegate
 )
 from PyQt6.QtCore import Qt, QDate, QTime
-from PyQt6.QtGui import QColor
 
 from datetime import datetime
+from src.ui.trade_table_model import TradeTableModel, ENTRY_STRATEGY_COLUMN, PHOTO_COLUMN
 from src.utils.helpers import (
     get_entry_strategy_options, format_date, 
     show_message, save_image, load_image_as_pixmap
@@ -49,8 +49,15 @@ class TradeDataTab(QWidget):
         super().__init__()
         self.db_manager = db_manager
         self.current_filters = {}
+        # Trades are first loaded when the tab is shown
+        self.trades_loaded = False
         self.init_ui()
-        self.load_trades()
+        
+    def showEvent(self, event):
+        """Load the trades the first time the tab becomes visible"""
+        super().showEvent(event)
+        if not self.trades_loaded:
+            self.load_trades()
         
     def init_ui(self):
         """Initialize the UI components"""
@@ -99,6 +106,12 @@ class TradeDataTab(QWidget):
         self.load_instruments()
         other_filters_layout.addWidget(self.instrument_combo)
         
+        other_filters_layout.addWidget(QLabel("Account:"))
+        self.account_combo = QComboBox()
+        self.account_combo.addItem("All", None)
+        self.load_accounts()
+        other_filters_layout.addWidget(self.account_combo)
+        
         other_filters_layout.addWidget(QLabel("Action:"))
         self.action_combo = QComboBox()
         self.action_combo.addItem("All", None)
@@ -146,42 +159,26 @@ class TradeDataTab(QWidget):
         
         layout.addWidget(filters_group)
         
-        # Trades table
-        self.trades_table = QTableWidget()
-        self.trades_table.setColumnCount(12)  # Adjusted column count per requirements
-        self.trades_table.setHorizontalHeaderLabels([
-            "Date", "Time", "Instrument", "Action", "Quantity", 
-            "Price", "Commission", "MAE", "MFE", "Bars", 
-            "Entry Strategy", "Photo"
-        ])
+        # Trades table, backed by a model that pages rows in from the database
+        self.trades_model = TradeTableModel(self.db_manager, self)
+        self.trades_table = QTableView()
+        self.trades_table.setModel(self.trades_model)
         
-        # Set column resize modes
+        # Set column resize modes (sizing to contents would force every row to load)
         header = self.trades_table.horizontalHeader()
-        for i in range(self.trades_table.columnCount()):
-            if i == 10:  # Entry Strategy column
+        for i in range(self.trades_model.columnCount()):
+            if i == ENTRY_STRATEGY_COLUMN:
                 header.setSectionResizeMode(i, QHeaderView.ResizeMode.Stretch)
             else:
-                header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+                header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
         
         # Set the custom delegate for Entry Strategy column
-        self.trades_table.setItemDelegateForColumn(10, EntryStrategyDelegate(self.trades_table))
+        self.trades_table.setItemDelegateForColumn(ENTRY_STRATEGY_COLUMN, EntryStrategyDelegate(self.trades_table))
         
         layout.addWidget(self.trades_table)
         
         # Connect signals
-        self.trades_table.cellDoubleClicked.connect(self.cell_double_clicked)
-        self.trades_table.cellChanged.connect(self.cell_changed)
-    
-    def cell_changed(self, row, column):
-        """Handle cell value changes"""
-        if column == 10:  # Entry Strategy column
-            # Get the trade ID and new value
-            trade_id = self.trades_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            new_value = self.trades_table.item(row, column).text()
-            
-            if trade_id and new_value:
-                # Update the database
-                self.db_manager.update_trade_entry_strategy(trade_id, new_value)
+        self.trades_table.doubleClicked.connect(self.cell_double_clicked)
     
     def load_instruments(self):
         """Load instruments into combo box"""
@@ -189,6 +186,11 @@ class TradeDataTab(QWidget):
         for name, _ in instruments:
             self.instrument_combo.addItem(name, name)
     
+    def load_accounts(self):
+        """Load accounts into combo box"""
+        for account in self.db_manager.get_accounts():
+            self.account_combo.addItem(account, account)
+    
     def apply_filters(self):
         """Apply filters to trades display"""
         self.current_filters = {
@@ -197,6 +199,7 @@ class TradeDataTab(QWidget):
             'start_time': self.start_time_edit.time().toString("HH:mm:ss"),
             'end_time': self.end_time_edit.time().toString("HH:mm:ss"),
             'instrument': self.instrument_combo.currentData(),
+            'account': self.account_combo.currentData(),
             'action': self.action_combo.currentData(),
             'entry_strategy': self.strategy_combo.currentData(),
             'min_bars': self.min_bars_spin.value() if self.min_bars_spin.value() > 0 else None,
@@ -212,6 +215,7 @@ class TradeDataTab(QWidget):
         self.start_time_edit.setTime(QTime(0, 0, 0))
         self.end_time_edit.setTime(QTime(23, 59, 59))
         self.instrument_combo.setCurrentIndex(0)
+        self.account_combo.setCurrentIndex(0)
         self.action_combo.setCurrentIndex(0)
         self.strategy_combo.setCurrentIndex(0)
         self.min_bars_spin.setValue(0)
@@ -222,67 +226,13 @@ class TradeDataTab(QWidget):
     
     def load_trades(self):
         """Load trades from database with current filters"""
-        trades = self.db_manager.get_trades(self.current_filters)
-        
-        self.trades_table.setRowCount(0)  # Clear table
-        
-        for row_idx, trade in enumerate(trades):
-            self.trades_table.insertRow(row_idx)
-            
-            # Date
-            date_item = QTableWidgetItem(trade.get('date', ''))
-            date_item.setData(Qt.ItemDataRole.UserRole, trade.get('id'))
-            self.trades_table.setItem(row_idx, 0, date_item)
-            
-            # Time
-            self.trades_table.setItem(row_idx, 1, QTableWidgetItem(trade.get('time', '')))
-            
-            # Instrument
-            self.trades_table.setItem(row_idx, 2, QTableWidgetItem(trade.get('instrument', '')))
-            
-            # Action
-            action_item = QTableWidgetItem(trade.get('action', ''))
-            # Set background color based on action
-            if 'buy' in trade.get('action', '').lower():
-                action_item.setBackground(QColor(200, 255, 200))  # Light green
-            elif 'sell' in trade.get('action', '').lower():
-                action_item.setBackground(QColor(255, 200, 200))  # Light red
-            self.trades_table.setItem(row_idx, 3, action_item)
-            
-            # Quantity
-            self.trades_table.setItem(row_idx, 4, QTableWidgetItem(str(trade.get('quantity', ''))))
-            
-            # Price
-            self.trades_table.setItem(row_idx, 5, QTableWidgetItem(str(trade.get('price', ''))))
-            
-            # Commission
-            self.trades_table.setItem(row_idx, 6, QTableWidgetItem(str(trade.get('commission', ''))))
-            
-            # MAE
-            self.trades_table.setItem(row_idx, 7, QTableWidgetItem(str(trade.get('mae', ''))))
-            
-            # MFE
-            self.trades_table.setItem(row_idx, 8, QTableWidgetItem(str(trade.get('mfe', ''))))
-            
-            # Bars
-            self.trades_table.setItem(row_idx, 9, QTableWidgetItem(str(trade.get('bars', ''))))
-            
-            # Entry Strategy
-            entry_strategy_item = QTableWidgetItem(trade.get('entry_strategy', ''))
-            entry_strategy_item.setFlags(entry_strategy_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            self.trades_table.setItem(row_idx, 10, entry_strategy_item)
-            
-            # Photo - Add a button or indicator if photos exist
-            images = self.db_manager.get_trade_images(trade.get('id'))
-            photo_text = f"{len(images)} image(s)" if images else "Add Photo"
-            photo_item = QTableWidgetItem(photo_text)
-            photo_item.setData(Qt.ItemDataRole.UserRole, trade.get('id'))
-            self.trades_table.setItem(row_idx, 11, photo_item)
+        self.trades_loaded = True
+        self.trades_model.set_filters(self.current_filters)
     
-    def cell_double_clicked(self, row, column):
+    def cell_double_clicked(self, index):
         """Handle double click on table cell"""
-        if column == 11:  # Photo column
-            trade_id = self.trades_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        if index.column() == PHOTO_COLUMN:
+            trade_id = self.trades_model.get_trade_id(index.row())
             self.handle_photo_click(trade_id)
     
     def handle_photo_click(self, trade_id):
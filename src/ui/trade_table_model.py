@@ -0,0 +1,177 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+# (header, trade field) for each table column; Photo is derived from image_count
+TRADE_TABLE_COLUMNS = [
+    ("Date", 'date'),
+    ("Time", 'time'),
+    ("Instrument", 'instrument'),
+    ("Account", 'account'),
+    ("Action", 'action'),
+    ("Quantity", 'quantity'),
+    ("Price", 'price'),
+    ("Exit Price", 'exit_price'),
+    ("Exit Time", 'exit_time'),
+    ("Profit", 'profit'),
+    ("Commission", 'commission'),
+    ("MAE", 'mae'),
+    ("MFE", 'mfe'),
+    ("Bars", 'bars'),
+    ("Entry Strategy", 'entry_strategy'),
+    ("Photo", 'image_count')
+]
+
+ACTION_COLUMN = 4
+ENTRY_STRATEGY_COLUMN = 14
+PHOTO_COLUMN = 15
+
+# Rows fetched from SQLite per page, and how many pages are kept in memory
+PAGE_SIZE = 200
+MAX_CACHED_PAGES = 10
+
+class TradeTableModel(QAbstractTableModel):
+    """Table model that pages filtered trades in from the database on demand"""
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.filters = {}
+        self.row_count = 0
+        self.pages = OrderedDict()
+        # (entry_ts, id) of the last trade before each page, kept after the page
+        # itself is dropped; page 0 starts at the top
+        self.page_keys = {0: None}
+
+    def set_filters(self, filters):
+        """Apply new filters; only the row count is queried up front"""
+        self.beginResetModel()
+        self.filters = dict(filters or {})
+        self.row_count = self.db_manager.count_trades(self.filters)
+        self.pages.clear()
+        self.page_keys = {0: None}
+        self.endResetModel()
+
+    def refresh(self):
+        """Reload the current filter results"""
+        self.set_filters(self.filters)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(TRADE_TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == Qt.Orientation.Horizontal:
+            return TRADE_TABLE_COLUMNS[section][0]
+
+        return str(section + 1)
+
+    def get_trade(self, row):
+        """Return the trade dict shown on a row, loading its page if needed"""
+        page_number, page_row = divmod(row, PAGE_SIZE)
+
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self.load_page(page_number)
+            self.pages[page_number] = page
+
+            # Drop the least recently used page once the window is full
+            if len(self.pages) > MAX_CACHED_PAGES:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+
+        # The table may have shrunk since the row count was taken
+        return page[page_row] if page_row < len(page) else None
+
+    def load_page(self, page_number):
+        """Fetch a page by seeking to the key of the trade before it, rather than by offset"""
+        if page_number not in self.page_keys:
+            key = self.find_page_key(page_number)
+            if key is None:
+                # Fewer trades than the row count (the table has shrunk)
+                return []
+            self.page_keys[page_number] = key
+
+        page = self.db_manager.get_trades(self.filters, limit=PAGE_SIZE, after=self.page_keys[page_number])
+        if len(page) == PAGE_SIZE:
+            last = page[-1]
+            self.page_keys[page_number + 1] = (last['entry_ts'], last['id'])
+        return page
+
+    def find_page_key(self, page_number):
+        """Key of the last trade before a page, counted from the nearest page whose key is known"""
+        known = max(number for number in self.page_keys if number < page_number)
+        offset = (page_number - known) * PAGE_SIZE - 1
+
+        key = self.db_manager.get_trade_key(self.filters, offset, after=self.page_keys[known])
+        if key is None and self.page_keys[known] is not None:
+            # The page may start among the trades without an entry_ts, which a key doesn't count
+            key = self.db_manager.get_trade_key(self.filters, page_number * PAGE_SIZE - 1)
+        return key
+
+    def get_trade_id(self, row):
+        """Return the id of the trade shown on a row"""
+        trade = self.get_trade(row)
+        return trade.get('id') if trade else None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        trade = self.get_trade(index.row())
+        if trade is None:
+            return None
+
+        column = index.column()
+        value = trade.get(TRADE_TABLE_COLUMNS[column][1])
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == PHOTO_COLUMN:
+                return f"{value} image(s)" if value else "Add Photo"
+            return "" if value is None else str(value)
+
+        if role == Qt.ItemDataRole.UserRole:
+            return trade.get('id')
+
+        if role == Qt.ItemDataRole.BackgroundRole and column == ACTION_COLUMN:
+            # Set background color based on action
+            action = (value or "").lower()
+            if 'buy' in action:
+                return QColor(200, 255, 200)  # Light green
+            elif 'sell' in action:
+                return QColor(255, 200, 200)  # Light red
+
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+
+        if index.isValid() and index.column() == ENTRY_STRATEGY_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Save an edited Entry Strategy straight to the database"""
+        if role != Qt.ItemDataRole.EditRole or index.column() != ENTRY_STRATEGY_COLUMN:
+            return False
+
+        trade = self.get_trade(index.row())
+        if not trade or not trade.get('id') or not value:
+            return False
+
+        success, _ = self.db_manager.update_trade_entry_strategy(trade['id'], value)
+        if not success:
+            return False
+
+        # Update the cached row so the view does not need a reload
+        trade['entry_strategy'] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
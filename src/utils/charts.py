@@ -0,0 +1,161 @@
+import numpy as np
+
+# The Statistics charts, in display order. series names a trade column, or
+# 'equity' for the running total of P&L
+CHART_DEFINITIONS = [
+    {'name': 'pnl', 'title': 'Profit & Loss', 'kind': 'line', 'series': 'equity', 'color': 'blue', 'ylabel': 'P&L'},
+    {'name': 'scatter', 'title': 'Scatter Plot', 'kind': 'scatter', 'series': 'pnl', 'ylabel': 'P&L', 'zero_line': True},
+    {'name': 'mfe', 'title': 'MFE', 'kind': 'line', 'series': 'mfe', 'color': 'green', 'ylabel': 'MFE'},
+    {'name': 'mae', 'title': 'MAE', 'kind': 'line', 'series': 'mae', 'color': 'red', 'ylabel': 'MAE'}
+]
+
+EMPTY_CHART_TEXT = "No trades in the selected date range"
+
+# Lines drop their markers above this many plotted points
+MARKER_THRESHOLD = 500
+
+# Points kept per horizontal pixel of a line chart (a minimum and a maximum)
+POINTS_PER_PIXEL = 2
+
+# Scatter charts with more points than this are drawn as one image in vector
+# output (PDF reports) instead of a path per point
+RASTERIZE_THRESHOLD = 5000
+
+# Scatter marker sizes in points, smaller above MARKER_THRESHOLD points
+SCATTER_MARKER_SIZE = 5
+DENSE_SCATTER_MARKER_SIZE = 2
+
+# Scatter colours for winning and other trades, as RGBA
+WIN_COLOR = (0.0, 0.5, 0.0, 1.0)
+LOSS_COLOR = (1.0, 0.0, 0.0, 1.0)
+
+# Fraction of the data range left empty around the points
+AXIS_MARGIN = 0.05
+
+def chart_series(trades, series):
+    """Y values of a chart for the trade columns"""
+    if series == 'equity':
+        return np.cumsum(trades['pnl'])
+    return trades[series]
+
+def minmax_decimate(x, y, max_points):
+    """Reduce points to at most about max_points, keeping each bucket's lowest and highest
+
+    Consecutive points are split into max_points / 2 buckets, and only the
+    minimum and maximum of each bucket are kept (in their original order),
+    so spikes survive decimation. The first and last points are always kept.
+    """
+    count = len(y)
+    if count <= max(int(max_points), 2):
+        return x, y
+
+    # Pad to whole buckets with the last value, which can never be a new extreme
+    buckets = max(int(max_points) // 2, 1)
+    size = -(-count // buckets)
+    padded = np.empty(buckets * size, dtype=float)
+    padded[:count] = y
+    padded[count:] = y[-1]
+    grid = padded.reshape(buckets, size)
+
+    starts = np.arange(buckets) * size
+    lows = np.minimum(starts + grid.argmin(axis=1), count - 1)
+    highs = np.minimum(starts + grid.argmax(axis=1), count - 1)
+
+    indices = np.concatenate(([0], np.minimum(lows, highs), np.maximum(lows, highs), [count - 1]))
+    indices = np.unique(indices)
+    return x[indices], y[indices]
+
+def padded_limits(low, high):
+    """Axis limits around a data range with AXIS_MARGIN on both sides"""
+    if low == high:
+        pad = abs(low) * AXIS_MARGIN or 1.0
+    else:
+        pad = (high - low) * AXIS_MARGIN
+    return low - pad, high + pad
+
+class ChartRenderer:
+    """One chart drawn on a matplotlib Figure, with artists kept between updates
+
+    The axes, the line or scatter artists and the empty-state text are created
+    once; update() only replaces their data and limits, so the figure is never
+    cleared and rebuilt. Lines are min/max decimated to the axes' width, while
+    a scatter keeps every trade so no outlier or cluster is hidden. Its winning
+    and other trades are two marker-only lines, which Agg stamps far faster
+    than a PathCollection of per-point paths. Works with any canvas (Qt or Agg).
+    """
+
+    def __init__(self, figure, definition):
+        self.figure = figure
+        self.definition = definition
+        self.axes = figure.add_subplot(111)
+        # Point budget the current data was decimated for
+        self.decimated_points = None
+
+        self.axes.set_xlabel('Trade Number')
+        self.axes.set_ylabel(definition['ylabel'])
+        self.axes.grid(True, linestyle='--', alpha=0.6)
+
+        if definition['kind'] == 'scatter':
+            self.artists = [
+                self.axes.plot([], [], linestyle='None', marker='o', markeredgewidth=0, color=color)[0]
+                for color in (WIN_COLOR, LOSS_COLOR)
+            ]
+        else:
+            self.artists = self.axes.plot([], [], marker='o', markersize=3, color=definition['color'])
+
+        self.zero_line = None
+        if definition.get('zero_line'):
+            self.zero_line = self.axes.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+
+        self.empty_text = self.axes.text(
+            0.5, 0.5, EMPTY_CHART_TEXT, ha='center', va='center', fontsize=9,
+            transform=self.axes.transAxes, visible=False
+        )
+
+    def max_points(self):
+        """Points worth drawing at the axes' current width in pixels"""
+        return max(int(self.axes.bbox.width), 1) * POINTS_PER_PIXEL
+
+    def is_decimated_for_size(self):
+        """Whether the plotted points were decimated for the axes' current width"""
+        # A scatter plots every point whatever the width
+        if self.definition['kind'] == 'scatter':
+            return True
+        return self.decimated_points == self.max_points()
+
+    def update(self, trades):
+        """Show the trade columns (in chronological order); the caller redraws the canvas"""
+        y = np.asarray(chart_series(trades, self.definition['series']), dtype=float)
+        count = len(y)
+
+        self.empty_text.set_visible(count == 0)
+        for artist in self.artists:
+            artist.set_visible(count > 0)
+        if self.zero_line is not None:
+            self.zero_line.set_visible(count > 0)
+        if not count:
+            self.axes.set_axis_off()
+            return
+        self.axes.set_axis_on()
+
+        x = np.arange(1, count + 1)
+        if self.definition['kind'] == 'scatter':
+            wins = y > 0
+            marker_size = SCATTER_MARKER_SIZE if count <= MARKER_THRESHOLD else DENSE_SCATTER_MARKER_SIZE
+            for artist, selected in zip(self.artists, (wins, ~wins)):
+                artist.set_data(x[selected], y[selected])
+                artist.set_markersize(marker_size)
+                artist.set_rasterized(count > RASTERIZE_THRESHOLD)
+        else:
+            self.decimated_points = self.max_points()
+            x, y = minmax_decimate(x, y, self.decimated_points)
+            line, = self.artists
+            line.set_data(x, y)
+            line.set_marker('o' if len(x) <= MARKER_THRESHOLD else 'None')
+
+        # Limits come from the data directly, which is cheaper than relim() over every point
+        self.axes.set_xlim(*padded_limits(1, count))
+        low, high = float(y.min()), float(y.max())
+        if self.definition.get('zero_line'):
+            low, high = min(low, 0.0), max(high, 0.0)
+        self.axes.set_ylim(*padded_limits(low, high))
@@ -1,15 +1,123 @@
-import pandas as pd
+import numpy as np
 import os
+import hashlib
 from datetime import datetime
 
+# pandas is imported by the functions that use it, so the application starts
+# without loading it until the first import
+
+# Number of CSV rows parsed, mapped and inserted at a time in streaming mode
+DEFAULT_CHUNK_SIZE = 50000
+
+# Timestamp layouts written by NinjaTrader grid and execution exports
+DATETIME_FORMATS = [
+    '%m/%d/%Y %I:%M:%S %p',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %I:%M %p',
+    '%m/%d/%Y %H:%M',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S'
+]
+
+# Number of values checked when detecting a timestamp layout
+DATETIME_SAMPLE_SIZE = 20
+
+def parse_money(series):
+    """Convert money strings such as "$1,234.50" or "($12.00)" to floats"""
+    import pandas as pd
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+        
+    # Money columns repeat heavily, so only the distinct values are parsed
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    
+    # Accounting style negatives are wrapped in parentheses
+    negative = text.str.startswith('(') & text.str.endswith(')')
+    values = pd.to_numeric(text.str.replace(r'[$,()\s]', '', regex=True), errors='coerce')
+    values = values.where(~negative, -values).to_numpy(dtype=float)
+    
+    # Missing values get code -1
+    parsed = np.append(values, np.nan)[codes]
+    return pd.Series(parsed, index=series.index)
+
+def split_datetimes(datetimes):
+    """Split a datetime Series into YYYY-MM-DD and HH:MM:SS string Series"""
+    import pandas as pd
+    # Format through fixed-width numpy strings instead of per-element strftime
+    chars = datetimes.to_numpy(dtype='datetime64[s]').astype('U19').view('U1').reshape(-1, 19)
+    dates = np.ascontiguousarray(chars[:, :10]).view('U10').ravel()
+    times = np.ascontiguousarray(chars[:, 11:]).view('U8').ravel()
+    
+    missing = datetimes.isna()
+    return (
+        pd.Series(dates, index=datetimes.index, dtype=object).mask(missing),
+        pd.Series(times, index=datetimes.index, dtype=object).mask(missing)
+    )
+
+def fingerprint_value(value):
+    """Canonical text for one fingerprint field, so CSV and database values agree"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return str(value).strip()
+
+def execution_fingerprints(instruments, accounts, dates, times, actions, quantities, prices, exit_times, seen=None):
+    """Fingerprint each execution from its identifying fields
+    
+    Executions that are identical in every field (e.g. two fills in the same
+    second at the same price) get an occurrence suffix, so they are all kept
+    while a re-import of them is still recognised. seen carries the
+    occurrence counts across the chunks of one file.
+    """
+    if seen is None:
+        seen = {}
+        
+    fingerprints = []
+    for instrument, account, date, time, action, quantity, price, exit_time in zip(
+        instruments, accounts, dates, times, actions, quantities, prices, exit_times
+    ):
+        # Quantities may come back as floats when the CSV column has gaps
+        if quantity is not None and not (isinstance(quantity, float) and np.isnan(quantity)):
+            quantity = int(quantity)
+        if price is not None:
+            price = float(price)
+            
+        key = "|".join(fingerprint_value(value) for value in (
+            instrument, account, date, time, action, quantity, price, exit_time
+        ))
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        fingerprints.append(f"{digest}:{occurrence}" if occurrence else digest)
+        
+    return fingerprints
+
+def column_values(df, column, length):
+    """List of a column's values with missing values as None (all None if the column is absent)"""
+    if column is None or column not in df.columns:
+        return [None] * length
+    series = df[column].astype(object)
+    return series.where(series.notna(), None).tolist()
+
 class CSVImporter:
     """Class for importing CSV trade data"""
     
     def __init__(self, file_path):
         self.file_path = file_path
+        self.df = None
+        # Detected timestamp layout per column, reused across chunks
+        self.datetime_formats = {}
+        # Occurrences of each execution fingerprint so far in this file
+        self.fingerprint_counts = {}
         
     def validate_csv(self):
         """Validate CSV file format"""
+        import pandas as pd
         if not os.path.exists(self.file_path):
             return False, "File does not exist"
             
@@ -17,59 +125,147 @@ class CSVImporter:
             return False, "File is not a CSV file"
             
         try:
-            # Try to read CSV file
-            df = pd.read_csv(self.file_path)
-            
-            # Check for required columns based on NinjaTrader format
-            # We're flexible with the exact format to support different CSV layouts
-            required_columns = ['Instrument']
-            
-            # Check if we have either Entry time or Date/Time
-            time_columns = ['Entry time', 'Date/Time']
-            has_time_column = any(col in df.columns for col in time_columns)
-            
-            # Check if we have market position or action
-            action_columns = ['Market pos.', 'Action']
-            has_action_column = any(col in df.columns for col in action_columns)
-            
-            # Check if we have quantity
-            qty_columns = ['Qty', 'Quantity']
-            has_qty_column = any(col in df.columns for col in qty_columns)
-            
-            # Check if we have price
-            price_columns = ['Entry price', 'Price']
-            has_price_column = any(col in df.columns for col in price_columns)
-            
-            # Combine all required checks
-            if 'Instrument' not in df.columns:
-                return False, "Missing required column: Instrument"
-                
-            if not has_time_column:
-                return False, "Missing required column: Entry time or Date/Time"
-                
-            if not has_action_column:
-                return False, "Missing required column: Market pos. or Action"
-                
-            if not has_qty_column:
-                return False, "Missing required column: Qty or Quantity"
-                
-            if not has_price_column:
-                return False, "Missing required column: Entry price or Price"
-                
-            return True, "CSV file is valid"
+            # Only the header is needed to check the layout
+            columns = pd.read_csv(self.file_path, nrows=0).columns
+            return self.validate_columns(columns)
         except Exception as e:
             return False, f"Error reading CSV file: {str(e)}"
             
+    def validate_columns(self, columns):
+        """Validate that the required columns are present"""
+        # Check for required columns based on NinjaTrader format
+        # We're flexible with the exact format to support different CSV layouts
+        required_columns = ['Instrument']
+        
+        # Check if we have either Entry time or Date/Time
+        time_columns = ['Entry time', 'Date/Time']
+        has_time_column = any(col in columns for col in time_columns)
+        
+        # Check if we have market position or action
+        action_columns = ['Market pos.', 'Action']
+        has_action_column = any(col in columns for col in action_columns)
+        
+        # Check if we have quantity
+        qty_columns = ['Qty', 'Quantity']
+        has_qty_column = any(col in columns for col in qty_columns)
+        
+        # Check if we have price
+        price_columns = ['Entry price', 'Price']
+        has_price_column = any(col in columns for col in price_columns)
+        
+        # Combine all required checks
+        if 'Instrument' not in columns:
+            return False, "Missing required column: Instrument"
+            
+        if not has_time_column:
+            return False, "Missing required column: Entry time or Date/Time"
+            
+        if not has_action_column:
+            return False, "Missing required column: Market pos. or Action"
+            
+        if not has_qty_column:
+            return False, "Missing required column: Qty or Quantity"
+            
+        if not has_price_column:
+            return False, "Missing required column: Entry price or Price"
+            
+        return True, "CSV file is valid"
+            
     def read_csv(self):
-        """Read CSV file and return DataFrame"""
+        """Read CSV file and return DataFrame (parsed once and reused)"""
+        import pandas as pd
+        if self.df is not None:
+            return True, self.df
+            
         try:
-            df = pd.read_csv(self.file_path)
-            return True, df
+            self.df = pd.read_csv(self.file_path)
+            return True, self.df
         except Exception as e:
             return False, f"Error reading CSV file: {str(e)}"
             
+    def load(self):
+        """Validate, read and map the file in a single pass"""
+        valid, message = self.validate_csv()
+        
+        if not valid:
+            return False, message
+            
+        success, df = self.read_csv()
+        
+        if not success:
+            return False, df  # df contains error message in this case
+            
+        mapped_df = self.map_columns(df)
+        
+        # Release the raw frame so only the mapped one stays in memory
+        self.df = None
+        
+        return True, mapped_df
+            
+    def iter_chunks(self, chunksize=DEFAULT_CHUNK_SIZE, skip_rows=0):
+        """Yield mapped DataFrames for fixed-size chunks of the file"""
+        import pandas as pd
+        # Skip data rows already imported by an earlier, interrupted run (row 0 is the header)
+        skiprows = range(1, skip_rows + 1) if skip_rows else None
+        
+        for chunk in pd.read_csv(self.file_path, chunksize=chunksize, skiprows=skiprows):
+            yield self.map_columns(chunk)
+            
+    def count_rows(self):
+        """Count the data rows in the file without parsing it (for progress reporting)"""
+        lines = 0
+        last_byte = b'\n'
+        with open(self.file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                lines += block.count(b'\n')
+                last_byte = block[-1:]
+        
+        # A final line without a newline still counts; the header does not
+        if last_byte != b'\n':
+            lines += 1
+        return max(lines - 1, 0)
+            
+    def detect_datetime_format(self, series):
+        """Return the known timestamp layout used by a column, or None"""
+        if series.name in self.datetime_formats:
+            return self.datetime_formats[series.name]
+            
+        samples = series.dropna().astype(str).head(DATETIME_SAMPLE_SIZE).tolist()
+        detected = None
+        
+        for fmt in DATETIME_FORMATS:
+            try:
+                for sample in samples:
+                    datetime.strptime(sample.strip(), fmt)
+            except ValueError:
+                continue
+            detected = fmt
+            break
+        
+        # Only cache a result that was based on real values
+        if samples:
+            self.datetime_formats[series.name] = detected
+            
+        return detected
+        
+    def parse_datetimes(self, series):
+        """Parse a timestamp column using an explicit format when one is known"""
+        import pandas as pd
+        # A chunk with the column left empty (e.g. open trades' exit times) is read as float NaN
+        if not pd.api.types.is_object_dtype(series.dtype) and not pd.api.types.is_string_dtype(series.dtype):
+            return pd.to_datetime(pd.Series(pd.NaT, index=series.index))
+        
+        fmt = self.detect_datetime_format(series)
+        
+        if fmt:
+            return pd.to_datetime(series.str.strip(), format=fmt, errors='coerce')
+            
+        # Unknown layout, fall back to pandas inference
+        return pd.to_datetime(series, errors='coerce')
+            
     def map_columns(self, df):
         """Map NinjaTrader CSV columns to database fields"""
+        import pandas as pd
         # Create a new DataFrame with the mapped columns
         mapped_df = pd.DataFrame()
         
@@ -80,14 +276,12 @@ class CSVImporter:
         # Map Date and Time
         if 'Entry time' in df.columns:
             # Split Entry time into date and time parts
-            entry_times = pd.to_datetime(df['Entry time'], errors='coerce')
-            mapped_df['date'] = entry_times.dt.strftime('%Y-%m-%d')
-            mapped_df['time'] = entry_times.dt.strftime('%H:%M:%S')
+            entry_times = self.parse_datetimes(df['Entry time'])
+            mapped_df['date'], mapped_df['time'] = split_datetimes(entry_times)
         elif 'Date/Time' in df.columns:
             # Split Date/Time into date and time parts
-            date_times = pd.to_datetime(df['Date/Time'], errors='coerce')
-            mapped_df['date'] = date_times.dt.strftime('%Y-%m-%d')
-            mapped_df['time'] = date_times.dt.strftime('%H:%M:%S')
+            date_times = self.parse_datetimes(df['Date/Time'])
+            mapped_df['date'], mapped_df['time'] = split_datetimes(date_times)
         
         # Map Action
         if 'Market pos.' in df.columns:
@@ -108,24 +302,39 @@ class CSVImporter:
         elif 'Price' in df.columns:
             mapped_df['price'] = df['Price']
         
+        # Map Account
+        if 'Account' in df.columns:
+            mapped_df['account'] = df['Account']
+        
+        # Map Exit price, Exit time and broker reported Profit (grid exports only)
+        if 'Exit price' in df.columns:
+            mapped_df['exit_price'] = parse_money(df['Exit price'])
+        
+        if 'Exit time' in df.columns:
+            exit_times = self.parse_datetimes(df['Exit time'])
+            mapped_df['exit_date'], mapped_df['exit_time'] = split_datetimes(exit_times)
+        
+        if 'Profit' in df.columns:
+            mapped_df['profit'] = parse_money(df['Profit'])
+        
         # Map Commission
         if 'Commission' in df.columns:
             # Remove any $ signs and convert to float
-            mapped_df['commission'] = df['Commission'].apply(lambda x: str(x).replace('$', '').replace(',', '') if isinstance(x, str) else x)
+            mapped_df['commission'] = parse_money(df['Commission'])
         else:
             mapped_df['commission'] = 0.0
         
         # Map MAE
         if 'MAE' in df.columns:
             # Remove any $ signs and convert to float
-            mapped_df['mae'] = df['MAE'].apply(lambda x: str(x).replace('$', '').replace(',', '') if isinstance(x, str) else x)
+            mapped_df['mae'] = parse_money(df['MAE'])
         else:
             mapped_df['mae'] = 0.0
         
         # Map MFE
         if 'MFE' in df.columns:
             # Remove any $ signs and convert to float
-            mapped_df['mfe'] = df['MFE'].apply(lambda x: str(x).replace('$', '').replace(',', '') if isinstance(x, str) else x)
+            mapped_df['mfe'] = parse_money(df['MFE'])
         else:
             mapped_df['mfe'] = 0.0
         
@@ -143,4 +352,30 @@ class CSVImporter:
             
         mapped_df['notes'] = ''
         
-        return mapped_df 
\ No newline at end of file
+        # Fingerprint identifying each execution, so re-imported rows can be skipped
+        mapped_df['fingerprint'] = self.fingerprint_rows(mapped_df)
+        
+        return mapped_df
+    
+    def fingerprint_rows(self, mapped_df):
+        """Execution fingerprints for mapped rows"""
+        import pandas as pd
+        length = len(mapped_df)
+        
+        exit_times = [None] * length
+        if 'exit_date' in mapped_df.columns:
+            exit_times = column_values(
+                pd.DataFrame({'exit': mapped_df['exit_date'] + ' ' + mapped_df['exit_time']}), 'exit', length
+            )
+        
+        return execution_fingerprints(
+            column_values(mapped_df, 'instrument', length),
+            column_values(mapped_df, 'account', length),
+            column_values(mapped_df, 'date', length),
+            column_values(mapped_df, 'time', length),
+            column_values(mapped_df, 'action', length),
+            column_values(mapped_df, 'quantity', length),
+            column_values(mapped_df, 'price', length),
+            exit_times,
+            seen=self.fingerprint_counts
+        ) 
\ No newline at end of file
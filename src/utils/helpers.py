@@ -2,7 +2,6 @@ import os
 from datetime import datetime, timedelta
 from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtGui import QPixmap, QImage
-from PIL import Image
 import shutil
 
 def format_date(date_str):
@@ -63,6 +62,9 @@ def save_image(source_path, trade_id, images_dir="static/images"):
 
 def resize_image(image_path, max_width=800, max_height=600):
     """Resize image to fit within maximum dimensions"""
+    # Pillow is only loaded the first time an image is resized
+    from PIL import Image
+    
     try:
         img = Image.open(image_path)
         width, height = img.size
@@ -88,6 +90,15 @@ def show_message(parent, title, message, icon=QMessageBox.Icon.Information):
     msg_box.setIcon(icon)
     msg_box.exec()
 
+def ask_confirmation(parent, title, message):
+    """Ask a yes/no question, returning True when the user answers yes"""
+    reply = QMessageBox.question(
+        parent, title, message,
+        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        QMessageBox.StandardButton.No
+    )
+    return reply == QMessageBox.StandardButton.Yes
+
 def load_image_as_pixmap(image_path, max_width=None, max_height=None):
     """Load image from path and return as QPixmap with optional resizing"""
     pixmap = QPixmap(image_path)
@@ -19,7 +19,7 @@ def init_default_instruments(db_manager):
         ("ZW", 50.0),  # Wheat
     ]
     
-    for name, multiplier in default_instruments:
-        db_manager.ensure_instrument_exists(name, multiplier)
+    # One statement for all of them, skipped entirely once they exist
+    db_manager.ensure_instruments(default_instruments)
         
     return True 
\ No newline at end of file
@@ -0,0 +1,311 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+from src.cli import open_database, print_error
+from src.database.db_manager import DatabaseManager
+from src.analytics.statistics import load_statistics_results, weekday_table, WEEKDAY_NAMES
+from src.utils.timestamps import format_duration
+
+# Headless performance reports: the Statistics tab's metrics and charts for
+# each account / instrument / period, rendered with Agg in worker processes.
+# matplotlib is only imported inside the workers, and no Qt module is used.
+
+REPORT_FORMATS = ['png', 'pdf', 'json']
+
+REPORT_PERIODS = ['week', 'month', 'all']
+
+# Chart figure size in inches at 100 dpi (the line charts are decimated to the width)
+CHART_SIZE = (8, 4.5)
+CHART_DPI = 100
+
+# Resolution of the saved PNG images
+PNG_DPI = 150
+
+# A4 portrait, for the PDF's summary page
+SUMMARY_PAGE_SIZE = (8.27, 11.69)
+
+# Statistics tab metrics in display order: (statistics key, label, format)
+REPORT_METRICS = [
+    ('net_profit', 'Net Gain/Loss', 'money'),
+    ('total_commission', 'Total Commissions', 'money'),
+    ('win_rate', '% Win', 'percent'),
+    ('loss_rate', '% Loss', 'percent'),
+    ('break_even_rate', '% Break Even', 'percent'),
+    ('avg_daily_pnl', 'Average daily gain/loss', 'money'),
+    ('avg_winner', 'Average winning trade', 'money'),
+    ('avg_loser', 'Average losing trade', 'money'),
+    ('total_trades', 'Total number of trades', 'count'),
+    ('winning_trades', 'Number of winning trades', 'count'),
+    ('losing_trades', 'Number of losing trades', 'count'),
+    ('break_even_trades', 'Number of break even trades', 'count'),
+    ('max_consecutive_wins', 'Max consecutive wins', 'count'),
+    ('max_consecutive_losses', 'Max consecutive losses', 'count'),
+    ('largest_winner', 'Largest gain', 'money'),
+    ('largest_loser', 'Largest loss', 'money'),
+    ('avg_trade_pnl', 'Average trade gain/loss', 'money'),
+    ('avg_hold_time_winners', 'Average hold time (winning trades)', 'duration'),
+    ('avg_hold_time_losers', 'Average hold time (losing trades)', 'duration'),
+    ('max_drawdown', 'Max drawdown', 'money'),
+    ('avg_mfe', 'Avg MFE', 'money'),
+    ('avg_mae', 'Avg MAE', 'money')
+]
+
+def format_metric(value, kind):
+    """Display text for a statistic, formatted as in the Statistics tab"""
+    if kind == 'money':
+        return f"${value:.2f}"
+    if kind == 'percent':
+        return f"{value:.2f}%"
+    if kind == 'duration':
+        return format_duration(value)
+    return str(value)
+
+def report_periods(start_date, end_date, period='week'):
+    """(label, start date, end date) for each period between two YYYY-MM-DD dates
+
+    Weeks start on Monday and months on the 1st; the first and last periods are
+    cut to the requested range. 'all' is the whole range as one period.
+    """
+    if period not in REPORT_PERIODS:
+        raise ValueError(f"Unknown report period: {period}")
+
+    first = datetime.strptime(start_date, '%Y-%m-%d').date()
+    last = datetime.strptime(end_date, '%Y-%m-%d').date()
+    if first > last:
+        raise ValueError("The start date is after the end date")
+
+    if period == 'all':
+        return [(f"{first}_{last}", str(first), str(last))]
+
+    periods = []
+    day = first
+    while day <= last:
+        if period == 'week':
+            year, week, _ = day.isocalendar()
+            label = f"{year}-W{week:02d}"
+            period_end = day + timedelta(days=6 - day.weekday())
+        else:
+            label = f"{day.year}-{day.month:02d}"
+            next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+            period_end = next_month - timedelta(days=1)
+
+        period_end = min(period_end, last)
+        periods.append((label, str(day), str(period_end)))
+        day = period_end + timedelta(days=1)
+
+    return periods
+
+def file_name_part(text):
+    """Text made safe for use in a file name"""
+    return re.sub(r'[^A-Za-z0-9.-]+', '_', text).strip('_')
+
+def build_report_jobs(start_date, end_date, period='week', accounts=None, instruments=None):
+    """One report job per period, account and instrument
+
+    accounts / instruments of None report across all of them; otherwise each
+    name gets its own report. A job is a dict with a file name, a title and
+    the trade filters.
+    """
+    jobs = []
+    for label, period_start, period_end in report_periods(start_date, end_date, period):
+        for account in accounts or [None]:
+            for instrument in instruments or [None]:
+                parts = [label] + [name for name in (account, instrument) if name]
+                title = f"{period_start} to {period_end}"
+                if len(parts) > 1:
+                    title += " - " + ", ".join(parts[1:])
+
+                jobs.append({
+                    'name': '_'.join(file_name_part(part) for part in parts),
+                    'title': title,
+                    'filters': {
+                        'start_date': period_start,
+                        'end_date': period_end,
+                        'account': account,
+                        'instrument': instrument
+                    }
+                })
+
+    return jobs
+
+def chart_figures(trades):
+    """An Agg figure for each Statistics chart, drawn with the tab's chart definitions"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from src.utils.charts import CHART_DEFINITIONS, ChartRenderer
+
+    figures = []
+    for definition in CHART_DEFINITIONS:
+        figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI, layout='tight')
+        FigureCanvasAgg(figure)
+        renderer = ChartRenderer(figure, definition)
+        renderer.axes.set_title(definition['title'])
+        renderer.update(trades)
+        figures.append((definition, figure))
+
+    return figures
+
+def summary_figure(title, stats, weekday_stats):
+    """PDF cover page listing the metrics and the weekday statistics"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=SUMMARY_PAGE_SIZE)
+    FigureCanvasAgg(figure)
+    figure.text(0.08, 0.95, "Trading Performance", fontsize=16, weight='bold')
+    figure.text(0.08, 0.925, title, fontsize=10)
+
+    lines = [f"{label + ':':<38}{format_metric(getattr(stats, key), kind):>14}" for key, label, kind in REPORT_METRICS]
+    lines += ["", f"{'':<8}{'% Win':>10}{'Average P&L':>16}{'Total P&L (net)':>18}"]
+    for name, day_stats in zip(WEEKDAY_NAMES, weekday_stats):
+        if day_stats is None:
+            lines.append(f"{name:<8}{'-':>10}{'-':>16}{'-':>18}")
+        else:
+            lines.append(
+                f"{name:<8}{day_stats.win_rate:>9.1f}%{day_stats.avg_pnl:>16.2f}{day_stats.total_pnl:>18.2f}"
+            )
+
+    figure.text(0.08, 0.89, "\n".join(lines), fontsize=9, family='monospace', va='top', linespacing=1.6)
+    return figure
+
+def report_data(stats, weekday_stats, job):
+    """JSON-ready statistics for a report"""
+    return {
+        'title': job['title'],
+        'filters': {key: value for key, value in job['filters'].items() if value},
+        'statistics': stats.as_dict(),
+        'weekdays': weekday_table(weekday_stats)
+    }
+
+def render_report(db_path, job, output_dir, formats=REPORT_FORMATS):
+    """Write one job's report files and return their paths (none when no trades match)
+
+    Runs in a worker process, so it opens its own read-only connection.
+    """
+    db_manager = DatabaseManager(db_path, read_only=True)
+    try:
+        results = load_statistics_results(db_manager, job['filters'])
+    finally:
+        db_manager.close()
+
+    stats = results.stats
+    if not stats.total_trades:
+        return []
+
+    base_path = os.path.join(output_dir, job['name'])
+    paths = []
+
+    if 'json' in formats:
+        path = f"{base_path}.json"
+        with open(path, 'w') as file:
+            json.dump(report_data(stats, results.weekday_stats, job), file, indent=2)
+        paths.append(path)
+
+    if 'png' not in formats and 'pdf' not in formats:
+        return paths
+
+    figures = chart_figures(results.trades)
+
+    if 'png' in formats:
+        for definition, figure in figures:
+            path = f"{base_path}_{definition['name']}.png"
+            figure.savefig(path, dpi=PNG_DPI)
+            paths.append(path)
+
+    if 'pdf' in formats:
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        path = f"{base_path}.pdf"
+        with PdfPages(path) as pdf:
+            pdf.savefig(summary_figure(job['title'], stats, results.weekday_stats))
+            for _, figure in figures:
+                pdf.savefig(figure)
+        paths.append(path)
+
+    return paths
+
+def generate_reports(db_path, output_dir, jobs, formats=REPORT_FORMATS, max_workers=None, progress_callback=None):
+    """Render report jobs across worker processes
+
+    Returns (job name, success, paths or error message) for each job, in job
+    order. progress_callback(finished, total) is called as jobs complete.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    db_path = os.path.abspath(db_path)
+
+    # Fresh interpreters rather than forks, so it is safe to start from a process with GUI or database threads
+    context = multiprocessing.get_context('spawn')
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(render_report, db_path, job, output_dir, formats): job['name']
+            for job in jobs
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = (name, True, future.result())
+            except Exception as e:
+                results[name] = (name, False, f"Error generating report {name}: {str(e)}")
+
+            if progress_callback:
+                progress_callback(len(results), len(jobs))
+
+    return [results[job['name']] for job in jobs]
+
+def main(argv=None):
+    """Generate reports from the command line"""
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Write performance reports (PNG, PDF and JSON) without a display")
+    parser.add_argument('--db', default="trading_journal.db", help="Database file (default: %(default)s)")
+    parser.add_argument('--output', default="reports", help="Directory to write the reports to (default: %(default)s)")
+    parser.add_argument('--start', default=str(today - timedelta(days=27)), help="First date, YYYY-MM-DD (default: 4 weeks ago)")
+    parser.add_argument('--end', default=str(today), help="Last date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--period', choices=REPORT_PERIODS, default='week', help="One report per period (default: %(default)s)")
+    parser.add_argument('--by-account', action='store_true', help="Separate reports for each account")
+    parser.add_argument('--by-instrument', action='store_true', help="Separate reports for each instrument")
+    parser.add_argument('--format', action='append', choices=REPORT_FORMATS, dest='formats', help="Output format; repeat for several (default: all)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    # Reports only read the database, so it must exist and be set up already
+    db_manager = open_database(args.db)
+    if db_manager is None:
+        return 1
+
+    try:
+        accounts = db_manager.get_accounts() if args.by_account else None
+        instruments = [name for name, _ in db_manager.get_instruments()] if args.by_instrument else None
+    finally:
+        db_manager.close()
+
+    try:
+        jobs = build_report_jobs(args.start, args.end, args.period, accounts, instruments)
+    except ValueError as e:
+        print_error(f"Error: {str(e)}")
+        return 1
+
+    results = generate_reports(args.db, args.output, jobs, args.formats or REPORT_FORMATS, args.workers)
+
+    failed = 0
+    for name, success, detail in results:
+        if not success:
+            failed += 1
+            print_error(detail)
+        elif detail:
+            print(f"{name}: {len(detail)} files")
+
+    written = sum(len(detail) for _, success, detail in results if success)
+    print(f"Wrote {written} files for {len(jobs)} reports to {args.output}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+
+# Number of filter combinations whose statistics are kept
+DEFAULT_MAX_ENTRIES = 8
+
+def normalize_filters(filters):
+    """Hashable key for a filter dict, ignoring unset filters"""
+    return tuple(sorted(
+        (key, value) for key, value in (filters or {}).items()
+        if value is not None and value != ''
+    ))
+
+class StatisticsCache:
+    """LRU cache of statistics results keyed by the filters they were computed for"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (filters, results)
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation so results computed before it are not stored
+        self.version = 0
+        # Changes are reported from whichever thread wrote to the database
+        self.lock = threading.Lock()
+
+    def get(self, filters):
+        """Return cached results for these filters, or None"""
+        key = normalize_filters(filters)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, filters, results, version=None):
+        """Store results, unless the data changed since version was read"""
+        key = normalize_filters(filters)
+
+        with self.lock:
+            if version is not None and version != self.version:
+                return False
+
+            self.entries[key] = (dict(filters), results)
+            self.entries.move_to_end(key)
+
+            # Evict the least recently used entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+            return True
+
+    def invalidate(self, instruments=None, start_date=None, end_date=None, entry_strategies=None):
+        """Drop every entry whose filters could include the changed trades
+
+        Each argument narrows what changed; leaving one as None means any value.
+        """
+        with self.lock:
+            self.version += 1
+
+            for key, (filters, _) in list(self.entries.items()):
+                if self.filters_may_include(filters, instruments, start_date, end_date, entry_strategies):
+                    del self.entries[key]
+
+    def filters_may_include(self, filters, instruments, start_date, end_date, entry_strategies):
+        """True unless the filters provably exclude every changed trade"""
+        if instruments is not None and filters.get('instrument') and filters['instrument'] not in instruments:
+            return False
+
+        if entry_strategies is not None and filters.get('entry_strategy') and filters['entry_strategy'] not in entry_strategies:
+            return False
+
+        if end_date and filters.get('start_date') and filters['start_date'] > end_date:
+            return False
+
+        if start_date and filters.get('end_date') and filters['end_date'] < start_date:
+            return False
+
+        return True
+
+    def handle_change(self, change):
+        """DatabaseManager change listener"""
+        self.invalidate(**change)
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+    def counters(self):
+        """Hit/miss counters and current size"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from dateutil import tz
+
+# numpy and pandas are imported inside local_timestamps, so they are only loaded when trades are converted
+
+# Settings key holding the timezone the imported (broker local) times are in
+TIMEZONE_SETTING = 'timezone'
+
+# Setting value meaning the computer's own timezone
+LOCAL_TIMEZONE = 'Local'
+
+# Offered in the timezone selector; any IANA name is accepted
+COMMON_TIMEZONES = [
+    LOCAL_TIMEZONE,
+    'UTC',
+    'America/New_York',
+    'America/Chicago',
+    'America/Denver',
+    'America/Los_Angeles',
+    'Europe/London',
+    'Europe/Berlin',
+    'Asia/Tokyo',
+    'Australia/Sydney'
+]
+
+SECONDS_PER_DAY = 86400
+
+def get_timezone(name):
+    """tzinfo for a timezone setting value, raising ValueError for unknown names"""
+    if not name or name == LOCAL_TIMEZONE:
+        return tz.tzlocal()
+
+    timezone = tz.gettz(name)
+    if timezone is None:
+        raise ValueError(f"Unknown timezone: {name}")
+    return timezone
+
+def local_timestamps(dates, times, timezone):
+    """UTC epoch seconds and UTC offsets (seconds) for local YYYY-MM-DD / HH:MM:SS strings
+
+    Both lists hold None where the date or time can't be parsed. Times that
+    fall in a daylight saving gap move forward to the end of the gap, and
+    repeated times are read as their first (daylight saving) occurrence.
+    """
+    import numpy as np
+    import pandas as pd
+    if not len(dates):
+        return [], []
+
+    text = pd.Series(dates, dtype=object).str.cat(pd.Series(times, dtype=object), sep=' ')
+    local = pd.to_datetime(text, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+
+    aware = local.dt.tz_localize(
+        timezone, ambiguous=np.ones(len(local), dtype=bool), nonexistent='shift_forward'
+    )
+    utc = aware.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    epoch = pd.Timestamp(0)
+    one_second = pd.Timedelta(seconds=1)
+    timestamps = (utc - epoch) // one_second
+    offsets = (local - epoch) // one_second - timestamps
+
+    missing = local.isna().to_numpy()
+    return as_optional_ints(timestamps, missing), as_optional_ints(offsets, missing)
+
+def as_optional_ints(values, missing):
+    """Python ints, with None where missing is set"""
+    values = values.to_numpy(dtype=float, na_value=0).astype('int64').tolist()
+    return [None if gap else value for value, gap in zip(values, missing)]
+
+def day_start_timestamp(date, timezone, days=0):
+    """UTC epoch seconds of local midnight on a YYYY-MM-DD date, moved by days"""
+    day = datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)
+    return int(day.replace(tzinfo=timezone).timestamp())
+
+def time_of_day_seconds(time):
+    """Seconds since midnight for an HH:MM:SS (or HH:MM) string"""
+    parts = [int(part) for part in time.split(':')]
+    hours, minutes, seconds = (parts + [0, 0])[:3]
+    return hours * 3600 + minutes * 60 + seconds
+
+def format_duration(seconds):
+    """Format a duration in seconds, e.g. 1h 05m 12s"""
+    seconds = int(round(seconds or 0))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    if hours:
+        return f"{hours}h {minutes:02d}m {seconds:02d}s"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
@@ -0,0 +1,116 @@
+from collections import deque
+
+# Supported ways of choosing which open lot an opposite execution closes
+MATCHING_METHODS = ['FIFO', 'LIFO']
+
+# Settings key holding the matching method round trips were built with
+MATCHING_METHOD_SETTING = 'matching_method'
+
+DEFAULT_MATCHING_METHOD = 'FIFO'
+
+def execution_side(action):
+    """+1 for buys, -1 for sells"""
+    return 1 if 'buy' in (action or '').lower() else -1
+
+def seconds_between(start_ts, end_ts):
+    """Seconds from one UTC epoch timestamp to another, or None if either is unknown"""
+    if start_ts is None or end_ts is None:
+        return None
+    return end_ts - start_ts
+
+class TradeMatcher:
+    """Pairs the executions of one instrument into round trips"""
+
+    def __init__(self, method=DEFAULT_MATCHING_METHOD):
+        if method not in MATCHING_METHODS:
+            raise ValueError(f"Unknown matching method: {method}")
+
+        self.method = method
+        # Open lots, oldest first; all lots share the side of the current position
+        self.open_lots = deque()
+
+    def open_lot(self, execution, quantity):
+        """Add an open lot for part or all of an execution"""
+        quantity_filled = execution['quantity'] or 0
+        commission = execution.get('commission') or 0.0
+
+        self.open_lots.append({
+            'trade_id': execution['id'],
+            'date': execution['date'],
+            'time': execution['time'],
+            'timestamp': execution.get('entry_ts'),
+            'side': execution_side(execution['action']),
+            'quantity': quantity,
+            'price': execution['price'],
+            'commission_per_unit': commission / quantity_filled if quantity_filled else 0.0
+        })
+
+    def add_execution(self, execution):
+        """Process the next execution in time order and return the round trips it closes"""
+        side = execution_side(execution['action'])
+        remaining = execution['quantity'] or 0
+        commission = execution.get('commission') or 0.0
+        exit_commission_per_unit = commission / remaining if remaining else 0.0
+        exit_timestamp = execution.get('entry_ts')
+
+        round_trips = []
+        while remaining > 0 and self.open_lots and self.open_lots[0]['side'] != side:
+            lot = self.open_lots[0] if self.method == 'FIFO' else self.open_lots[-1]
+            quantity = min(remaining, lot['quantity'])
+
+            round_trips.append({
+                'entry_trade_id': lot['trade_id'],
+                'exit_trade_id': execution['id'],
+                'direction': 'Long' if lot['side'] > 0 else 'Short',
+                'quantity': quantity,
+                'entry_date': lot['date'],
+                'entry_time': lot['time'],
+                'exit_date': execution['date'],
+                'exit_time': execution['time'],
+                'entry_price': lot['price'],
+                'exit_price': execution['price'],
+                # Price move in the position's favour, before the instrument multiplier
+                'points': (execution['price'] - lot['price']) * quantity * lot['side'],
+                'commission': (lot['commission_per_unit'] + exit_commission_per_unit) * quantity,
+                'profit': None,
+                'hold_seconds': seconds_between(lot['timestamp'], exit_timestamp)
+            })
+
+            lot['quantity'] -= quantity
+            remaining -= quantity
+            if lot['quantity'] <= 0:
+                if self.method == 'FIFO':
+                    self.open_lots.popleft()
+                else:
+                    self.open_lots.pop()
+
+        # Whatever was not closed opens (or adds to) a position
+        if remaining > 0:
+            self.open_lot(execution, remaining)
+
+        return round_trips
+
+def closed_round_trip(execution):
+    """Round trip for an execution that carries its own exit (a NinjaTrader grid row)"""
+    side = execution_side(execution['action'])
+    quantity = execution['quantity'] or 0
+    # Without an exit price the broker profit (if any) still gives the P&L
+    exit_price = execution['exit_price'] if execution['exit_price'] is not None else execution['price']
+
+    return {
+        'entry_trade_id': execution['id'],
+        'exit_trade_id': execution['id'],
+        'direction': 'Long' if side > 0 else 'Short',
+        'quantity': quantity,
+        'entry_date': execution['date'],
+        'entry_time': execution['time'],
+        'exit_date': execution['exit_date'],
+        'exit_time': execution['exit_time'],
+        'entry_price': execution['price'],
+        'exit_price': exit_price,
+        'points': (exit_price - execution['price']) * quantity * side,
+        'commission': execution.get('commission') or 0.0,
+        # Broker reported gross profit, used instead of points * multiplier when present
+        'profit': execution.get('profit'),
+        'hold_seconds': seconds_between(execution.get('entry_ts'), execution.get('exit_ts'))
+    }
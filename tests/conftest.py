@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+
+from benchmarks.synthetic_data import write_grid_csv
+from src.database.db_manager import DatabaseManager
+from src.utils.init_data import init_default_instruments
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a new database file"""
+    return str(tmp_path / "trading_journal.db")
+
+@pytest.fixture
+def db_manager(db_path):
+    """Set up, empty database"""
+    manager = DatabaseManager(db_path)
+    manager.setup_database()
+    init_default_instruments(manager)
+    yield manager
+    manager.close()
+
+@pytest.fixture
+def grid_path(tmp_path):
+    """Small synthetic NinjaTrader grid export"""
+    return write_grid_csv(str(tmp_path / "grid.csv"), 2000)
+
+@pytest.fixture
+def imported_db(db_manager, grid_path):
+    """Database holding the small synthetic grid"""
+    success, message = db_manager.import_trades(grid_path)
+    assert success, message
+    return db_manager
+
+@pytest.fixture(scope='session')
+def qt_app():
+    """QApplication on the offscreen platform, so widget tests need no display"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def wait_until(qt_app):
+    """wait_until(condition, timeout): run the Qt event loop until condition() is true, False on timeout"""
+    def wait(condition, timeout=30):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            qt_app.processEvents()
+            time.sleep(0.001)
+        return True
+    return wait
+
+@pytest.fixture
+def main_window(qt_app, db_manager, monkeypatch):
+    """MainWindow whose message boxes are recorded instead of shown"""
+    import src.ui.main_window as main_window_module
+
+    messages = []
+    monkeypatch.setattr(
+        main_window_module, 'show_message',
+        lambda parent, title, message, icon=None: messages.append((title, message))
+    )
+
+    window = main_window_module.MainWindow(db_manager)
+    window.messages = messages
+    window.show()
+    yield window
+    window.close()
@@ -0,0 +1,72 @@
+import pytest
+
+from benchmarks.synthetic_data import grid_csv
+
+# Imports run through MainWindow.start_import on the ImportWorker, with a
+# QTimer probe checking the GUI event loop keeps running throughout.
+
+PROBE_INTERVAL_MS = 10
+
+# Longest acceptable pause between probe ticks; a blocking import stalls for seconds
+MAX_GAP_MS = 250
+
+class EventLoopProbe:
+    """Records the gaps between ticks of a QTimer"""
+
+    def __init__(self):
+        from PyQt6.QtCore import QTimer, QElapsedTimer
+
+        self.clock = QElapsedTimer()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.gaps = []
+
+    def tick(self):
+        now = self.clock.elapsed()
+        self.gaps.append(now - self.last_tick)
+        self.last_tick = now
+
+    def start(self):
+        self.clock.start()
+        self.last_tick = self.clock.elapsed()
+        self.timer.start(PROBE_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+        return max(self.gaps, default=0)
+
+def import_with_probe(window, wait_until, csv_path, timeout):
+    """Import through the worker; returns the longest event loop gap in ms"""
+    probe = EventLoopProbe()
+    probe.start()
+    window.start_import(csv_path)
+    assert wait_until(lambda: window.import_worker is None and window.messages, timeout)
+    return probe.stop()
+
+@pytest.mark.parametrize('rows', [
+    20000,
+    pytest.param(1000000, marks=pytest.mark.slow)
+])
+def test_import_keeps_event_loop_responsive(main_window, wait_until, db_manager, rows):
+    max_gap = import_with_probe(main_window, wait_until, grid_csv(rows), timeout=900)
+
+    title, message = main_window.messages[-1]
+    assert title == "Import Successful", message
+    assert db_manager.count_trades() == rows
+    assert max_gap < MAX_GAP_MS
+
+def test_cancelled_import_saves_nothing(main_window, wait_until, db_manager):
+    from PyQt6.QtWidgets import QPushButton
+
+    # Press the progress dialog's Cancel button once the first chunk has been read
+    def cancel_after_first_chunk(rows_parsed, rows_inserted, total_rows):
+        if rows_parsed and main_window.import_progress and not main_window.import_progress.wasCanceled():
+            main_window.import_progress.findChild(QPushButton).click()
+
+    main_window.start_import(grid_csv(100000))
+    main_window.import_worker.signals.progress.connect(cancel_after_first_chunk)
+    assert wait_until(lambda: main_window.import_worker is None and main_window.messages, timeout=300)
+
+    title, message = main_window.messages[-1]
+    assert title == "Import Cancelled", message
+    assert db_manager.count_trades() == 0
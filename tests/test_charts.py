@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.utils.charts import CHART_DEFINITIONS, RASTERIZE_THRESHOLD, ChartRenderer, minmax_decimate
+
+# ChartRenderer on an Agg figure: lines are decimated to the axes' width,
+# the scatter keeps every trade.
+
+def chart_definition(name):
+    return next(definition for definition in CHART_DEFINITIONS if definition['name'] == name)
+
+def render(name, trades, width=4):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(width, 3), dpi=100)
+    FigureCanvasAgg(figure)
+    renderer = ChartRenderer(figure, chart_definition(name))
+    renderer.update(trades)
+    figure.canvas.draw()
+    return renderer
+
+def synthetic_trades(count):
+    rng = np.random.default_rng(7)
+    pnl = rng.normal(0, 50, count)
+    # An outlier in the middle of the range, lost by any bucket that drops it
+    pnl[count // 2] = 10000
+    return {'pnl': pnl, 'mfe': np.abs(pnl), 'mae': -np.abs(pnl)}
+
+def plotted_points(renderer):
+    return sorted(
+        (float(x), float(y))
+        for artist in renderer.artists
+        for x, y in zip(*artist.get_data())
+    )
+
+@pytest.mark.parametrize('count', [10, 1000, 100000])
+def test_scatter_keeps_every_trade(count):
+    trades = synthetic_trades(count)
+    renderer = render('scatter', trades)
+
+    expected = sorted(zip(np.arange(1, count + 1).astype(float), trades['pnl'].astype(float)))
+    assert plotted_points(renderer) == expected
+
+    wins, losses = renderer.artists
+    assert (wins.get_ydata() > 0).all()
+    assert (losses.get_ydata() <= 0).all()
+    assert all(artist.get_rasterized() == (count > RASTERIZE_THRESHOLD) for artist in renderer.artists)
+
+def test_scatter_is_not_redrawn_for_a_new_width():
+    renderer = render('scatter', synthetic_trades(100000))
+    renderer.figure.set_size_inches(8, 3)
+    assert renderer.is_decimated_for_size()
+
+def test_line_is_decimated_to_the_axes_width():
+    count = 100000
+    renderer = render('mfe', synthetic_trades(count))
+
+    line, = renderer.artists
+    x, y = line.get_data()
+    assert len(x) <= renderer.max_points() + 2
+    assert x[0] == 1 and x[-1] == count
+    assert y.max() == 10000
+    assert renderer.is_decimated_for_size()
+
+    renderer.figure.set_size_inches(8, 3)
+    assert not renderer.is_decimated_for_size()
+
+def test_minmax_decimate_keeps_spikes_in_order():
+    y = np.zeros(10000)
+    y[1234] = 5
+    y[8765] = -5
+    x = np.arange(len(y))
+
+    decimated_x, decimated_y = minmax_decimate(x, y, 100)
+
+    assert len(decimated_x) <= 102
+    assert (np.diff(decimated_x) > 0).all()
+    assert {1234, 8765} <= set(decimated_x.tolist())
+
+def test_empty_chart_shows_message():
+    renderer = render('scatter', {'pnl': np.array([]), 'mfe': np.array([]), 'mae': np.array([])})
+
+    assert renderer.empty_text.get_visible()
+    assert not any(artist.get_visible() for artist in renderer.artists)
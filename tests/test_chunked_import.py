@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.synthetic_data import grid_frame
+
+# Streamed imports, where each chunk is mapped on its own: a chunk can have a
+# column the earlier chunks had values in left entirely empty.
+
+CHUNK_SIZE = 4
+
+@pytest.fixture
+def open_trades_csv(tmp_path):
+    """Grid export whose second chunk has only open trades (no exit time, price or profit)"""
+    frame = grid_frame(2 * CHUNK_SIZE)
+    for column in ['Exit time', 'Exit price', 'Profit']:
+        frame.loc[CHUNK_SIZE:, column] = None
+    path = tmp_path / "open_trades.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+def test_whole_file_import(db_manager, open_trades_csv):
+    success, message = db_manager.import_trades(open_trades_csv)
+
+    assert success, message
+    assert db_manager.count_trades() == 2 * CHUNK_SIZE
+
+def test_chunked_import_with_empty_exit_chunk(db_manager, open_trades_csv):
+    success, message = db_manager.import_trades(open_trades_csv, chunksize=CHUNK_SIZE)
+
+    assert success, message
+    assert db_manager.count_trades() == 2 * CHUNK_SIZE
+
+def test_cancellable_import_with_empty_exit_chunk(db_manager, open_trades_csv):
+    success, message = db_manager.import_trades_cancellable(open_trades_csv, chunksize=CHUNK_SIZE)
+
+    assert success, message
+    assert db_manager.count_trades() == 2 * CHUNK_SIZE
+
+    # The open trades were stored without exits
+    trades = db_manager.get_trades()
+    assert sum(trade['exit_time'] is None for trade in trades) == CHUNK_SIZE
@@ -0,0 +1,92 @@
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+from src.cli import main
+
+# python -m src trades|stats, called through main() with the output captured.
+
+BASELINE_DB = "trading_journal.db"
+
+def run(capsys, *argv):
+    """(exit code, stdout, stderr) of one command"""
+    code = main(list(argv))
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+@pytest.fixture
+def cli_db(imported_db, db_path):
+    """Path of the imported synthetic grid, closed so the CLI opens it itself"""
+    imported_db.close()
+    return db_path
+
+@pytest.fixture
+def unmigrated_db(tmp_path):
+    """Copy of the shipped database, which predates the round trip tables"""
+    path = str(tmp_path / "unmigrated.db")
+    shutil.copy(BASELINE_DB, path)
+    return path
+
+def trade_ids(output):
+    return [trade['id'] for trade in json.loads(output)]
+
+@pytest.mark.parametrize('command', ['trades', 'stats'])
+def test_unmigrated_database_fails_on_stderr(capsys, unmigrated_db, command):
+    code, out, err = run(capsys, '--db', unmigrated_db, command, '--format', 'json')
+
+    assert code == 1
+    assert out == ""
+    assert "has not been set up or upgraded" in err
+
+@pytest.mark.parametrize('command', ['trades', 'stats'])
+def test_unreadable_database_fails_on_stderr(capsys, tmp_path, command):
+    path = tmp_path / "not_a_database.db"
+    path.write_text("date,time\n" * 100)
+
+    code, out, err = run(capsys, '--db', str(path), command)
+
+    assert code == 1
+    assert out == ""
+    assert err.startswith("Error: cannot read database")
+
+def test_missing_database_fails_on_stderr(capsys, tmp_path):
+    code, out, err = run(capsys, '--db', str(tmp_path / "missing.db"), 'stats')
+
+    assert code == 1
+    assert out == ""
+    assert "not found" in err
+
+def test_stats_of_migrated_database(capsys, cli_db):
+    code, out, err = run(capsys, '--db', cli_db, 'stats')
+
+    assert code == 0, err
+    assert json.loads(out)['statistics']['total_trades'] > 0
+
+def test_unmigrated_database_is_left_unchanged(capsys, unmigrated_db):
+    run(capsys, '--db', unmigrated_db, 'trades')
+
+    connection = sqlite3.connect(unmigrated_db)
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        connection.close()
+    assert 'round_trips' not in tables
+
+def test_offset_without_limit_skips_trades(capsys, cli_db):
+    code, out, err = run(capsys, '--db', cli_db, 'trades', '--format', 'json')
+    assert code == 0, err
+    every_id = trade_ids(out)
+
+    code, out, err = run(capsys, '--db', cli_db, 'trades', '--format', 'json', '--offset', '1990')
+    assert code == 0, err
+    assert trade_ids(out) == every_id[1990:]
+
+def test_offset_with_limit_pages_trades(capsys, cli_db):
+    code, out, err = run(capsys, '--db', cli_db, 'trades', '--format', 'json')
+    every_id = trade_ids(out)
+
+    code, out, err = run(capsys, '--db', cli_db, 'trades', '--format', 'json', '--limit', '5', '--offset', '10')
+    assert code == 0, err
+    assert trade_ids(out) == every_id[10:15]
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.synthetic_data import write_grid_csv, INSTRUMENTS
+
+# ConnectionPool under the load the application puts on it: an import on a
+# background thread, filtered readers on others and small writes from the
+# GUI thread, all through one DatabaseManager.
+
+READER_COUNT = 3
+
+def instrument_filters(instrument):
+    return {'instrument': instrument, 'start_date': '2025-01-01', 'end_date': '2025-12-31'}
+
+def instrument_counts(db_manager):
+    return {instrument: db_manager.count_trades(instrument_filters(instrument)) for instrument in INSTRUMENTS}
+
+class FilteredReaders:
+    """Threads running the Fields & Data and Statistics queries for one instrument each until stopped"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.stopped = threading.Event()
+        self.errors = []
+        # (instrument, trades matching, page length, round trips) for every read
+        self.observed = []
+        self.threads = [
+            threading.Thread(target=self.read, args=(INSTRUMENTS[index % len(INSTRUMENTS)],))
+            for index in range(READER_COUNT)
+        ]
+
+    def read(self, instrument):
+        filters = instrument_filters(instrument)
+        try:
+            while not self.stopped.is_set():
+                count = self.db_manager.count_trades(filters)
+                page = self.db_manager.get_trades(filters, limit=200)
+                round_trips = self.db_manager.get_round_trip_columns(filters)
+                self.observed.append((instrument, count, len(page), len(round_trips['pnl'])))
+        except Exception as e:
+            self.errors.append(e)
+
+    def wait_for_reads(self, count):
+        """Block until count more reads have finished"""
+        target = len(self.observed) + count
+        while len(self.observed) < target and not self.errors:
+            time.sleep(0.005)
+
+    def __enter__(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+
+def test_import_thread_with_concurrent_filtered_readers(imported_db, tmp_path):
+    csv_path = write_grid_csv(str(tmp_path / "more.csv"), 20000, seed=1)
+    before = instrument_counts(imported_db)
+
+    results = []
+    importing = threading.Thread(
+        target=lambda: results.append(imported_db.import_trades_cancellable(csv_path, chunksize=2000))
+    )
+
+    with FilteredReaders(imported_db) as readers:
+        importing.start()
+        # The GUI thread keeps saving debriefs while the import holds the writer
+        while importing.is_alive():
+            success, message = imported_db.save_daily_debrief('2025-01-02', "notes", "", "", "", "")
+            assert success, message
+        importing.join()
+        # Let every reader query the committed import too
+        readers.wait_for_reads(2 * READER_COUNT)
+
+    success, message = results[0]
+    assert success, message
+    after = instrument_counts(imported_db)
+    assert sum(after.values()) == sum(before.values()) + 20000
+
+    assert not readers.errors
+    assert readers.observed
+    for instrument, count, page_length, round_trip_count in readers.observed:
+        # The import is one transaction, so readers see all of it or none of it
+        assert count in (before[instrument], after[instrument])
+        assert round_trip_count in (before[instrument], after[instrument])
+        assert page_length == min(count, 200)
+
+    seen_counts = {count for instrument, count, _, _ in readers.observed}
+    assert seen_counts & set(before.values()) and seen_counts & set(after.values())
+
+def test_cancelled_import_is_never_seen_by_readers(imported_db, tmp_path):
+    csv_path = write_grid_csv(str(tmp_path / "more.csv"), 20000, seed=1)
+    before = instrument_counts(imported_db)
+
+    rollbacks = []
+    imported_db.pool.add_rollback_listener(lambda: rollbacks.append(True))
+
+    cancelled = threading.Event()
+
+    def cancel_halfway(rows_parsed, rows_inserted):
+        if rows_inserted >= 10000:
+            cancelled.set()
+
+    with FilteredReaders(imported_db) as readers:
+        success, message = imported_db.import_trades_cancellable(
+            csv_path, chunksize=2000, progress_callback=cancel_halfway, cancelled=cancelled
+        )
+
+    assert not success, message
+    assert rollbacks
+    assert instrument_counts(imported_db) == before
+
+    assert not readers.errors
+    assert readers.observed
+    for instrument, count, _, round_trip_count in readers.observed:
+        assert count == before[instrument]
+        assert round_trip_count == before[instrument]
+
+def test_failed_write_block_rolls_back_for_every_thread(imported_db):
+    before = imported_db.count_trades()
+
+    with pytest.raises(RuntimeError):
+        with imported_db.pool.writer() as cursor:
+            cursor.execute("DELETE FROM trades")
+            # Reads inside the block see the pending delete
+            assert imported_db.count_trades() == 0
+            raise RuntimeError("fail the write")
+
+    counts = []
+    reader = threading.Thread(target=lambda: counts.append(imported_db.count_trades()))
+    reader.start()
+    reader.join()
+
+    assert imported_db.count_trades() == before
+    assert counts == [before]
@@ -0,0 +1,46 @@
+import shutil
+from pathlib import Path
+
+from src.database.db_manager import DatabaseManager
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The database shipped with the first release: no accounts, exits or fingerprints
+BASELINE_DB = REPO_ROOT / "trading_journal.db"
+
+GRID_EXPORT = REPO_ROOT / "Requirements" / "NinjaTrader Grid 2025-03-16 05-29 PM.csv"
+
+def inserted_count(result):
+    success, message = result
+    assert success, message
+    return int(message.split("imported ")[1].split(" ")[0])
+
+def test_reimport_into_migrated_baseline_inserts_nothing(tmp_path):
+    db_path = tmp_path / "trading_journal.db"
+    shutil.copy(BASELINE_DB, db_path)
+
+    db_manager = DatabaseManager(str(db_path))
+    try:
+        db_manager.setup_database()
+        before = db_manager.count_trades()
+
+        assert inserted_count(db_manager.import_trades(str(GRID_EXPORT))) == 0
+        assert inserted_count(db_manager.import_trades(str(GRID_EXPORT))) == 0
+        assert db_manager.count_trades() == before
+
+        # The legacy trade was completed from the export and kept its journal fields
+        with db_manager.pool.reader() as cursor:
+            cursor.execute("SELECT account, exit_time, profit, entry_strategy FROM trades WHERE id = 1")
+            assert cursor.fetchone() == ('Sim102', '17:00:06', 175.0, 'p-VWAP')
+
+            cursor.execute("SELECT COUNT(*) FROM round_trips WHERE entry_trade_id = 1 AND exit_trade_id = 1")
+            assert cursor.fetchone()[0] == 1
+    finally:
+        db_manager.close()
+
+def test_reimport_is_a_no_op(imported_db, grid_path):
+    before = imported_db.count_trades()
+
+    assert inserted_count(imported_db.import_trades(grid_path)) == 0
+    assert inserted_count(imported_db.import_trades_cancellable(grid_path, chunksize=500)) == 0
+    assert imported_db.count_trades() == before
@@ -0,0 +1,61 @@
+import pytest
+
+from src.database.db_manager import DatabaseManager
+
+EXECUTIONS = """Instrument,Action,Quantity,Price,Date/Time
+NQ MAR25,Buy,1,100,3/3/2025 9:30:00 AM
+NQ MAR25,Buy,1,110,3/3/2025 9:31:00 AM
+NQ MAR25,Sell,1,120,3/3/2025 9:32:00 AM
+"""
+
+MORE_EXECUTIONS = """Instrument,Action,Quantity,Price,Date/Time
+NQ MAR25,Sell,1,130,3/3/2025 9:33:00 AM
+NQ MAR25,Buy,1,90,3/3/2025 9:34:00 AM
+NQ MAR25,Buy,1,95,3/3/2025 9:35:00 AM
+NQ MAR25,Sell,1,99,3/3/2025 9:36:00 AM
+"""
+
+def write_csv(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def entry_prices(db_manager):
+    """Entry price of each round trip, in exit order"""
+    with db_manager.pool.reader() as cursor:
+        cursor.execute("SELECT entry_price FROM round_trips ORDER BY exit_time, entry_time")
+        return [row[0] for row in cursor.fetchall()]
+
+def test_rebuild_method_is_kept_for_later_runs(db_manager, db_path, tmp_path):
+    success, message = db_manager.import_trades(write_csv(tmp_path, "first.csv", EXECUTIONS))
+    assert success, message
+    assert entry_prices(db_manager) == [100]
+
+    db_manager.rebuild_round_trips('LIFO')
+    assert entry_prices(db_manager) == [110]
+    db_manager.close()
+
+    # A new manager, as after a restart or from the command line, appends with LIFO too
+    reopened = DatabaseManager(db_path)
+    try:
+        assert reopened.get_matching_method() == 'LIFO'
+        success, message = reopened.import_trades(write_csv(tmp_path, "second.csv", MORE_EXECUTIONS))
+        assert success, message
+        assert entry_prices(reopened) == [110, 100, 95]
+
+        reopened.rebuild_round_trips()
+        assert entry_prices(reopened) == [110, 100, 95]
+    finally:
+        reopened.close()
+
+def test_unknown_method_is_rejected(db_manager):
+    db_manager.rebuild_round_trips('LIFO')
+
+    with pytest.raises(ValueError):
+        db_manager.rebuild_round_trips('AVERAGE')
+
+    assert db_manager.get_setting('matching_method') == 'LIFO'
+    assert db_manager.get_matching_method() == 'LIFO'
+
+def test_default_is_fifo(db_manager):
+    assert db_manager.get_matching_method() == 'FIFO'
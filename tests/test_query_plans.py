@@ -0,0 +1,89 @@
+import itertools
+
+import pytest
+
+from benchmarks.synthetic_data import write_grid_csv
+from src.database.db_manager import DatabaseManager
+from src.utils.init_data import init_default_instruments
+
+# Every combination of the filters TradeDataTab.apply_filters can emit
+FILTER_GROUPS = {
+    'dates': {'start_date': '2025-03-01', 'end_date': '2025-03-31'},
+    'times': {'start_time': '09:30:00', 'end_time': '11:00:00'},
+    'instrument': {'instrument': 'NQ MAR25'},
+    'account': {'account': 'Sim101'},
+    'action': {'action': 'Buy'},
+    'entry_strategy': {'entry_strategy': 'Breakout'},
+    'bars': {'min_bars': 2, 'max_bars': 10}
+}
+
+# Filters an index can seek on; time of day and bars ranges are checked as rows are read
+SEEKABLE_GROUPS = {'dates', 'instrument', 'account', 'action', 'entry_strategy'}
+
+# With nothing to seek on, trades are read in display order straight off this index
+ORDERED_SCAN = 'SCAN t USING INDEX idx_trades_entry_ts_id'
+
+COMBINATIONS = [
+    combination
+    for size in range(len(FILTER_GROUPS) + 1)
+    for combination in itertools.combinations(FILTER_GROUPS, size)
+]
+
+@pytest.fixture(scope='module')
+def plan_db(tmp_path_factory):
+    """Imported database shared by the plan tests, which only read it"""
+    directory = tmp_path_factory.mktemp("plans")
+    manager = DatabaseManager(str(directory / "trading_journal.db"))
+    manager.setup_database()
+    init_default_instruments(manager)
+    success, message = manager.import_trades(write_grid_csv(str(directory / "grid.csv"), 2000))
+    assert success, message
+    yield manager
+    manager.close()
+
+def combination_filters(combination):
+    filters = {}
+    for group in combination:
+        filters.update(FILTER_GROUPS[group])
+    return filters
+
+@pytest.mark.parametrize('combination', COMBINATIONS, ids=lambda combination: '+'.join(combination) or 'none')
+def test_trades_query_uses_an_index_without_sorting(plan_db, combination):
+    plan = plan_db.explain_trades_query(combination_filters(combination))
+    trades_steps = [step for step in plan if step.startswith(('SCAN t ', 'SEARCH t '))]
+
+    assert not any('TEMP B-TREE' in step for step in plan), plan
+    assert len(trades_steps) == 1, plan
+
+    if SEEKABLE_GROUPS.intersection(combination):
+        assert trades_steps[0].startswith('SEARCH t USING'), plan
+    else:
+        assert trades_steps[0] == ORDERED_SCAN, plan
+
+@pytest.mark.parametrize('combination', COMBINATIONS, ids=lambda combination: '+'.join(combination) or 'none')
+@pytest.mark.parametrize('after', [(1740000000, 500), (None, 500)], ids=['key', 'no-entry-ts-key'])
+def test_next_page_query_seeks_without_sorting(plan_db, combination, after):
+    plan = plan_db.explain_trades_query(combination_filters(combination), after)
+    trades_steps = [step for step in plan if step.startswith(('SCAN t ', 'SEARCH t '))]
+
+    assert not any('TEMP B-TREE' in step for step in plan), plan
+    assert len(trades_steps) == 1, plan
+    assert trades_steps[0].startswith('SEARCH t USING'), plan
+
+def test_instruments_and_images_are_looked_up_by_index(plan_db):
+    plan = plan_db.explain_trades_query()
+
+    assert not any(step.startswith(('SCAN i', 'SCAN ti')) for step in plan), plan
+
+@pytest.mark.parametrize('name, columns', [
+    ('idx_trades_bars_entry_ts', 'bars, entry_ts'),
+    ('idx_trades_instrument_entry_ts', 'instrument, entry_ts, entry_tod')
+])
+def test_upgrade_drops_obsolete_indexes(db_manager, name, columns):
+    with db_manager.pool.writer() as cursor:
+        cursor.execute(f"CREATE INDEX {name} ON trades({columns})")
+    db_manager.setup_database()
+
+    with db_manager.pool.reader() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+        assert cursor.fetchone() is None
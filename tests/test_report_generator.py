@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+
+from src.utils.report_generator import main
+
+# python -m src.utils.report_generator, called through main() with the output captured.
+
+BASELINE_DB = "trading_journal.db"
+
+def run(capsys, *argv):
+    """(exit code, stdout, stderr) of one run"""
+    code = main(list(argv))
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+def test_unmigrated_database_fails_on_stderr(capsys, tmp_path):
+    db_path = str(tmp_path / "unmigrated.db")
+    shutil.copy(BASELINE_DB, db_path)
+    output = tmp_path / "reports"
+
+    code, out, err = run(capsys, '--db', db_path, '--output', str(output), '--format', 'json')
+
+    assert code == 1
+    assert out == ""
+    assert "has not been set up or upgraded" in err
+    assert not output.exists()
+
+def test_missing_database_fails_on_stderr(capsys, tmp_path):
+    code, out, err = run(capsys, '--db', str(tmp_path / "missing.db"), '--output', str(tmp_path / "reports"))
+
+    assert code == 1
+    assert out == ""
+    assert "not found" in err
+
+def test_invalid_range_fails_on_stderr(capsys, imported_db, db_path, tmp_path):
+    imported_db.close()
+
+    code, out, err = run(capsys, '--db', db_path, '--output', str(tmp_path / "reports"), '--start', '2025-03-01', '--end', '2025-01-01')
+
+    assert code == 1
+    assert out == ""
+    assert err.startswith("Error:")
+
+def test_json_report_of_migrated_database(capsys, imported_db, db_path, tmp_path):
+    imported_db.close()
+    output = tmp_path / "reports"
+
+    code, out, err = run(
+        capsys, '--db', db_path, '--output', str(output), '--format', 'json',
+        '--start', '2025-01-01', '--end', '2025-12-31', '--period', 'all', '--workers', '1'
+    )
+
+    assert code == 0, err
+    assert err == ""
+    paths = [output / name for name in os.listdir(output)]
+    assert len(paths) == 1
+    assert json.loads(paths[0].read_text())['statistics']['total_trades'] > 0
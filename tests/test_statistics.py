@@ -0,0 +1,115 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from benchmarks.statistics_benchmark import round_trip_rows, legacy_trades, legacy_statistics, legacy_weekday_statistics
+from src.analytics.statistics import (
+    columns_from_rows, calculate_statistics, calculate_weekday_statistics,
+    summary_from_rows, calculate_summary_weekday_statistics
+)
+
+# Golden values: the NumPy engine must give the same figures as the old
+# per-dict calculate_extended_statistics and update_daily_statistics.
+
+def trades_on(pnls, dates=None, holds=None):
+    """Rows and entry times for round trips with the given P&L, a second apart"""
+    rows = []
+    times = []
+    for index, pnl in enumerate(pnls):
+        date = dates[index] if dates else '2025-03-03'
+        hold = holds[index] if holds else 60
+        weekday = datetime.strptime(date, '%Y-%m-%d').weekday()
+        rows.append((date, weekday, 2.48, 10.0, 20.0, 3, pnl, hold))
+        times.append(f"09:{index // 60:02d}:{index % 60:02d}")
+    return rows, times
+
+def assert_matches_legacy(rows, times):
+    trades = legacy_trades(rows, times)
+    columns = columns_from_rows(rows)
+
+    expected = legacy_statistics(trades)
+    stats = calculate_statistics(columns).as_dict()
+    assert stats.keys() == expected.keys()
+    for key, value in expected.items():
+        assert stats[key] == pytest.approx(value, rel=1e-9, abs=1e-6), key
+
+    expected_days = legacy_weekday_statistics(trades)
+    for day, day_stats in enumerate(calculate_weekday_statistics(columns)):
+        if day not in expected_days:
+            assert day_stats is None
+        else:
+            assert (day_stats.win_rate, day_stats.avg_pnl, day_stats.total_pnl) == pytest.approx(expected_days[day])
+
+    return stats
+
+EDGE_CASES = {
+    'single winner': [150.0],
+    'single loser': [-80.0],
+    'all break even': [0.0, 0.0, 0.0],
+    'all winners': [10.0, 20.0, 30.0],
+    'all losers': [-10.0, -20.0, -30.0],
+    'alternating': [10.0, -10.0, 10.0, -10.0],
+    'break even splits a streak': [10.0, 10.0, 0.0, 10.0, 10.0, 10.0],
+    'streak at the end': [-5.0, 5.0, -5.0, -5.0, -5.0, -5.0],
+    'first trade starts a streak': [5.0, 5.0, 5.0, -1.0],
+    'drawdown from the first trade': [-50.0, -25.0, 100.0, -10.0],
+    'drawdown after the peak': [100.0, 50.0, -200.0, 30.0],
+    'recovered drawdown': [-100.0, 300.0, -50.0, 400.0]
+}
+
+@pytest.mark.parametrize('pnls', EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_edge_cases_match_legacy(pnls):
+    rows, times = trades_on(pnls)
+    assert_matches_legacy(rows, times)
+
+def test_no_trades():
+    assert calculate_statistics(columns_from_rows([])).as_dict() == legacy_statistics([])
+    assert calculate_weekday_statistics(columns_from_rows([])) == (None,) * 5
+
+def test_daily_pnl_averages_over_trading_days():
+    dates = ['2025-03-03', '2025-03-03', '2025-03-03', '2025-03-05', '2025-03-07']
+    rows, times = trades_on([100.0, -40.0, 0.0, -90.0, 30.0], dates)
+
+    stats = assert_matches_legacy(rows, times)
+    assert stats['avg_daily_pnl'] == pytest.approx(0.0)
+
+def test_unknown_hold_times_are_skipped():
+    rows, times = trades_on([10.0, 20.0, -5.0, -6.0], holds=[60, None, None, None])
+
+    stats = assert_matches_legacy(rows, times)
+    assert stats['avg_hold_time_winners'] == 60
+    assert stats['avg_hold_time_losers'] == 0
+
+@pytest.mark.parametrize('size', [
+    10000,
+    pytest.param(100000, marks=pytest.mark.slow),
+    pytest.param(1000000, marks=pytest.mark.slow)
+])
+def test_synthetic_trades_match_legacy(size):
+    rows, times = round_trip_rows(size)
+    assert_matches_legacy(rows, times)
+
+def test_no_losers_gives_a_positive_zero_loss():
+    rows, times = trades_on([10.0, 0.0, 20.0])
+
+    stats = calculate_statistics(columns_from_rows(rows)).as_dict()
+
+    assert '-0.0' not in json.dumps(stats)
+
+def test_summary_weekday_statistics_match_round_trips_in_type_and_value():
+    dates = ['2025-03-03', '2025-03-03', '2025-03-04', '2025-03-07']
+    rows, _ = trades_on([100.0, -40.0, 0.0, 30.0], dates)
+    # Daily summary rows as refresh_daily_summary writes them, one per date
+    summary_rows = [
+        ('2025-03-03', 0, 2, 1, 1, 60.0, 4.96, 60.0),
+        ('2025-03-04', 1, 1, 0, 0, 0.0, 2.48, 0.0),
+        ('2025-03-07', 4, 1, 1, 0, 30.0, 2.48, 30.0)
+    ]
+
+    expected = calculate_weekday_statistics(columns_from_rows(rows))
+    from_summary = calculate_summary_weekday_statistics(summary_from_rows(summary_rows))
+
+    assert from_summary == expected
+    for day_stats in filter(None, from_summary):
+        assert all(type(value) is float for value in day_stats.as_dict().values())
@@ -0,0 +1,43 @@
+from PyQt6.QtCore import QDate
+from PyQt6.QtWidgets import QPushButton
+
+from benchmarks.synthetic_data import write_grid_csv
+from src.database.db_manager import DatabaseManager
+
+class FiltersOnly:
+    """Stands in for the Fields & Data tab: no filters besides the Statistics dates"""
+
+    def get_current_filters(self):
+        return {}
+
+def shown_trades(wait_until, tab):
+    """Total trades label once the current refresh has finished"""
+    assert wait_until(lambda: tab.current_worker is None)
+    return int(tab.total_trades_label.text())
+
+def test_refresh_button_sees_writes_from_other_processes(wait_until, imported_db, db_path, tmp_path):
+    from src.ui.statistics_tab import StatisticsTab
+
+    tab = StatisticsTab(imported_db, FiltersOnly())
+    tab.start_date_edit.setDate(QDate(2025, 1, 1))
+    tab.end_date_edit.setDate(QDate(2025, 12, 31))
+
+    tab.refresh_statistics()
+    first_count = shown_trades(wait_until, tab)
+    assert first_count > 0
+
+    # Another process imports more trades; this manager's listeners never hear of it
+    other = DatabaseManager(db_path)
+    success, message = other.import_trades(write_grid_csv(str(tmp_path / "more.csv"), 500, seed=1))
+    other.close()
+    assert success, message
+
+    # Switching back to the tab is served from the cache
+    tab.refresh_statistics()
+    assert tab.current_worker is None
+    assert shown_trades(wait_until, tab) == first_count
+
+    refresh_button = next(button for button in tab.findChildren(QPushButton) if button.text() == "Refresh")
+    refresh_button.click()
+    assert shown_trades(wait_until, tab) > first_count
+    tab.close()
@@ -0,0 +1,85 @@
+import pytest
+
+import src.ui.main_window as main_window_module
+
+def utc_offsets(db_manager):
+    with db_manager.pool.reader() as cursor:
+        cursor.execute("SELECT DISTINCT utc_offset FROM trades")
+        return {row[0] for row in cursor.fetchall()}
+
+class Answers:
+    """Replies to give to the confirmation question, and the questions asked"""
+
+    def __init__(self):
+        self.replies = []
+        self.asked = []
+
+    def __call__(self, parent, title, message):
+        self.asked.append(message)
+        return self.replies.pop(0)
+
+@pytest.fixture
+def answers(monkeypatch):
+    answers = Answers()
+    monkeypatch.setattr(main_window_module, 'ask_confirmation', answers)
+    return answers
+
+def select_timezone(window, timezone):
+    """Pick a timezone in the selector as the user would"""
+    index = window.timezone_combo.findText(timezone)
+    window.timezone_combo.setCurrentIndex(index)
+    window.timezone_combo.activated.emit(index)
+
+def test_confirmed_change_runs_in_the_background(main_window, wait_until, imported_db, answers):
+    # Start from a zone whose offsets differ from Chicago's whatever the machine's local zone is
+    success, message = imported_db.set_timezone('UTC')
+    assert success, message
+    offsets = utc_offsets(imported_db)
+    answers.replies.append(True)
+
+    select_timezone(main_window, 'America/Chicago')
+    assert main_window.timezone_worker is not None
+    assert not main_window.timezone_combo.isEnabled()
+    assert not main_window.import_button.isEnabled()
+
+    assert wait_until(lambda: main_window.timezone_worker is None)
+    assert imported_db.get_timezone_name() == 'America/Chicago'
+    assert utc_offsets(imported_db) != offsets
+    assert main_window.timezone_combo.isEnabled()
+    assert not main_window.messages
+
+def test_declined_change_keeps_the_setting(main_window, imported_db, answers):
+    timezone = imported_db.get_timezone_name()
+    answers.replies.append(False)
+
+    select_timezone(main_window, 'Europe/London')
+
+    assert answers.asked
+    assert main_window.timezone_worker is None
+    assert imported_db.get_timezone_name() == timezone
+    assert main_window.timezone_combo.currentText() == timezone
+
+def test_setting_the_text_does_not_convert(main_window, imported_db, answers):
+    timezone = imported_db.get_timezone_name()
+
+    main_window.timezone_combo.setCurrentText('Asia/Tokyo')
+
+    assert not answers.asked
+    assert main_window.timezone_worker is None
+    assert imported_db.get_timezone_name() == timezone
+
+def test_failed_rematch_keeps_the_old_timezone(imported_db, monkeypatch):
+    success, message = imported_db.set_timezone('UTC')
+    assert success, message
+    offsets = utc_offsets(imported_db)
+
+    def fail_rematch(*args, **kwargs):
+        raise RuntimeError("rematch failed")
+
+    monkeypatch.setattr(imported_db, 'update_round_trips', fail_rematch)
+    success, message = imported_db.set_timezone('America/Chicago')
+
+    assert not success
+    assert "rematch failed" in message
+    assert imported_db.get_timezone_name() == 'UTC'
+    assert utc_offsets(imported_db) == offsets
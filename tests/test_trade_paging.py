@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import src.ui.trade_table_model as trade_table_model
+
+# TradeTableModel pages trades in by seeking to the (entry_ts, id) key before
+# each page. Trades here share entry times heavily and some have no entry_ts,
+# so any page boundary that is not a unique key repeats or skips rows.
+
+PAGE_SIZE = 7
+
+FILTER_SETS = [
+    {},
+    {'instrument': 'NQ MAR25'},
+    {'start_time': '09:30:00', 'end_time': '16:00:00', 'min_bars': 5}
+]
+
+@pytest.fixture
+def tied_db(imported_db):
+    """The synthetic grid with entry times rounded to the hour and 20 trades without one"""
+    with imported_db.pool.writer() as cursor:
+        cursor.execute("UPDATE trades SET entry_ts = entry_ts - entry_ts % 3600")
+        cursor.execute("UPDATE trades SET entry_ts = NULL WHERE id % 100 = 0")
+    return imported_db
+
+@pytest.fixture
+def model(qt_app, tied_db, monkeypatch):
+    monkeypatch.setattr(trade_table_model, 'PAGE_SIZE', PAGE_SIZE)
+    return trade_table_model.TradeTableModel(tied_db)
+
+def model_ids(model, rows):
+    return [model.get_trade_id(row) for row in rows]
+
+@pytest.mark.parametrize('filters', FILTER_SETS)
+def test_scrolling_down_shows_every_trade_once(tied_db, model, filters):
+    expected = [trade['id'] for trade in tied_db.get_trades(filters)]
+    model.set_filters(filters)
+
+    assert model.rowCount() == len(expected)
+    assert model_ids(model, range(model.rowCount())) == expected
+
+@pytest.mark.parametrize('filters', FILTER_SETS)
+def test_jumping_between_pages_matches_offset_paging(tied_db, model, filters):
+    expected = [trade['id'] for trade in tied_db.get_trades(filters)]
+    model.set_filters(filters)
+
+    # Deep pages first, then back up and around, as dragging the scroll bar does
+    rows = list(range(model.rowCount()))
+    random.Random(3).shuffle(rows)
+    rows = [model.rowCount() - 1] + rows
+
+    assert model_ids(model, rows) == [expected[row] for row in rows]
+
+def test_trades_sharing_an_entry_time_come_newest_id_first(tied_db):
+    trades = tied_db.get_trades()
+    keys = [(trade['entry_ts'] is not None, trade['entry_ts'] or 0, trade['id']) for trade in trades]
+
+    assert keys == sorted(keys, reverse=True)
+
+def test_page_after_a_key_continues_into_trades_without_entry_ts(tied_db):
+    trades = tied_db.get_trades()
+    timed = [trade for trade in trades if trade['entry_ts'] is not None]
+    last_timed = timed[-1]
+
+    page = tied_db.get_trades(limit=5, after=(last_timed['entry_ts'], last_timed['id']))
+
+    assert [trade['id'] for trade in page] == [trade['id'] for trade in trades[len(timed):len(timed) + 5]]